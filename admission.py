@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from loguru import logger
+
+from config import get_config
+from loop_monitor import get_loop_monitor
+from metrics import get_metrics
+from sessions import get_session_registry
+
+if TYPE_CHECKING:
+    from pipecat.transports.base_output import BaseOutputTransport
+
+ACCEPT = "accept"
+QUEUE = "queue"
+REJECT = "reject"
+
+# An admitted call holds its slot until its stream starts, or this long
+PENDING_SECONDS = 15.0
+
+admission_decisions = get_metrics().counter("admission_decisions_total", "Answered calls by admission decision")
+admission_queued = get_metrics().gauge("admission_queued_calls", "Calls on hold waiting for a free bot session")
+
+
+def output_queue_seconds(output: "BaseOutputTransport") -> float:
+    """Seconds of bot audio queued in an output transport and not yet sent
+
+    Reads pipecat internals, so anything missing after an upgrade counts as no backlog.
+    """
+    backlog = 0.0
+    for sender in (getattr(output, "_media_senders", None) or {}).values():
+        queue = getattr(sender, "_audio_queue", None)
+        chunk_size = getattr(sender, "_audio_chunk_size", 0)
+        sample_rate = getattr(sender, "_sample_rate", 0)
+        if queue is not None and chunk_size and sample_rate:
+            backlog += queue.qsize() * chunk_size / 2 / sample_rate
+    return backlog
+
+
+def parse_queued_since(value: Optional[str]) -> Optional[float]:
+    """The queued_since from a hold redirect URL, or None if missing or malformed"""
+    try:
+        since = float(value)
+    except (TypeError, ValueError):
+        return None
+    # A time in the future would jump the hold queue
+    return since if math.isfinite(since) and since <= time.time() else None
+
+
+@dataclass(frozen=True)
+class Admission:
+    decision: str
+    reason: str = ""
+    queued_since: Optional[float] = None
+
+
+class AdmissionController:
+    """Decides at /answer whether a new call gets a bot session now
+
+    A call is accepted while sessions, event loop lag and the worst per-call
+    output backlog are all under their limits. Otherwise it is put on hold
+    (up to the queue size and the longest hold) and re-evaluated when Plivo
+    posts /answer again, or rejected, so existing calls never degrade to make
+    room for a new one. Queued calls are admitted oldest first.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, float] = {}
+        self._queued: Dict[str, float] = {}
+
+    def _expire(self, now: float):
+        for call_uuid, expires in list(self._pending.items()):
+            if expires <= now:
+                del self._pending[call_uuid]
+        max_wait = get_config().config.performance.admission_max_wait_seconds
+        for call_uuid, since in list(self._queued.items()):
+            # Calls that hung up on hold never come back to /answer
+            if since < now - max_wait - PENDING_SECONDS:
+                del self._queued[call_uuid]
+        admission_queued.set(len(self._queued))
+
+    def overload(self) -> Optional[str]:
+        """Why the worker can't take more load right now, or None"""
+        limits = get_config().config.performance
+        lag_ms = get_loop_monitor().recent_max * 1000
+        if lag_ms > limits.max_loop_lag_ms:
+            return f"event loop lag {lag_ms:.0f} ms"
+        backlog = get_session_registry().max_output_backlog()
+        if backlog > limits.max_output_queue_seconds:
+            return f"output backlog {backlog:.1f} s"
+        return None
+
+    def free_slots(self) -> int:
+        limits = get_config().config.performance
+        return limits.max_sessions - get_session_registry().active - len(self._pending)
+
+    def admit(self, call_uuid: str, queued_since: Optional[float] = None) -> Admission:
+        """Admission decision for a call Plivo just answered
+
+        queued_since is when the call was first put on hold (carried in the
+        hold redirect URL, so it survives landing on another worker).
+        """
+        now = time.time()
+        self._expire(now)
+        limits = get_config().config.performance
+        if queued_since is not None:
+            self._queued.setdefault(call_uuid, queued_since)
+
+        # Queued calls go first, oldest first
+        ahead = sum(1 for uuid, since in self._queued.items() if since < self._queued.get(call_uuid, now))
+        overload = self.overload()
+        if overload is None and self.free_slots() > ahead:
+            self._queued.pop(call_uuid, None)
+            self._pending[call_uuid] = now + PENDING_SECONDS
+            return self._decide(call_uuid, Admission(ACCEPT))
+
+        reason = overload or f"{limits.max_sessions} sessions in use"
+        if call_uuid in self._queued:
+            since = self._queued[call_uuid]
+            if now - since < limits.admission_max_wait_seconds:
+                return self._decide(call_uuid, Admission(QUEUE, reason, since))
+            del self._queued[call_uuid]
+            return self._decide(call_uuid, Admission(REJECT, f"on hold {limits.admission_max_wait_seconds}s; {reason}"))
+        if len(self._queued) < limits.admission_queue_size:
+            self._queued[call_uuid] = now
+            return self._decide(call_uuid, Admission(QUEUE, reason, now))
+        return self._decide(call_uuid, Admission(REJECT, reason))
+
+    def _decide(self, call_uuid: str, admission: Admission) -> Admission:
+        admission_decisions.inc(labels={"decision": admission.decision})
+        admission_queued.set(len(self._queued))
+        if admission.decision != ACCEPT:
+            logger.warning(f"🚦 Call {call_uuid}: {admission.decision} ({admission.reason})")
+        return admission
+
+    def started(self, call_uuid: Optional[str]):
+        """An admitted call's stream started; its slot is now a live session"""
+        if call_uuid:
+            self._pending.pop(call_uuid, None)
+
+    def release(self, call_uuid: Optional[str]):
+        """An admitted call won't start here (a repeat delivery); free its slot"""
+        if call_uuid:
+            self._pending.pop(call_uuid, None)
+
+    def capacity(self) -> Dict[str, Any]:
+        self._expire(time.time())
+        limits = get_config().config.performance
+        registry = get_session_registry()
+        overload = self.overload()
+        return {
+            "accepting": not registry.draining and overload is None and self.free_slots() > len(self._queued),
+            "active_sessions": registry.active,
+            "pending_sessions": len(self._pending),
+            "queued_calls": len(self._queued),
+            "free_slots": max(0, self.free_slots()),
+            "max_sessions": limits.max_sessions,
+            "loop_lag_ms": round(get_loop_monitor().recent_max * 1000, 1),
+            "max_loop_lag_ms": limits.max_loop_lag_ms,
+            "output_backlog_seconds": round(registry.max_output_backlog(), 2),
+            "max_output_queue_seconds": limits.max_output_queue_seconds,
+            "overload": overload,
+            "draining": registry.draining,
+        }
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller"""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+Replay captured calls through the real pipeline against mock providers
+
+Replays a call saved with `capture_calls` (see call_capture.py). The
+captured Plivo media events go to run_bot over an in-process WebSocket at
+their captured timing. Mock Deepgram, OpenAI and Cartesia servers, run in a
+child process, answer with the captured transcripts, replies and TTS timing.
+--speed 4 replays four times faster than real time, with the shared audio
+clock and the mock providers sped up to match; pipecat's own VAD and
+aggregator timers still run on wall time, so faster replays are approximate
+and speed 1 is the one to trust for latency. For each run it reports:
+
+    - voice-to-voice latency, from the end of caller speech to the bot's first audio
+    - CPU seconds per minute of call (this process: pipeline plus WebSocket driver)
+    - peak and retained Python allocations for one call (tracemalloc, a separate run)
+
+Latencies are in call time (wall time x speed). Without --capture it replays
+a synthetic three-turn call. With --baseline, exits non-zero if any metric is
+worse than the stored baseline by more than --tolerance.
+
+    python benchmarks/call_replay.py --capture data/captures/<call>.ccap --runs 5
+    python benchmarks/call_replay.py --speed 4 --save-baseline replay_baseline.json
+    python benchmarks/call_replay.py --speed 4 --baseline replay_baseline.json
+"""
+
+import argparse
+import asyncio
+import base64
+import gc
+import json
+import math
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Default settings, and a call history and TTS cache that go away with the run
+LAUNCH_DIR = os.getcwd()
+SCRATCH = tempfile.TemporaryDirectory(prefix="call-replay-")
+os.chdir(SCRATCH.name)
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+from loguru import logger
+from starlette.websockets import WebSocketState
+
+from audio_codec import ulaw_decode, ulaw_encode
+from call_capture import SPEECH_RMS, Capture, read_capture, write_capture
+from context_manager import message_text
+from speculative import similarity
+from stub_services import DEFAULT_RESPONSES, DEFAULT_TRANSCRIPTS
+from vad_gate import frame_rms
+
+FRAME_SECONDS = 0.02
+TURN_SILENCE = 0.5  # Caller silence that ends a turn
+BURST_GAP = 0.25  # Gap in bot audio that starts a new bot turn
+TTS_CHUNK_SECONDS = 0.1
+
+# metric: (label, unit, absolute slack before a change counts as a regression)
+METRICS = {
+    "voice_to_voice_p50_ms": ("voice-to-voice p50", "ms", 20.0),
+    "voice_to_voice_p95_ms": ("voice-to-voice p95", "ms", 40.0),
+    "cpu_seconds_per_call_minute": ("CPU per call-minute", "s", 0.05),
+    "peak_alloc_kb": ("peak allocations", "KB", 256.0),
+    "retained_alloc_kb": ("retained allocations", "KB", 256.0),
+}
+
+
+def synthetic_capture() -> Capture:
+    """Three caller turns with the stub transcripts and replies, at typical provider timing"""
+    samples = int(8000 * FRAME_SECONDS)
+    t = np.arange(samples) / 8000
+    silence = ulaw_encode(bytes(2 * samples))
+    media: List[Tuple[float, bytes]] = []
+    events: List[Dict[str, Any]] = []
+
+    def add(seconds: float, speech: bool):
+        for _ in range(round(seconds / FRAME_SECONDS)):
+            offset = len(media) * FRAME_SECONDS
+            if speech:
+                # Vowel-like: 150 Hz with harmonics and a syllable envelope
+                tt = t + offset
+                pcm = 6000 * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * tt)) * sum(
+                    np.sin(2 * np.pi * 150 * h * tt) / h for h in (1, 2, 3)
+                )
+                media.append((offset, ulaw_encode(pcm.astype(np.int16).tobytes())))
+            else:
+                media.append((offset, silence))
+
+    add(6.0, speech=False)  # The greeting
+    heard = 0.0
+    for text, reply in zip(DEFAULT_TRANSCRIPTS, DEFAULT_RESPONSES):
+        start = len(media) * FRAME_SECONDS
+        words = text.rstrip(".?!").split()
+        for i in (1, 2):
+            events.append({
+                "t": start + 0.5 * i + 0.1, "type": "stt", "text": " ".join(words[: i * len(words) // 3]),
+                "final": False, "speech": heard + 0.5 * i, "after": 0.1,
+            })
+        add(1.5, speech=True)
+        heard += 1.5
+        end = start + 1.5
+        events.append({"t": end + 0.3, "type": "stt", "text": text, "final": True, "speech": heard, "after": 0.3})
+        tokens = [[round(0.03 * i, 3), word if i == 0 else f" {word}"] for i, word in enumerate(reply.split(" "))]
+        events.append({"t": end + 0.8, "type": "llm", "user": text, "ttft": 0.35, "tokens": tokens, "speculative": False})
+        events.append({"t": end + 1.2, "type": "tts", "ttfb": 0.2, "audio": round(len(reply) / 15, 3), "interrupted": False, "text": reply})
+        add(8.0, speech=False)
+    return Capture({"call_id": "synthetic", "profile": "default", "sample_rate": 8000}, media, events)
+
+
+def deepgram_result(event: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "Results",
+        "channel_index": [0, 1],
+        "duration": 0.0,
+        "start": 0.0,
+        "is_final": event["final"],
+        "speech_final": event["final"],
+        "channel": {"alternatives": [{"transcript": event["text"], "confidence": 0.99, "words": []}]},
+        "metadata": {
+            "request_id": "replay",
+            "model_info": {"name": "replay", "version": "", "arch": ""},
+            "model_uuid": "replay",
+        },
+    }
+
+
+def completion_chunk(content: str) -> str:
+    chunk = {
+        "id": "replay",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "replay",
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+class ReplayProviders:
+    """Mock Deepgram, OpenAI and Cartesia servers that answer as the providers did in a capture
+
+    Deepgram sends each captured transcript once the stream has carried as
+    much caller speech as STT had heard when it arrived, plus the same delay
+    after the last speech. OpenAI streams the captured reply to the closest
+    caller words, with its time to first token and token gaps. Cartesia waits
+    the captured time to first audio and returns silence as long as the
+    captured audio for that text. Every delay is divided by speed.
+    """
+
+    def __init__(self, capture: Capture, speed: float):
+        self.speed = speed
+        self.transcripts = capture.of("stt")
+        self.replies = capture.of("llm")
+        self.speech = capture.of("tts")
+        self._used: Counter = Counter()
+
+        # Timing for anything the capture has no measurement of
+        ttfts = [r["ttft"] for r in self.replies if r["ttft"] is not None]
+        gaps = [
+            b[0] - a[0] for r in self.replies if not r["speculative"] for a, b in zip(r["tokens"], r["tokens"][1:])
+        ]
+        ttfbs = [s["ttfb"] for s in self.speech if s["ttfb"] is not None]
+        spoken = [s for s in self.speech if not s["interrupted"] and s["audio"]]
+        self.ttft = statistics.median(ttfts) if ttfts else 0.35
+        self.token_gap = statistics.median(gaps) if gaps else 0.03
+        self.ttfb = statistics.median(ttfbs) if ttfbs else 0.2
+        chars = sum(len(s["text"]) for s in spoken)
+        self.chars_per_second = chars / sum(s["audio"] for s in spoken) if spoken else 15.0
+
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self.chat)
+        self.app.websocket("/tts/websocket")(self.cartesia)
+        self.app.websocket("/v1/listen")(self.deepgram)
+
+    async def _sleep(self, seconds: float):
+        if seconds > 0:
+            await asyncio.sleep(seconds / self.speed)
+
+    async def deepgram(self, websocket: WebSocket):
+        sample_rate = int(websocket.query_params.get("sample_rate", 8000))
+        await websocket.accept()
+        pending = deque(self.transcripts)
+        heard = 0.0
+        last_speech: Optional[float] = None
+        updated = asyncio.Event()
+
+        async def send_transcripts():
+            while pending:
+                event = pending[0]
+                while last_speech is None or heard < event["speech"] - 0.01:
+                    updated.clear()
+                    await updated.wait()
+                await asyncio.sleep(max(0.0, last_speech + event["after"] / self.speed - time.monotonic()))
+                pending.popleft()
+                await websocket.send_text(json.dumps(deepgram_result(event)))
+
+        sender = asyncio.create_task(send_transcripts())
+        try:
+            while True:
+                msg = await websocket.receive()
+                if msg["type"] == "websocket.disconnect":
+                    return
+                audio = msg.get("bytes")
+                if audio:
+                    if frame_rms(audio) > SPEECH_RMS:
+                        heard += len(audio) / 2 / sample_rate
+                        last_speech = time.monotonic()
+                        updated.set()
+                elif '"CloseStream"' in (msg.get("text") or ""):
+                    await websocket.close()
+                    return
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+
+    def _reply_for(self, user: str) -> Optional[Dict[str, Any]]:
+        if not self.replies:
+            return None
+        # Closest caller words; the least used reply among equals, so repeated words get the next reply
+        best = max(
+            range(len(self.replies)),
+            key=lambda i: (round(similarity(self.replies[i]["user"], user), 3), -self._used[i], -i),
+        )
+        self._used[best] += 1
+        return self.replies[best]
+
+    async def chat(self, request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        user = next((message_text(m) for m in reversed(messages) if m.get("role") == "user"), "")
+        if not body.get("stream"):
+            # Context summaries
+            return JSONResponse({
+                "id": "replay",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "replay",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "Earlier turns."}, "finish_reason": "stop"}],
+            })
+        reply = self._reply_for(user)
+        tokens = reply["tokens"] if reply else [[0.0, "Okay."]]
+        if reply is None or reply["speculative"]:
+            # Replayed from a speculation on the captured call: no provider timing
+            tokens = [[i * self.token_gap, text] for i, (_, text) in enumerate(tokens)]
+        ttft = reply["ttft"] if reply and reply["ttft"] is not None else self.ttft
+
+        async def events():
+            await self._sleep(ttft)
+            previous = 0.0
+            for at, text in tokens:
+                await self._sleep(at - previous)
+                previous = at
+                yield completion_chunk(text)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    def _synthesis(self, text: str) -> Tuple[float, float]:
+        """Time to first audio and audio seconds for one chunk of text"""
+        text = text.strip()
+        matches = [i for i, s in enumerate(self.speech) if text and text in s["text"]]
+        if matches:
+            i = min(matches, key=lambda i: self._used[("tts", i)])
+            self._used[("tts", i)] += 1
+            captured = self.speech[i]
+            if not captured["interrupted"] and captured["audio"]:
+                ttfb = captured["ttfb"] if captured["ttfb"] is not None else self.ttfb
+                return ttfb, captured["audio"] * len(text) / len(captured["text"])
+        return self.ttfb, len(text) / self.chars_per_second
+
+    async def cartesia(self, websocket: WebSocket):
+        await websocket.accept()
+        started = set()
+        try:
+            while True:
+                msg = json.loads(await websocket.receive_text())
+                context_id = msg.get("context_id")
+                if msg.get("cancel"):
+                    continue
+                if (msg.get("transcript") or "").strip():
+                    sample_rate = msg.get("output_format", {}).get("sample_rate", 8000)
+                    ttfb, seconds = self._synthesis(msg["transcript"])
+                    if context_id not in started:
+                        started.add(context_id)
+                        await self._sleep(ttfb)
+                    remaining = int(seconds * sample_rate)
+                    while remaining > 0:
+                        samples = min(remaining, int(TTS_CHUNK_SECONDS * sample_rate))
+                        remaining -= samples
+                        data = base64.b64encode(bytes(2 * samples)).decode()
+                        await websocket.send_text(json.dumps({"type": "chunk", "context_id": context_id, "data": data}))
+                if not msg.get("continue", True):
+                    await websocket.send_text(json.dumps({"type": "done", "context_id": context_id}))
+        except WebSocketDisconnect:
+            pass
+
+
+class ReplaySocket:
+    """Stands in for Plivo's WebSocket: feeds captured media to run_bot and times the bot's audio"""
+
+    def __init__(self):
+        self.client_state = WebSocketState.CONNECTED
+        self.application_state = WebSocketState.CONNECTED
+        self.query_params: Dict[str, str] = {}
+        self.bot_audio: List[float] = []
+        self._inbox: asyncio.Queue = asyncio.Queue()
+
+    def send_media(self, payload: bytes):
+        media = {"event": "media", "media": {"track": "inbound", "payload": base64.b64encode(payload).decode()}}
+        self._inbox.put_nowait(json.dumps(media))
+
+    async def iter_text(self):
+        while True:
+            message = await self._inbox.get()
+            if message is None:
+                return
+            yield message
+
+    async def send_text(self, data: str):
+        if data.startswith('{"event": "playAudio"'):
+            self.bot_audio.append(time.monotonic())
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000):
+        if self.client_state != WebSocketState.DISCONNECTED:
+            self.client_state = self.application_state = WebSocketState.DISCONNECTED
+            self._inbox.put_nowait(None)
+
+
+def caller_turn_ends(capture: Capture) -> List[float]:
+    """Call-time offsets where the caller stopped speaking for at least TURN_SILENCE"""
+    first = capture.media[0][0]
+    ends = []
+    last_speech: Optional[float] = None
+    for offset, payload in capture.media:
+        offset -= first
+        if frame_rms(ulaw_decode(payload)) > SPEECH_RMS:
+            last_speech = offset + len(payload) / 8000
+        elif last_speech is not None and offset - last_speech >= TURN_SILENCE:
+            ends.append(last_speech)
+            last_speech = None
+    if last_speech is not None:
+        ends.append(last_speech)
+    return ends
+
+
+def voice_to_voice(turn_ends: List[float], bot_audio: List[float]) -> List[float]:
+    """Seconds from each caller turn's end to the start of the bot's next turn, when it answered"""
+    bursts = [t for i, t in enumerate(bot_audio) if i == 0 or t - bot_audio[i - 1] > BURST_GAP]
+    latencies = []
+    for i, end in enumerate(turn_ends):
+        reply = next((b for b in bursts if b > end), None)
+        # No reply before the caller's next turn ended: the caller spoke again first
+        if reply is not None and (i + 1 == len(turn_ends) or reply < turn_ends[i + 1]):
+            latencies.append(reply - end)
+    return latencies
+
+
+async def replay_call(run_bot, capture: Capture, speed: float, limit: Optional[float] = None) -> Dict[str, Any]:
+    """Play one captured call into run_bot; returns its call id and the bot audio in call time"""
+    sock = ReplaySocket()
+    call_id = f"replay-{uuid.uuid4().hex[:12]}"
+    bot = asyncio.create_task(run_bot(sock, call_id, call_id, profile=capture.meta.get("profile")))
+    first = capture.media[0][0]
+    started = time.monotonic()
+    for offset, payload in capture.media:
+        offset -= first
+        if limit is not None and offset > limit:
+            break
+        delay = started + offset / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        sock.send_media(payload)
+    await sock.close()
+    await bot
+    return {"call_id": call_id, "bot_audio": [(t - started) * speed for t in sock.bot_audio]}
+
+
+def count_bot_audio_at_stt() -> Counter:
+    """Count audio frames other than the caller's that reach an STT service (should stay 0)"""
+    from pipecat.frames.frames import InputAudioRawFrame
+    from pipecat.services.stt_service import STTService
+
+    counts: Counter = Counter()
+    process_audio_frame = STTService.process_audio_frame
+
+    async def counted(self, frame, direction):
+        if not isinstance(frame, InputAudioRawFrame):
+            counts[type(frame).__name__] += 1
+        await process_audio_frame(self, frame, direction)
+
+    STTService.process_audio_frame = counted
+    return counts
+
+
+async def stage_latencies(call_id: str) -> Dict[str, Optional[float]]:
+    """Per-stage p50s of a replayed call from its bot_finished history event"""
+    from call_history import get_history_store
+
+    for _ in range(20):
+        call = await get_history_store().get_call(call_id)
+        finished = [e for e in (call or {}).get("events", []) if e["event"] == "bot_finished"]
+        if finished:
+            stages = finished[-1].get("latency", {}).get("stages", {})
+            return {stage: stages.get(stage, {}).get("p50_ms") for stage in ("stt", "llm_ttft", "tts_ttfb")}
+        await asyncio.sleep(0.1)
+    return {}
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Mock providers did not start on port {port}")
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, Any], tolerance: float) -> bool:
+    """Print each metric against the baseline; False if any got worse than tolerance allows"""
+    ok = True
+    print(f"\n{'metric':<24} {'baseline':>12} {'now':>12} {'change':>8}")
+    for key, (label, unit, slack) in METRICS.items():
+        now, then = results.get(key), baseline.get(key)
+        if now is None or then is None:
+            continue
+        change = f"{(now - then) / then:+.0%}" if then else ""
+        worse = now > then * (1 + tolerance) + slack
+        ok = ok and not worse
+        print(f"{label:<24} {then:>9.2f} {unit:<2} {now:>9.2f} {unit:<2} {change:>8}  {'❌' if worse else '✅'}")
+    return ok
+
+
+def serve_providers(args):
+    providers = ReplayProviders(read_capture(args.serve_providers), args.speed)
+    uvicorn.run(providers.app, host="127.0.0.1", port=args.port, log_level="error")
+
+
+async def main(args):
+    if args.capture:
+        path = os.path.join(LAUNCH_DIR, args.capture)
+    else:
+        path = os.path.join(SCRATCH.name, "synthetic.ccap")
+        write_capture(path, synthetic_capture())
+    capture = read_capture(path)
+    turn_ends = caller_turn_ends(capture)
+    minutes = capture.duration / 60
+    print(
+        f"🎞️ Replaying {capture.meta.get('call_id')}: {capture.duration:.1f}s of call, {len(turn_ends)} caller turns, "
+        f"{len(capture.of('llm'))} LLM replies, {args.speed:g}x speed, {args.runs} runs"
+    )
+
+    providers = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-providers", path, "--port", str(args.port), "--speed", str(args.speed)],
+        stdout=subprocess.DEVNULL,
+        stderr=open(os.path.join(SCRATCH.name, "providers.log"), "w"),
+    )
+    base = f"127.0.0.1:{args.port}"
+    os.environ.update(
+        OPENAI_BASE_URL=f"http://{base}/v1",
+        CARTESIA_URL=f"ws://{base}/tts/websocket",
+        DEEPGRAM_URL=f"http://{base}",
+        OPENAI_API_KEY="replay",
+        CARTESIA_API_KEY="replay",
+        DEEPGRAM_API_KEY="replay",
+    )
+    # Imported here, once the environment points the provider pool at the mocks
+    import pacer
+    from readiness import get_readiness
+
+    # Bot audio and the caller's jitter buffer run on the shared clock, sped up with the replay
+    pacer._audio_clock = pacer.AudioClock(rate=args.speed)
+    bot_audio_at_stt = count_bot_audio_at_stt()
+    readiness = get_readiness()
+    try:
+        wait_for_port(args.port)
+        readiness.start()
+        while not readiness.ready:
+            if readiness.error:
+                raise RuntimeError(readiness.error)
+            await asyncio.sleep(0.1)
+        from bot import run_bot
+
+        # First call plays the greeting through TTS and fills the cache; later calls play it cached
+        await replay_call(run_bot, capture, args.speed, limit=args.warmup)
+
+        latencies: List[float] = []
+        stages: List[Dict[str, Optional[float]]] = []
+        cpu = 0.0
+        print(f"\n{'run':<5} {'v2v p50':>9} {'v2v max':>9} {'CPU/min':>9}")
+        for run in range(args.runs):
+            gc.collect()
+            before = time.process_time()
+            result = await replay_call(run_bot, capture, args.speed)
+            spent = time.process_time() - before
+            cpu += spent
+            run_latencies = voice_to_voice(turn_ends, result["bot_audio"])
+            latencies.extend(run_latencies)
+            stages.append(await stage_latencies(result["call_id"]))
+            p50 = f"{statistics.median(run_latencies) * 1000:.0f}ms" if run_latencies else "-"
+            worst = f"{max(run_latencies) * 1000:.0f}ms" if run_latencies else "-"
+            print(f"{run + 1:<5} {p50:>9} {worst:>9} {spent / minutes:>8.2f}s")
+
+        # Allocations on their own run: tracing slows the pipeline down
+        gc.collect()
+        tracemalloc.start()
+        await replay_call(run_bot, capture, args.speed)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("lineno")[:5]
+        tracemalloc.stop()
+    finally:
+        await readiness.close()
+        providers.terminate()
+        providers.wait()
+
+    results: Dict[str, Any] = {
+        "capture": capture.meta.get("call_id"),
+        "speed": args.speed,
+        "turns": len(latencies),
+        "voice_to_voice_p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "voice_to_voice_p95_ms": (
+            round(sorted(latencies)[max(0, math.ceil(0.95 * len(latencies)) - 1)] * 1000, 1) if latencies else None
+        ),
+        "cpu_seconds_per_call_minute": round(cpu / args.runs / minutes, 3),
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "retained_alloc_kb": round(retained / 1024, 1),
+    }
+    for stage in ("stt", "llm_ttft", "tts_ttfb"):
+        values = [s[stage] for s in stages if s.get(stage) is not None]
+        results[f"{stage}_p50_ms"] = round(statistics.median(values) * args.speed, 1) if values else None
+
+    print(
+        f"\n⏱️ Voice-to-voice over {len(latencies)} turns: p50 {results['voice_to_voice_p50_ms']}ms, "
+        f"p95 {results['voice_to_voice_p95_ms']}ms "
+        f"(stt {results['stt_p50_ms']}ms, llm ttft {results['llm_ttft_p50_ms']}ms, tts ttfb {results['tts_ttfb_p50_ms']}ms)"
+    )
+    print(f"🧮 CPU: {results['cpu_seconds_per_call_minute']:.2f}s per call-minute")
+    print(f"🧠 Allocations: peak {peak / 1024:.0f} KB, retained {retained / 1024:.0f} KB after one call")
+    for stat in top:
+        print(f"   {stat.size / 1024:>8.1f} KB  {stat.traceback}")
+    if bot_audio_at_stt:
+        # The measured runs play the greeting from the TTS cache; none of it may reach STT
+        print(f"\n❌ Bot audio reached STT: {dict(bot_audio_at_stt)}")
+        sys.exit(1)
+
+    if args.save_baseline:
+        with open(os.path.join(LAUNCH_DIR, args.save_baseline), "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(os.path.join(LAUNCH_DIR, args.baseline)) as f:
+            baseline = json.load(f)
+        if (baseline.get("capture"), baseline.get("speed")) != (results["capture"], results["speed"]):
+            print(f"\n⚠️ Baseline is for {baseline.get('capture')} at {baseline.get('speed')}x")
+        if not compare(results, baseline, args.tolerance):
+            print(f"\n❌ Worse than the baseline by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay captured calls through the pipeline against mock providers")
+    parser.add_argument("--capture", help="Capture file (.ccap); a synthetic call if not given")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 is real time)")
+    parser.add_argument("--runs", type=int, default=3, help="Measured replays of the call")
+    parser.add_argument("--warmup", type=float, default=8.0, help="Seconds of the call to replay first, unmeasured")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", help="Write the results to this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed regression against the baseline")
+    parser.add_argument("--port", type=int, default=8798, help="Port for the mock providers")
+    parser.add_argument("--serve-providers", metavar="CAPTURE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logger.remove()
+    if args.serve_providers:
+        serve_providers(args)
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Replay recorded LLM token streams through the TTS text chunker
+
+Each line of the input file is {"template": ..., "tokens": [[offset_ms, text], ...]}
+with offsets from the start of the LLM request. Reports time to the first
+speakable chunk with pipecat's sentence aggregator (previous behaviour) and
+with text_chunker.SentenceChunker using each template's policy.
+
+    python benchmarks/chunker_replay.py --verbose
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from pipecat.utils.text.simple_text_aggregator import SimpleTextAggregator
+
+from config import CHUNK_POLICIES, DEFAULT_CHUNK_POLICY, ChunkPolicy
+from text_chunker import SentenceChunker
+
+SENTENCE_ONLY = ChunkPolicy(first_chunk="sentence", min_chunk_chars=0)
+DEFAULT_STREAMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "token_streams.jsonl")
+
+
+async def replay_sentence_aggregator(tokens):
+    aggregator = SimpleTextAggregator()
+    chunks = []
+    try:
+        await aggregator.aggregate("Probe. ")
+        await aggregator.reset()
+    except LookupError:
+        # pipecat's aggregator needs NLTK punkt data; fall back to whole sentences
+        return replay_chunker(tokens, SENTENCE_ONLY)
+    for offset, text in tokens:
+        chunk = await aggregator.aggregate(text)
+        if chunk:
+            chunks.append((offset, chunk))
+    if aggregator.text.strip():
+        chunks.append((tokens[-1][0], aggregator.text))
+    return chunks
+
+
+def replay_chunker(tokens, policy):
+    chunker = SentenceChunker(policy)
+    chunks = []
+    for offset, text in tokens:
+        chunks.extend((offset, chunk) for chunk in chunker.push(text))
+    chunk = chunker.flush()
+    if chunk:
+        chunks.append((tokens[-1][0], chunk))
+    return chunks
+
+
+async def main(args):
+    with open(args.streams) as f:
+        streams = [json.loads(line) for line in f if line.strip()]
+
+    baseline_first, chunker_first = [], []
+    print(f"{'template':<10} {'sentence':>9} {'chunker':>9} {'saved':>7}  chunks")
+    for stream in streams:
+        tokens = stream["tokens"]
+        policy = CHUNK_POLICIES.get(stream.get("template"), DEFAULT_CHUNK_POLICY)
+        baseline = await replay_sentence_aggregator(tokens)
+        chunked = replay_chunker(tokens, policy)
+
+        # Chunking must never change what gets spoken
+        assert "".join(c for _, c in chunked) == "".join(t for _, t in tokens)
+
+        baseline_first.append(baseline[0][0])
+        chunker_first.append(chunked[0][0])
+        print(
+            f"{stream.get('template', '-'):<10} {baseline[0][0]:>7}ms {chunked[0][0]:>7}ms "
+            f"{baseline[0][0] - chunked[0][0]:>5}ms  {len(baseline)} → {len(chunked)}"
+        )
+        if args.verbose:
+            for offset, chunk in chunked:
+                print(f"    {offset:>5}ms  {chunk!r}")
+
+    print(
+        f"\n⏱️ Time to first speakable chunk (median): sentence {statistics.median(baseline_first):.0f}ms, "
+        f"chunker {statistics.median(chunker_first):.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time to first speakable chunk on recorded token streams")
+    parser.add_argument("--streams", default=DEFAULT_STREAMS, help="JSONL file of recorded token streams")
+    parser.add_argument("--verbose", action="store_true", help="Print every chunk")
+    logger.remove()
+    asyncio.run(main(parser.parse_args()))
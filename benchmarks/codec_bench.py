@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the per-frame Plivo audio path
+
+Compares pipecat's PlivoFrameSerializer with audio_codec.FastPlivoFrameSerializer
+on 20 ms media frames in both directions (frames/sec and peak transient
+allocation per frame), then the batch μ-law codec against audioop at larger
+sizes. Both codecs are checked to be bit-exact first.
+
+    python benchmarks/codec_bench.py --frames 50000
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from loguru import logger
+
+from pipecat.frames.frames import OutputAudioRawFrame, StartFrame
+from pipecat.serializers.plivo import PlivoFrameSerializer
+
+from audio_codec import PCM_TO_ULAW, ULAW_TO_PCM, FastPlivoFrameSerializer, ulaw_encode
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import audioop
+
+SAMPLE_RATE = 8000
+FRAME_SAMPLES = 160
+
+
+def lut_decode(ulaw: bytes) -> bytes:
+    return ULAW_TO_PCM[np.frombuffer(ulaw, dtype=np.uint8)].tobytes()
+
+
+def lut_encode(pcm: bytes) -> bytes:
+    return PCM_TO_ULAW[np.frombuffer(pcm, dtype=np.uint16)].tobytes()
+
+
+def check_codec():
+    every_sample = np.arange(-32768, 32768, dtype=np.int16).tobytes()
+    assert lut_encode(every_sample) == audioop.lin2ulaw(every_sample, 2), "μ-law encode differs from audioop"
+    assert ulaw_encode(every_sample[:640]) == audioop.lin2ulaw(every_sample[:640], 2), "frame encode differs"
+    assert lut_decode(bytes(range(256))) == audioop.ulaw2lin(bytes(range(256)), 2), "μ-law decode differs from audioop"
+
+
+def media_message(rng) -> str:
+    payload = rng.integers(0, 256, FRAME_SAMPLES, dtype=np.uint8).tobytes()
+    return json.dumps(
+        {
+            "event": "media",
+            "streamId": "bench-stream",
+            "media": {"track": "inbound", "timestamp": "0", "chunk": 1, "payload": base64.b64encode(payload).decode()},
+        }
+    )
+
+
+async def time_frames(step, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        await step()
+    return count / (time.perf_counter() - started)
+
+
+async def peak_allocation(step, count: int) -> float:
+    """Mean of the largest traced allocation while handling one frame"""
+    tracemalloc.start()
+    total = 0
+    for _ in range(count):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await step()
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return total / count
+
+
+async def bench_serializers(frames: int):
+    rng = np.random.default_rng(0)
+    messages = [media_message(rng) for _ in range(64)]
+    outgoing = [
+        OutputAudioRawFrame(
+            audio=rng.integers(-8000, 8000, FRAME_SAMPLES, dtype=np.int16).tobytes(),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+        )
+        for _ in range(64)
+    ]
+    start = StartFrame(audio_in_sample_rate=SAMPLE_RATE, audio_out_sample_rate=SAMPLE_RATE)
+
+    results = {}
+    for name, cls in (("pipecat", PlivoFrameSerializer), ("fast", FastPlivoFrameSerializer)):
+        serializer = cls("bench-stream", params=PlivoFrameSerializer.InputParams(auto_hang_up=False))
+        await serializer.setup(start)
+        i = 0
+
+        async def inbound():
+            nonlocal i
+            i += 1
+            return await serializer.deserialize(messages[i & 63])
+
+        async def outbound():
+            nonlocal i
+            i += 1
+            return await serializer.serialize(outgoing[i & 63])
+
+        results[name] = {
+            "in_fps": await time_frames(inbound, frames),
+            "out_fps": await time_frames(outbound, frames),
+            "in_bytes": await peak_allocation(inbound, min(frames, 5000)),
+            "out_bytes": await peak_allocation(outbound, min(frames, 5000)),
+        }
+
+    # Both serializers must produce the same audio and messages
+    reference = FastPlivoFrameSerializer("bench-stream", params=PlivoFrameSerializer.InputParams(auto_hang_up=False))
+    stock = PlivoFrameSerializer("bench-stream", params=PlivoFrameSerializer.InputParams(auto_hang_up=False))
+    for s in (reference, stock):
+        await s.setup(start)
+    for message, frame in zip(messages, outgoing):
+        assert (await reference.deserialize(message)).audio == (await stock.deserialize(message)).audio
+        assert json.loads(await reference.serialize(frame)) == json.loads(await stock.serialize(frame))
+
+    print(f"{'20 ms frames':<14} {'in frames/s':>12} {'out frames/s':>13} {'in peak B':>10} {'out peak B':>11}")
+    for name, r in results.items():
+        print(
+            f"{name:<14} {r['in_fps']:>12,.0f} {r['out_fps']:>13,.0f} {r['in_bytes']:>10,.0f} {r['out_bytes']:>11,.0f}"
+        )
+    base, fast = results["pipecat"], results["fast"]
+    print(
+        f"\n⏱️ Inbound {fast['in_fps'] / base['in_fps']:.2f}x, outbound {fast['out_fps'] / base['out_fps']:.2f}x "
+        f"({50 / fast['in_fps'] * 1e3 + 50 / fast['out_fps'] * 1e3:.2f} ms CPU per call-second, "
+        f"was {50 / base['in_fps'] * 1e3 + 50 / base['out_fps'] * 1e3:.2f})"
+    )
+
+
+def bench_batch(repeat: int):
+    rng = np.random.default_rng(1)
+    print(f"\n{'batch':<8} {'decode audioop':>15} {'decode LUT':>11} {'encode audioop':>15} {'encode LUT':>11}")
+    for seconds in (0.02, 0.2, 2.0):
+        samples = int(SAMPLE_RATE * seconds)
+        ulaw = rng.integers(0, 256, samples, dtype=np.uint8).tobytes()
+        pcm = rng.integers(-8000, 8000, samples, dtype=np.int16).tobytes()
+        timings = []
+        for fn, data in (
+            (lambda d: audioop.ulaw2lin(d, 2), ulaw),
+            (lut_decode, ulaw),
+            (lambda d: audioop.lin2ulaw(d, 2), pcm),
+            (lut_encode, pcm),
+        ):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                fn(data)
+            timings.append((time.perf_counter() - started) / repeat * 1e6)
+        print(f"{seconds * 1000:>6.0f}ms " + " ".join(f"{t:>12.1f} µs" for t in timings))
+
+
+async def main(args):
+    check_codec()
+    print("✅ μ-law codec is bit-exact with audioop\n")
+    await bench_serializers(args.frames)
+    bench_batch(args.repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plivo serializer and μ-law codec microbenchmark")
+    parser.add_argument("--frames", type=int, default=50000, help="Frames per direction and serializer")
+    parser.add_argument("--repeat", type=int, default=2000, help="Iterations per batch size")
+    logger.remove()
+    asyncio.run(main(parser.parse_args()))
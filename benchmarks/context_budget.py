@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Simulate a long call against a fake LLM and check the context stays bounded
+
+Each turn appends a caller message, trims the context with ContextBudget and
+"sends" it to a fake LLM that records the request size and answers after a
+short delay. The summarizer is slow on purpose: summaries run in the
+background, so no request waits on one. Exits non-zero if any request goes
+over the template's budget.
+
+    python benchmarks/context_budget.py --turns 200 --template support
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+from config import CONTEXT_POLICIES, DEFAULT_CONTEXT_POLICY
+from context_manager import ContextBudget, estimate_tokens, extractive_summary
+
+SYSTEM_PROMPT = (
+    "You are a friendly phone support agent. Keep answers short and spoken, "
+    "confirm details back to the caller and never read out long lists."
+)
+WORDS = "order refund delivery address account payment invoice tracking number tomorrow monday help".split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+class FakeLLM:
+    """Records each request's size and replies after a fixed delay"""
+
+    def __init__(self, delay: float, rng: random.Random):
+        self.delay = delay
+        self.rng = rng
+        self.requests = []
+
+    async def complete(self, messages) -> str:
+        self.requests.append(estimate_tokens(messages))
+        await asyncio.sleep(self.delay)
+        return " ".join(sentence(self.rng, self.rng.randint(6, 20)) for _ in range(self.rng.randint(1, 3)))
+
+
+def slow_summarizer(delay: float):
+    async def summarize(summary, messages, max_tokens):
+        await asyncio.sleep(delay)
+        return await extractive_summary(summary, messages, max_tokens)
+
+    return summarize
+
+
+async def main(args):
+    policy = CONTEXT_POLICIES.get(args.template, DEFAULT_CONTEXT_POLICY)
+    rng = random.Random(args.seed)
+    llm = FakeLLM(args.llm_delay, rng)
+    budget = ContextBudget(policy, slow_summarizer(args.summary_delay))
+    context = OpenAILLMContext([{"role": "system", "content": SYSTEM_PROMPT}])
+    unbounded = [{"role": "system", "content": SYSTEM_PROMPT}]
+    fit_times = []
+
+    print(f"Template {args.template}: budget {policy.max_tokens} tokens, last {policy.keep_turns} turns\n")
+    print(f"{'turn':>5} {'bounded':>8} {'unbounded':>10} {'messages':>9} {'summaries':>10}")
+    for turn in range(1, args.turns + 1):
+        caller = {"role": "user", "content": " ".join(sentence(rng, rng.randint(3, 15)) for _ in range(2))}
+        context.add_message(caller)
+        unbounded.append(caller)
+
+        start = time.perf_counter()
+        budget.fit(context)
+        fit_times.append(time.perf_counter() - start)
+
+        reply = {"role": "assistant", "content": await llm.complete(context.get_messages())}
+        context.add_message(reply)
+        unbounded.append(reply)
+        if turn % args.report_every == 0:
+            print(
+                f"{turn:>5} {llm.requests[-1]:>8} {estimate_tokens(unbounded):>10} "
+                f"{len(context.get_messages()):>9} {budget.summaries:>10}"
+            )
+    await budget.wait_for_summary()
+
+    worst = max(llm.requests)
+    print(
+        f"\n📏 Request size: max {worst}, mean {statistics.mean(llm.requests):.0f} tokens "
+        f"(unbounded would end at {estimate_tokens(unbounded)})"
+    )
+    print(f"⏱️ fit() per turn: max {max(fit_times) * 1000:.2f}ms (summaries take {args.summary_delay * 1000:.0f}ms)")
+    print(f"📝 Summary: {budget._summary[:200]!r}")
+    if worst > policy.max_tokens:
+        print(f"❌ A request went over the {policy.max_tokens} token budget")
+        sys.exit(1)
+    print("✅ Every request fit the budget")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bounded LLM context over a long simulated call")
+    parser.add_argument("--turns", type=int, default=200, help="Caller turns to simulate")
+    parser.add_argument("--template", default="support", help="Prompt template whose context policy to use")
+    parser.add_argument("--llm-delay", type=float, default=0.005, help="Fake LLM response time (s)")
+    parser.add_argument("--summary-delay", type=float, default=0.05, help="Fake summarizer time (s)")
+    parser.add_argument("--report-every", type=int, default=20, help="Print sizes every N turns")
+    parser.add_argument("--seed", type=int, default=7)
+    logger.remove()
+    asyncio.run(main(parser.parse_args()))
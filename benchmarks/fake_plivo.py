@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Local fake of the Plivo Call API, plus a dialer benchmark that runs a campaign against it
+
+    python benchmarks/fake_plivo.py --numbers 10000 --rate 200 --latency-ms 150
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dialer import PlivoDialer
+
+
+class FakePlivoServer:
+    """Minimal aiohttp app that answers POST /v1/Account/{auth_id}/Call/ like Plivo"""
+
+    def __init__(self, latency_ms: float = 100.0, failure_every: int = 0):
+        self.latency_ms = latency_ms
+        self.failure_every = failure_every
+        self.requests = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._runner = None
+        self.port = None
+
+    async def _create_call(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            await asyncio.sleep(self.latency_ms / 1000)
+        finally:
+            self._in_flight -= 1
+        self.requests.append((time.monotonic(), body["from"], body["to"]))
+        if self.failure_every and len(self.requests) % self.failure_every == 0:
+            return web.json_response({"error": "destination number invalid"}, status=400)
+        return web.json_response(
+            {"api_id": uuid.uuid4().hex, "message": "call fired", "request_uuid": uuid.uuid4().hex},
+            status=201,
+        )
+
+    async def start(self, port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post("/v1/Account/{auth_id}/Call/", self._create_call)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{self.port}"
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+
+async def measure_loop_lag(samples: list, interval: float = 0.02):
+    """Record how late the event loop wakes up from a fixed sleep"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def main(args):
+    server = FakePlivoServer(latency_ms=args.latency_ms, failure_every=args.failure_every)
+    base_url = await server.start()
+
+    dialer = PlivoDialer(
+        "MAFAKEAUTHID",
+        "fake-token",
+        base_url=base_url,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+    )
+    numbers = [f"+9190000{i:05d}" for i in range(args.numbers)]
+
+    lag = []
+    lag_task = asyncio.create_task(measure_loop_lag(lag))
+    started = time.perf_counter()
+
+    campaign = dialer.create_campaign(numbers, "+912200000000", "http://x/answer", "http://x/hangup")
+    async for event in dialer.progress(campaign.campaign_id):
+        if event["type"] == "summary":
+            break
+
+    elapsed = time.perf_counter() - started
+    lag_task.cancel()
+    await dialer.close()
+    await server.stop()
+
+    lag.sort()
+    print(f"📞 Dialed {campaign.dialed} numbers in {elapsed:.2f}s ({campaign.dialed / elapsed:.1f} calls/s)")
+    print(f"✅ Successful: {campaign.successful}  ❌ Failed: {campaign.failed}")
+    print(f"🔀 Max concurrent API requests: {server.max_in_flight} (limit {args.concurrency})")
+    print(
+        f"⏱️ Event loop lag: p50={statistics.median(lag):.2f}ms "
+        f"p99={lag[int(len(lag) * 0.99) - 1]:.2f}ms max={lag[-1]:.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dialer benchmark against a local fake Plivo API")
+    parser.add_argument("--numbers", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=100.0, help="Calls per second per caller ID")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Simulated Plivo API latency")
+    parser.add_argument("--failure-every", type=int, default=0, help="Fail every Nth request")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Drive CallLatencyObserver with stub STT/LLM/TTS services that inject known delays
+
+Each turn pushes caller speech (VAD start, audio, VAD stop) into a pipeline of
+stub services, then checks that the observer reports the injected delays.
+
+    python benchmarks/latency_probe.py --turns 10 --stt 0.15 --ttft 0.3 --ttfb 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    BotStoppedSpeakingFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from pipeline_metrics import CallLatencyObserver
+from stub_services import StubLLMService, StubSpeakerOutput, StubSTTService, StubTTSService, tone
+from text_chunker import TextChunker
+
+
+class TurnWaiter(FrameProcessor):
+    """Signals when the bot finishes speaking so the next caller turn can start"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bot_done = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, BotStoppedSpeakingFrame):
+            self.bot_done.set()
+        await self.push_frame(frame, direction)
+
+
+async def drive(task: PipelineTask, waiter: TurnWaiter, turns: int):
+    speech = tone(0.02, 8000)
+    await asyncio.sleep(0.5)
+    for _ in range(turns):
+        waiter.bot_done.clear()
+        await task.queue_frame(UserStartedSpeakingFrame())
+        for _ in range(25):
+            await task.queue_frame(InputAudioRawFrame(audio=speech, sample_rate=8000, num_channels=1))
+        await task.queue_frame(UserStoppedSpeakingFrame())
+        await asyncio.wait_for(waiter.bot_done.wait(), timeout=30)
+        await asyncio.sleep(0.2)
+    await task.queue_frame(EndFrame())
+
+
+async def main(args):
+    llm = StubLLMService(ttft=args.ttft, token_interval=args.token_interval)
+    context = OpenAILLMContext([{"role": "system", "content": "You are a test bot."}])
+    context_aggregator = llm.create_context_aggregator(context)
+    waiter = TurnWaiter()
+    observer = CallLatencyObserver()
+
+    pipeline = Pipeline(
+        [
+            waiter,
+            StubSTTService(delay=args.stt),
+            context_aggregator.user(),
+            llm,
+            TextChunker(),
+            StubTTSService(ttfb=args.ttfb, aggregate_sentences=False),
+            StubSpeakerOutput(),
+            context_aggregator.assistant(),
+        ]
+    )
+    task = PipelineTask(
+        pipeline,
+        params=PipelineParams(audio_in_sample_rate=8000, audio_out_sample_rate=8000, allow_interruptions=True),
+        observers=[observer],
+    )
+
+    driver = asyncio.create_task(drive(task, waiter, args.turns))
+    await PipelineRunner(handle_sigint=False).run(task)
+    await driver
+
+    summary = observer.summary()
+    print(json.dumps(summary, indent=2))
+
+    expected = {"stt": args.stt, "llm_ttft": args.ttft, "tts_ttfb": args.ttfb}
+    ok = summary["turns"] == args.turns
+    for stage, delay in expected.items():
+        p50 = summary["stages"][stage]["p50_ms"]
+        within = p50 is not None and abs(p50 / 1000 - delay) <= args.tolerance
+        ok = ok and within
+        print(f"{'✅' if within else '❌'} {stage}: p50 {p50} ms, injected {delay * 1000:.0f} ms")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check per-stage latency metrics against injected delays")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--stt", type=float, default=0.15, help="Injected STT delay (s)")
+    parser.add_argument("--ttft", type=float, default=0.3, help="Injected LLM time to first token (s)")
+    parser.add_argument("--ttfb", type=float, default=0.2, help="Injected TTS time to first byte (s)")
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Allowed error (s)")
+    logger.remove()
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Load test: hundreds of concurrent Plivo media streams against one server.py
+
+Starts server.py with offline stub STT/LLM/TTS (BOT_PROVIDERS=stub), then for
+each step opens N WebSocket clients to /ws that send a Plivo start event and
+μ-law media every 20 ms (7 s of silence to hear the bot, then 1.5 s of speech,
+repeated). Reports
+per step:
+
+    - server event loop lag (from /metrics)
+    - jitter of the bot's playAudio messages against real time
+    - underruns of a 60 ms client playout buffer while the bot speaks
+    - server CPU and RSS per call (from /proc)
+
+and the first step where audio underruns or loop lag exceed the gates. Exits
+non-zero if any step up to --gate-calls fails, so releases can be gated on it.
+
+    python benchmarks/load_test.py --steps 25,50,100,200 --duration 20
+    python benchmarks/load_test.py --url ws://127.0.0.1:8765/ws --pid 1234
+"""
+
+import argparse
+import asyncio
+import audioop
+import base64
+import json
+import math
+import os
+import re
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FRAME_SECONDS = 0.02
+SAMPLE_RATE = 8000
+PREBUFFER = 0.06  # Client playout buffer before the first chunk of a bot turn plays
+BURST_GAP = 0.5  # Silence that separates two bot turns
+
+
+def caller_audio() -> List[bytes]:
+    """One 8.5 s listen/speak cycle as 20 ms μ-law payloads"""
+    samples = int(SAMPLE_RATE * FRAME_SECONDS)
+    frames = []
+    for n in range(int(8.5 / FRAME_SECONDS)):
+        if n >= 7.0 / FRAME_SECONDS:
+            # Vowel-like: 150 Hz fundamental with harmonics, syllable envelope
+            t0 = n * samples
+            pcm = [
+                int(
+                    6000
+                    * (0.6 + 0.4 * math.sin(2 * math.pi * 4 * (t0 + i) / SAMPLE_RATE))
+                    * sum(math.sin(2 * math.pi * 150 * h * (t0 + i) / SAMPLE_RATE) / h for h in (1, 2, 3))
+                )
+                for i in range(samples)
+            ]
+        else:
+            pcm = [0] * samples
+        frames.append(audioop.lin2ulaw(struct.pack(f"<{samples}h", *pcm), 2))
+    return frames
+
+
+class CallStats:
+    def __init__(self):
+        self.connected_at = 0.0
+        self.first_audio: Optional[float] = None
+        self.chunks = 0
+        self.audio_seconds = 0.0
+        self.bursts = 0
+        self.underruns = 0
+        self.underrun_seconds = 0.0
+        self.jitter: List[float] = []
+        self.clears = 0
+        self.send_lateness: List[float] = []
+        self.error: Optional[str] = None
+
+
+async def simulated_call(ws_url: str, duration: float, audio: List[bytes], stats: CallStats):
+    call_id = str(uuid.uuid4())
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(ws_url, max_msg_size=0) as ws:
+            stats.connected_at = time.monotonic()
+            start = {
+                "event": "start",
+                "start": {
+                    "streamId": str(uuid.uuid4()),
+                    "callId": call_id,
+                    "mediaFormat": {"encoding": "audio/x-mulaw", "sampleRate": SAMPLE_RATE},
+                },
+            }
+            await ws.send_str(json.dumps(start))
+
+            async def send_media():
+                started = time.monotonic()
+                n = 0
+                while time.monotonic() - started < duration:
+                    due = started + n * FRAME_SECONDS
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    else:
+                        stats.send_lateness.append(-delay)
+                    payload = base64.b64encode(audio[n % len(audio)]).decode()
+                    media = {"event": "media", "media": {"track": "inbound", "timestamp": str(n * 20), "payload": payload}}
+                    await ws.send_str(json.dumps(media))
+                    n += 1
+                await ws.close()
+
+            sender = asyncio.create_task(send_media())
+            play_end = 0.0
+            last_arrival = 0.0
+            last_duration = 0.0
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                now = time.monotonic()
+                data = json.loads(message.data)
+                if data.get("event") == "clearAudio":
+                    stats.clears += 1
+                    play_end = 0.0
+                    continue
+                if data.get("event") != "playAudio":
+                    continue
+
+                chunk = len(base64.b64decode(data["media"]["payload"])) / SAMPLE_RATE
+                stats.chunks += 1
+                stats.audio_seconds += chunk
+                if stats.first_audio is None:
+                    stats.first_audio = now - stats.connected_at
+
+                if now - max(play_end, last_arrival) > BURST_GAP:
+                    # New bot turn: start playing after the prebuffer fills
+                    stats.bursts += 1
+                    play_end = now + PREBUFFER + chunk
+                else:
+                    stats.jitter.append(abs((now - last_arrival) - last_duration))
+                    if now > play_end:
+                        stats.underruns += 1
+                        stats.underrun_seconds += now - play_end
+                        play_end = now + chunk
+                    else:
+                        play_end += chunk
+                last_arrival, last_duration = now, chunk
+            await sender
+
+
+def read_proc(pid: int) -> Dict[str, float]:
+    """CPU seconds and RSS bytes of a process (Linux)"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/status") as f:
+        rss = int(re.search(r"VmRSS:\s+(\d+)", f.read()).group(1)) * 1024
+    return {"cpu": cpu, "rss": rss}
+
+
+async def scrape_lag_buckets(session: aiohttp.ClientSession, base_url: str) -> Dict[float, float]:
+    async with session.get(f"{base_url}/metrics") as response:
+        text = await response.text()
+    buckets = {}
+    for match in re.finditer(r'event_loop_lag_seconds_bucket\{le="([^"]+)"\} (\S+)', text):
+        buckets[float(match.group(1))] = float(match.group(2))
+    return buckets
+
+
+def bucket_quantile(before: Dict[float, float], after: Dict[float, float], q: float) -> Optional[float]:
+    """Upper bound of the q-quantile of samples observed between two scrapes"""
+    deltas = sorted((le, after.get(le, 0) - before.get(le, 0)) for le in after)
+    if not deltas or deltas[-1][1] <= 0:
+        return None
+    total = deltas[-1][1]
+    for le, count in deltas:
+        if count >= q * total:
+            return le
+    return math.inf
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))]
+
+
+async def run_step(args, base_url: str, ws_url: str, calls: int, audio: List[bytes], pid: Optional[int]) -> dict:
+    async with aiohttp.ClientSession() as session:
+        lag_before = await scrape_lag_buckets(session, base_url)
+        proc_before = read_proc(pid) if pid else None
+
+        stats = [CallStats() for _ in range(calls)]
+        peak_rss = 0
+
+        async def launch(i: int):
+            await asyncio.sleep(args.ramp * i / calls)
+            try:
+                await simulated_call(ws_url, args.duration, audio, stats[i])
+            except Exception as e:
+                stats[i].error = f"{type(e).__name__}: {e}"
+
+        started = time.monotonic()
+        tasks = [asyncio.create_task(launch(i)) for i in range(calls)]
+        while not all(t.done() for t in tasks):
+            await asyncio.sleep(1.0)
+            if pid:
+                peak_rss = max(peak_rss, read_proc(pid)["rss"])
+        elapsed = time.monotonic() - started
+
+        lag_after = await scrape_lag_buckets(session, base_url)
+        proc_after = read_proc(pid) if pid else None
+
+    chunks = sum(s.chunks for s in stats)
+    jitter = [j for s in stats for j in s.jitter]
+    lateness = [x for s in stats for x in s.send_lateness]
+    first_audio = [s.first_audio for s in stats if s.first_audio is not None]
+    result = {
+        "calls": calls,
+        "errors": sum(1 for s in stats if s.error),
+        "silent_calls": sum(1 for s in stats if not s.chunks),
+        "audio_chunks": chunks,
+        "bot_turns": sum(s.bursts for s in stats),
+        "underruns": sum(s.underruns for s in stats),
+        "underrun_rate": sum(s.underruns for s in stats) / chunks if chunks else 1.0,
+        "underrun_ms_per_call": 1000 * sum(s.underrun_seconds for s in stats) / calls,
+        "jitter_p50_ms": 1000 * percentile(jitter, 0.5),
+        "jitter_p99_ms": 1000 * percentile(jitter, 0.99),
+        "first_audio_p50_ms": 1000 * statistics.median(first_audio) if first_audio else None,
+        "loop_lag_p50_ms": None,
+        "loop_lag_p99_ms": None,
+        "client_send_late_p99_ms": 1000 * percentile(lateness, 0.99),
+    }
+    for q in (0.5, 0.99):
+        value = bucket_quantile(lag_before, lag_after, q)
+        result[f"loop_lag_p{int(q * 100)}_ms"] = value * 1000 if value is not None else None
+    if proc_before and proc_after:
+        result["cpu_percent_per_call"] = 100 * (proc_after["cpu"] - proc_before["cpu"]) / elapsed / calls
+        result["rss_mb_per_call"] = (peak_rss - proc_before["rss"]) / calls / 1e6
+        result["rss_mb"] = peak_rss / 1e6
+    errors = [s.error for s in stats if s.error]
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+def passes(result: dict, args) -> bool:
+    lag = result["loop_lag_p99_ms"]
+    return (
+        result["errors"] == 0
+        and result["silent_calls"] == 0
+        and result["underrun_rate"] <= args.max_underrun_rate
+        and (lag is None or lag <= args.max_lag_ms)
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                # 200 once the pipeline is loaded and the warm pools are full
+                async with session.get(f"{base_url}/readyz") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError("Server did not become ready")
+
+
+async def main(args):
+    audio = caller_audio()
+    server = None
+    pid = args.pid
+    if args.url:
+        ws_url = args.url
+        base_url = ws_url.replace("ws://", "http://").rsplit("/ws", 1)[0]
+    else:
+        workdir = tempfile.mkdtemp()
+        env = dict(
+            os.environ,
+            BOT_PROVIDERS="stub",
+            CALL_HISTORY_DB=os.path.join(workdir, "call_history.db"),
+            TTS_CACHE_DIR=os.path.join(workdir, "tts_cache"),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "server.py", "--host", "127.0.0.1", "--port", str(args.port)],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=open(os.path.join(workdir, "server.log"), "w"),
+        )
+        pid = server.pid
+        base_url = f"http://127.0.0.1:{args.port}"
+        ws_url = f"ws://127.0.0.1:{args.port}/ws"
+        print(f"🚀 Started stub server (pid {pid}), log in {workdir}/server.log")
+
+    results = []
+    try:
+        await wait_ready(base_url)
+        for calls in [int(n) for n in args.steps.split(",")]:
+            print(f"📞 {calls} concurrent calls for {args.duration:.0f}s...")
+            result = await run_step(args, base_url, ws_url, calls, audio, pid)
+            result["pass"] = passes(result, args)
+            results.append(result)
+            await asyncio.sleep(args.cooldown)
+    finally:
+        if server:
+            server.terminate()
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    print(
+        f"\n{'calls':>6} {'lag p50':>8} {'lag p99':>8} {'jitter p99':>11} {'underrun':>9} "
+        f"{'cpu%/call':>10} {'MB/call':>8} {'1st audio':>10}  result"
+    )
+    for r in results:
+        fmt = lambda v, spec: format(v, spec) if v is not None else "-"
+        print(
+            f"{r['calls']:>6} {fmt(r['loop_lag_p50_ms'], '>6.1f')}ms {fmt(r['loop_lag_p99_ms'], '>6.1f')}ms "
+            f"{r['jitter_p99_ms']:>9.1f}ms {100 * r['underrun_rate']:>8.2f}% "
+            f"{fmt(r.get('cpu_percent_per_call'), '>10.2f')} {fmt(r.get('rss_mb_per_call'), '>8.2f')} "
+            f"{fmt(r['first_audio_p50_ms'], '>8.0f')}ms  {'✅' if r['pass'] else '❌'}"
+        )
+        if r.get("first_error"):
+            print(f"       ❌ {r['errors']} errors, first: {r['first_error']}")
+        if r["client_send_late_p99_ms"] > 10:
+            print(f"       ⚠️ Load generator itself ran {r['client_send_late_p99_ms']:.0f} ms late (p99)")
+
+    failing = [r["calls"] for r in results if not r["pass"]]
+    if failing:
+        print(f"\n📉 Audio degrades at {failing[0]} concurrent calls")
+    else:
+        print(f"\n📈 No degradation up to {results[-1]['calls']} concurrent calls")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    gate = [r for r in results if r["calls"] <= args.gate_calls]
+    sys.exit(0 if all(r["pass"] for r in gate) else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent Plivo media stream load test (offline)")
+    parser.add_argument("--steps", default="10,25,50,100", help="Comma-separated concurrent call counts")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds each call streams audio")
+    parser.add_argument("--ramp", type=float, default=2.0, help="Seconds over which calls connect")
+    parser.add_argument("--cooldown", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--url", help="ws:// URL of an already running server instead of starting one")
+    parser.add_argument("--pid", type=int, help="Server PID for CPU/RSS when using --url")
+    parser.add_argument("--max-underrun-rate", type=float, default=0.01, help="Gate: underruns per audio chunk")
+    parser.add_argument("--max-lag-ms", type=float, default=50.0, help="Gate: event loop lag p99")
+    parser.add_argument("--gate-calls", type=int, default=0, help="Fail if any step up to this many calls degrades")
+    parser.add_argument("--json", help="Write results to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Event-loop latency with logging off, with the old synchronous sinks and with
+the batched structured sinks from logging_setup.py
+
+Each simulated call logs one debug line per 20 ms audio frame and an info line
+per simulated turn, the same shape as the bot's audio path.
+
+    python benchmarks/logging_latency.py --calls 100 --seconds 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from config import LoggingConfig
+from logging_setup import audio_debug_sampled, configure_logging
+
+
+async def simulated_call(call_id: int, stop: asyncio.Event, guarded: bool):
+    frame = 0
+    with logger.contextualize(call_id=f"call-{call_id}"):
+        while not stop.is_set():
+            await asyncio.sleep(0.02)
+            frame += 1
+            if not guarded or audio_debug_sampled():
+                logger.debug(f"🎵 Audio frame {frame} received (160 bytes)")
+            if frame % 50 == 0:
+                logger.info(f"🗣️ Turn {frame // 50} transcribed")
+
+
+async def measure(calls: int, seconds: float, guarded: bool) -> list:
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(simulated_call(i, stop, guarded)) for i in range(calls)]
+    lag = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lag.append((time.perf_counter() - started - 0.01) * 1000)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return sorted(lag)
+
+
+def report(name: str, lag: list):
+    p99 = lag[int(len(lag) * 0.99) - 1]
+    print(f"{name:<10} p50={statistics.median(lag):6.2f}ms  p99={p99:6.2f}ms  max={lag[-1]:6.2f}ms")
+
+
+def main(args):
+    workdir = tempfile.mkdtemp()
+    results = {}
+
+    logger.remove()
+    results["off"] = asyncio.run(measure(args.calls, args.seconds, guarded=False))
+
+    # Previous setup: synchronous DEBUG file sink plus a print() sink
+    logger.remove()
+    logger.add(os.path.join(workdir, "sync.log"), rotation="1 MB", level="DEBUG")
+    logger.add(lambda msg: print(f"🔍 {msg}", end="", file=sys.stderr), level="DEBUG")
+    results["sync"] = asyncio.run(measure(args.calls, args.seconds, guarded=False))
+
+    configure_logging(
+        LoggingConfig(level="INFO", audio_debug_sample_rate=args.sample_rate),
+        json_file=os.path.join(workdir, "batched.log"),
+    )
+    results["batched"] = asyncio.run(measure(args.calls, args.seconds, guarded=True))
+    logger.complete()
+    logger.remove()
+
+    print(f"\n⏱️ Event loop lag with {args.calls} simulated calls for {args.seconds:.0f}s")
+    for name, lag in results.items():
+        report(name, lag)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event-loop latency with logging on vs off")
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--sample-rate", type=float, default=0.0, help="Audio-path debug sampling")
+    main(parser.parse_args())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Count provider handshakes per call against local mock OpenAI, Cartesia and Deepgram servers
+
+The mock servers count new HTTP connections and WebSocket upgrades and delay
+each one by --handshake-ms, standing in for TLS and upgrade round trips to the
+real providers. Each simulated call opens its TTS and STT sockets and makes
+one streaming LLM request, first with fresh pipecat services (what every call
+paid before) and then with the shared provider pool.
+
+    python benchmarks/mock_providers.py --calls 20 --handshake-ms 80
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+os.environ.setdefault("CARTESIA_API_KEY", "mock")
+os.environ.setdefault("DEEPGRAM_API_KEY", "mock")
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from pipecat.services.cartesia.tts import CartesiaTTSService
+from pipecat.services.deepgram.stt import DeepgramSTTService
+from pipecat.services.openai.llm import OpenAILLMService
+
+from provider_pool import ProviderPool
+
+
+class MockProviders:
+    """One local server speaking just enough of each provider's protocol"""
+
+    def __init__(self, handshake_delay: float):
+        self.handshake_delay = handshake_delay
+        self.handshakes = Counter()
+        self._http_clients = set()
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self.chat)
+        self.app.websocket("/tts/websocket")(self.cartesia)
+        self.app.websocket("/v1/listen")(self.deepgram)
+
+    async def chat(self, request: Request):
+        # A client port we haven't seen is a new TCP (and, for real, TLS) connection
+        client = (request.client.host, request.client.port)
+        if client not in self._http_clients:
+            self._http_clients.add(client)
+            self.handshakes["openai"] += 1
+            await asyncio.sleep(self.handshake_delay)
+
+        async def events():
+            for word in ["Hello", " there", "!"]:
+                chunk = {
+                    "id": "mock",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "mock",
+                    "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def cartesia(self, websocket: WebSocket):
+        self.handshakes["cartesia"] += 1
+        await asyncio.sleep(self.handshake_delay)
+        await websocket.accept()
+        try:
+            while True:
+                msg = json.loads(await websocket.receive_text())
+                if msg.get("transcript"):
+                    await websocket.send_text(
+                        json.dumps({"type": "chunk", "context_id": msg["context_id"], "data": ""})
+                    )
+                if not msg.get("continue", True):
+                    await websocket.send_text(json.dumps({"type": "done", "context_id": msg["context_id"]}))
+        except WebSocketDisconnect:
+            pass
+
+    async def deepgram(self, websocket: WebSocket):
+        self.handshakes["deepgram"] += 1
+        await asyncio.sleep(self.handshake_delay)
+        await websocket.accept()
+        try:
+            while True:
+                msg = await websocket.receive()
+                if msg["type"] == "websocket.disconnect":
+                    return
+                if '"CloseStream"' in (msg.get("text") or ""):
+                    await websocket.close()
+                    return
+        except WebSocketDisconnect:
+            pass
+
+
+async def run_call(llm, stt, tts, pooled: bool) -> float:
+    """Open what a call needs before it can answer; returns seconds until ready"""
+    start = time.perf_counter()
+    await asyncio.gather(tts._connect_websocket(), stt._connect(), first_llm_token(llm))
+    ready = time.perf_counter() - start
+    await tts._get_websocket().send(json.dumps({"context_id": "c", "transcript": "Hi.", "continue": False}))
+    await tts._get_websocket().recv()
+    if pooled:
+        # What stop(EndFrame) does for a call that ended normally
+        tts._ended = True
+    await tts._disconnect_websocket()
+    await stt._connection.finish()
+    return ready
+
+
+async def first_llm_token(llm):
+    stream = await llm._client.chat.completions.create(
+        model="mock", messages=[{"role": "user", "content": "Hi"}], stream=True
+    )
+    # Read the whole reply, as the LLM service does; an abandoned stream closes its connection
+    async for _ in stream:
+        pass
+
+
+async def main(args):
+    mock = MockProviders(args.handshake_ms / 1000)
+    server = uvicorn.Server(uvicorn.Config(mock.app, host="127.0.0.1", port=args.port, log_level="error"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    base = f"127.0.0.1:{args.port}"
+    # Services take their sample rate from the pipeline's StartFrame
+    sample_rate = {"sample_rate": 8000}
+
+    results = {}
+    mock.handshakes.clear()
+    fresh = []
+    for _ in range(args.calls):
+        llm = OpenAILLMService(api_key="mock", base_url=f"http://{base}/v1")
+        stt = DeepgramSTTService(api_key="mock", base_url=f"http://{base}")
+        stt._settings.update(sample_rate)
+        tts = CartesiaTTSService(api_key="mock", voice_id="mock", url=f"ws://{base}/tts/websocket")
+        fresh.append(await run_call(llm, stt, tts, pooled=False))
+        await asyncio.sleep(args.gap)
+    results["fresh services"] = (fresh, dict(mock.handshakes))
+
+    providers = ProviderPool(
+        tts_sockets=args.pool_size,
+        stt_sockets=args.pool_size,
+        http_connections=10,
+        openai_base_url=f"http://{base}/v1",
+        cartesia_url=f"ws://{base}/tts/websocket",
+        deepgram_url=f"http://{base}",
+    )
+    providers.start()
+    while len(providers.tts_sockets) < args.pool_size or len(providers.stt_sockets) < args.pool_size:
+        await asyncio.sleep(0.05)
+    mock.handshakes.clear()
+    pooled = []
+    for _ in range(args.calls):
+        stt = providers.stt()
+        stt._settings.update(sample_rate)
+        pooled.append(await run_call(providers.llm(), stt, providers.tts("mock"), pooled=True))
+        # Give the pool its time between calls to replace used sockets
+        await asyncio.sleep(args.gap)
+    results["provider pool"] = (pooled, dict(mock.handshakes))
+    await providers.close()
+
+    print(f"{args.calls} calls, {args.handshake_ms:.0f}ms per handshake\n")
+    print(f"{'':<16} {'ready p50':>10} {'ready max':>10}  handshakes (openai / cartesia / deepgram)")
+    for name, (times, counts) in results.items():
+        print(
+            f"{name:<16} {statistics.median(times) * 1000:>8.1f}ms {max(times) * 1000:>8.1f}ms  "
+            f"{counts.get('openai', 0)} / {counts.get('cartesia', 0)} / {counts.get('deepgram', 0)}"
+        )
+    print("\nWith the pool, Deepgram handshakes happen between calls rather than during them.")
+
+    server.should_exit = True
+    await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Provider handshakes per call against local mock servers")
+    parser.add_argument("--calls", type=int, default=20, help="Simulated calls per mode")
+    parser.add_argument("--handshake-ms", type=float, default=80.0, help="Delay added to each new connection")
+    parser.add_argument("--pool-size", type=int, default=2, help="Sockets kept open per provider")
+    parser.add_argument("--gap", type=float, default=0.2, help="Seconds between calls")
+    parser.add_argument("--port", type=int, default=8799)
+    logger.remove()
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Launch server.py with several workers and route simulated calls through them
+
+Each simulated call hits /answer, /ws (start event) and /hangup on fresh
+connections, so the kernel spreads them over workers, and checks that every
+step sees the state written by the previous one.
+
+    python benchmarks/route_calls.py --workers 4 --calls 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def wait_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{base_url}/api/calls") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError("Server did not become ready")
+
+
+async def simulate_call(base_url: str, stream_media: bool) -> dict:
+    call_uuid = str(uuid.uuid4())
+    request_uuid = str(uuid.uuid4())
+    connector = aiohttp.TCPConnector(force_close=True)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        form = {"CallUUID": call_uuid, "RequestUUID": request_uuid, "From": "+912200000000", "To": "+919100000000"}
+        async with session.post(f"{base_url}/answer", data=form) as response:
+            assert response.status == 200, await response.text()
+
+        async with session.get(f"{base_url}/api/calls/{call_uuid}") as response:
+            answered = await response.json()
+        assert answered["status"] == "answered", answered
+
+        if stream_media:
+            ws_url = base_url.replace("http://", "ws://") + "/ws"
+            async with session.ws_connect(ws_url) as ws:
+                start = {"event": "start", "start": {"streamId": str(uuid.uuid4()), "callId": call_uuid}}
+                await ws.send_str(json.dumps(start))
+                for _ in range(50):
+                    async with session.get(f"{base_url}/api/calls/{call_uuid}") as response:
+                        streaming = await response.json()
+                    if streaming["status"] == "streaming":
+                        break
+                    await asyncio.sleep(0.1)
+                assert streaming["status"] == "streaming", streaming
+
+        async with session.post(f"{base_url}/hangup", data={"CallUUID": call_uuid, "HangupCause": "NORMAL_CLEARING"}) as response:
+            assert response.status == 200
+
+        async with session.get(f"{base_url}/api/calls/{call_uuid}") as response:
+            final = await response.json()
+        assert final["status"] == "completed", final
+        return final
+
+
+async def main(args):
+    db_path = os.path.join(tempfile.mkdtemp(), "call_state.db")
+    port = args.port
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [
+            sys.executable, "server.py",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(args.workers),
+            "--call-store", f"sqlite:///{db_path}",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await wait_ready(base_url)
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def bounded():
+            async with semaphore:
+                return await simulate_call(base_url, args.ws)
+
+        results = await asyncio.gather(*(bounded() for _ in range(args.calls)), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    completed = [r for r in results if not isinstance(r, BaseException)]
+    workers = {r["answered_by"] for r in completed} | {r["hangup_by"] for r in completed}
+    cross_worker = sum(1 for r in completed if r["answered_by"] != r["hangup_by"])
+
+    print(f"📞 Routed {len(completed)}/{args.calls} calls in {elapsed:.2f}s across {len(workers)} workers")
+    print(f"🔀 Calls answered and hung up on different workers: {cross_worker}")
+    for failure in failures[:5]:
+        print(f"❌ {type(failure).__name__}: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Route simulated calls through a multi-worker server")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--ws", action="store_true", help="Also open /ws with a start event for each call")
+    asyncio.run(main(parser.parse_args()))
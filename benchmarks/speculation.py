@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Speculative LLM replies against a scripted streaming STT
+
+Plays scripted caller turns (speech, then silence until VAD reports the end of
+speech) through ScriptedSTTService, which sends interim transcripts while the
+caller speaks and the final one after its endpointing delay. The LLM stub
+echoes the caller's words, so a replayed reply shows which transcript it was
+generated from. Runs the turns with and without speculation and reports the
+time from end of speech to the first reply token, the hit rate and the tokens
+spent on discarded replies. Exits non-zero if a reply answers words further
+from the final transcript than the similarity threshold allows.
+
+    python benchmarks/speculation.py --ttft 0.4 --vad-stop 0.8
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    LLMFullResponseEndFrame,
+    LLMTextFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from context_manager import ContextBudget, message_text
+from speculative import Speculator, llm_completer, similarity
+from stub_services import ScriptedSTTService, ScriptedTurn, StubLLMService, tone
+
+FRAME_SECONDS = 0.02
+REPLY_PREFIX = "You said: "
+
+TURNS = [
+    ScriptedTurn("What time do you open tomorrow?"),
+    ScriptedTurn(
+        "I want to book a table for four.",
+        interims=["i", "i want to", "i want to book", "i want to book a table", "i want to book a table for for"],
+    ),
+    ScriptedTurn("Can you send the invoice to my email?"),
+    # STT revises a word after the caller stops; the final only arrives once VAD has stopped
+    ScriptedTurn(
+        "Is the Boston store open on Sunday?",
+        interims=["is the", "is the austin store", "is the austin store open", "is the austin store open on sunday"],
+        final_delay=2.0,
+    ),
+    ScriptedTurn("Yes please."),
+    ScriptedTurn("My order number is four five seven two."),
+]
+
+
+class EchoLLM(StubLLMService):
+    """Replies with the caller's last words, so each reply shows what it answered"""
+
+    def reply(self, messages: List[dict]) -> str:
+        return REPLY_PREFIX + message_text(messages[-1])
+
+
+class ReplySink(FrameProcessor):
+    """Records when each reply's first token arrives and its full text"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.first_token: Optional[float] = None
+        self.text = ""
+        self.done = asyncio.Event()
+
+    def reset(self):
+        self.first_token = None
+        self.text = ""
+        self.done.clear()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, LLMTextFrame):
+            if self.first_token is None:
+                self.first_token = time.monotonic()
+            self.text += frame.text
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            self.done.set()
+        await self.push_frame(frame, direction)
+
+
+async def drive(task: PipelineTask, sink: ReplySink, turns: List[ScriptedTurn], args, results: list):
+    speech = tone(FRAME_SECONDS, 8000)
+    silence = bytes(len(speech))
+
+    async def send(audio: bytes, seconds: float):
+        # Real-time pacing, as the transport delivers caller audio
+        for _ in range(round(seconds / FRAME_SECONDS)):
+            await task.queue_frame(InputAudioRawFrame(audio=audio, sample_rate=8000, num_channels=1))
+            await asyncio.sleep(FRAME_SECONDS)
+
+    await asyncio.sleep(0.2)
+    for turn in turns:
+        sink.reset()
+        await task.queue_frame(UserStartedSpeakingFrame())
+        await send(speech, len(turn.interim_texts()) * args.interim_seconds + FRAME_SECONDS)
+        speech_end = time.monotonic()
+        await send(silence, args.vad_stop)
+        await task.queue_frame(UserStoppedSpeakingFrame())
+        await asyncio.wait_for(sink.done.wait(), timeout=10)
+        results.append((turn, sink.first_token - speech_end, sink.text))
+        await asyncio.sleep(args.gap)
+    await task.queue_frame(EndFrame())
+
+
+async def run(args, speculate: bool):
+    llm = EchoLLM(ttft=args.ttft, token_interval=0.02)
+    context = OpenAILLMContext([{"role": "system", "content": "You are a test bot."}])
+    context_aggregator = llm.create_context_aggregator(context)
+    budget = ContextBudget()
+    speculator = Speculator(context, llm_completer(llm), budget, args.threshold) if speculate else None
+    sink = ReplySink()
+    stt = ScriptedSTTService(TURNS, interim_seconds=args.interim_seconds, endpointing=args.endpointing)
+
+    processors = [
+        stt,
+        speculator.listener() if speculator else None,
+        context_aggregator.user(),
+        budget,
+        speculator.gate() if speculator else None,
+        llm,
+        sink,
+        context_aggregator.assistant(),
+    ]
+    task = PipelineTask(
+        Pipeline([p for p in processors if p is not None]),
+        params=PipelineParams(audio_in_sample_rate=8000, audio_out_sample_rate=8000, allow_interruptions=True),
+    )
+    results = []
+    driver = asyncio.create_task(drive(task, sink, TURNS, args, results))
+    await PipelineRunner(handle_sigint=False).run(task)
+    await driver
+    return results, speculator.summary() if speculator else None
+
+
+async def main(args):
+    baseline, _ = await run(args, speculate=False)
+    speculative, summary = await run(args, speculate=True)
+
+    ok = True
+    print(f"{'caller (final transcript)':<42} {'normal':>8} {'speculative':>12}  reply")
+    for (turn, normal, _), (_, fast, reply) in zip(baseline, speculative):
+        answered = reply[len(REPLY_PREFIX):]
+        close = similarity(answered, turn.final) >= args.threshold
+        ok = ok and close
+        note = "" if answered == turn.final else f" (answered {answered!r})"
+        print(f"{turn.final:<42} {normal * 1000:>6.0f}ms {fast * 1000:>10.0f}ms  {'✅' if close else '❌'}{note}")
+
+    normal_p50 = statistics.median(r[1] for r in baseline) * 1000
+    fast_p50 = statistics.median(r[1] for r in speculative) * 1000
+    print(f"\n⏱️ End of speech to first reply token: p50 {normal_p50:.0f}ms → {fast_p50:.0f}ms")
+    print(
+        f"🔮 {summary['hit']}/{summary['turns']} turns replayed a speculative reply "
+        f"(hit rate {summary['hit_rate']:.0%}, {summary['miss']} missed, {summary['restarted']} restarted)"
+    )
+    print(
+        f"🗑️ Wasted: {summary['wasted_prompt_tokens']} prompt + {summary['wasted_completion_tokens']} "
+        f"completion tokens (estimated)"
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speculative LLM replies on scripted interim transcripts")
+    parser.add_argument("--ttft", type=float, default=0.4, help="LLM time to first token (s)")
+    parser.add_argument("--interim-seconds", type=float, default=0.25, help="Speech per interim transcript (s)")
+    parser.add_argument("--endpointing", type=float, default=0.3, help="Silence before the final transcript (s)")
+    parser.add_argument("--vad-stop", type=float, default=0.8, help="Silence before VAD reports end of speech (s)")
+    parser.add_argument("--threshold", type=float, default=0.9, help="Similarity needed to replay a speculation")
+    parser.add_argument("--gap", type=float, default=0.3, help="Seconds between turns")
+    logger.remove()
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Track how long server.py takes to import and to start serving calls
+
+Imports server in fresh interpreters with -X importtime and reports the median
+import time, the slowest modules it imports directly and any call-pipeline
+modules (pipecat, provider SDKs, Silero) that leaked into the import. Starts the
+server with offline stub services (BOT_PROVIDERS=stub) and times how long
+/healthz and /readyz take to answer 200. Exits non-zero if the import goes
+over --max-import-ms or loads a pipeline module, so regressions fail CI.
+
+    python benchmarks/startup_time.py --runs 5 --max-import-ms 1500
+    python benchmarks/startup_time.py --no-serve --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that belong to the call pipeline and should load in the background warm-up
+HEAVY_MODULES = ("pipecat", "openai", "deepgram", "onnxruntime", "scipy", "bot", "warm_pool", "provider_pool")
+
+
+def import_profile() -> Tuple[float, Dict[str, int], List[str]]:
+    """Import server in a fresh interpreter; returns (seconds, μs per module server imports, heavy modules)"""
+    probe = (
+        "import sys, time; start = time.perf_counter(); import server; "
+        "print(time.perf_counter() - start); print(' '.join(sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, BOT_PROVIDERS="stub"),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import server failed:\n{result.stderr[-2000:]}")
+    seconds, modules = result.stdout.strip().splitlines()[-2:]
+    # importtime lines are "self | cumulative | <2 spaces per level>name", children before their parent
+    children: Dict[str, int] = {}
+    cumulative: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|", 2)
+        if not total.strip().isdigit():
+            continue
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level == 1:
+            children[name.strip()] = int(total)
+        elif level == 0:
+            if name.strip() == "server":
+                cumulative = children
+            children = {}
+    heavy = sorted(m for m in modules.split() if m.split(".")[0] in HEAVY_MODULES)
+    return float(seconds), cumulative, heavy
+
+
+def wait_for(url: str, deadline: float) -> Optional[float]:
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.monotonic()
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def serve_times(port: int, timeout: float) -> Dict[str, Optional[float]]:
+    """Seconds from launching the stub server until /healthz and /readyz return 200"""
+    workdir = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        BOT_PROVIDERS="stub",
+        CALL_HISTORY_DB=os.path.join(workdir, "call_history.db"),
+        TTS_CACHE_DIR=os.path.join(workdir, "tts_cache"),
+    )
+    started = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "server.py", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=open(os.path.join(workdir, "server.log"), "w"),
+    )
+    try:
+        deadline = started + timeout
+        healthy = wait_for(f"http://127.0.0.1:{port}/healthz", deadline)
+        ready = wait_for(f"http://127.0.0.1:{port}/readyz", deadline)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return {
+        "healthz_seconds": healthy - started if healthy else None,
+        "readyz_seconds": ready - started if ready else None,
+    }
+
+
+def main(args):
+    runs = [import_profile() for _ in range(args.runs)]
+    import_seconds = statistics.median(seconds for seconds, _, _ in runs)
+    _, cumulative, heavy = runs[-1]
+    result = {"import_seconds": round(import_seconds, 4), "heavy_modules": heavy}
+
+    print(f"⏱️ import server: median {import_seconds * 1000:.0f}ms over {args.runs} runs")
+    print(f"\n{'module':<32} {'cumulative':>10}")
+    for name, total in sorted(cumulative.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{name:<32} {total / 1000:>8.1f}ms")
+    if heavy:
+        print(f"\n❌ Call pipeline modules loaded at import: {', '.join(heavy[:10])}")
+
+    if args.serve:
+        result.update(serve_times(args.port, args.timeout))
+        fmt = lambda v: f"{v:.2f}s" if v is not None else "timed out"
+        print(f"\n💓 /healthz 200 after {fmt(result['healthz_seconds'])}")
+        print(f"✅ /readyz 200 after {fmt(result['readyz_seconds'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failed = bool(heavy) or import_seconds * 1000 > args.max_import_ms
+    if args.serve and result["readyz_seconds"] is None:
+        failed = True
+    if import_seconds * 1000 > args.max_import_ms:
+        print(f"\n❌ Import took longer than {args.max_import_ms:.0f}ms")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="server.py import time and time to ready")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to import server in")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports of server to list")
+    parser.add_argument("--max-import-ms", type=float, default=1500.0, help="Fail above this median import time")
+    parser.add_argument("--no-serve", dest="serve", action="store_false", help="Skip timing /healthz and /readyz")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for /readyz")
+    parser.add_argument("--port", type=int, default=8797)
+    parser.add_argument("--json", help="Write results to this file")
+    main(parser.parse_args())
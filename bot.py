@@ -5,156 +5,300 @@
 #
 
 import os
-import sys
+import time
 from typing import Optional
 
 from dotenv import load_dotenv
 from fastapi import WebSocket
 from loguru import logger
 
-from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.frames.frames import EndFrame, TTSSpeakFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
-from pipecat.serializers.plivo import PlivoFrameSerializer
-from pipecat.services.cartesia.tts import CartesiaTTSService
-from pipecat.services.deepgram.stt import DeepgramSTTService
-from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.network.fastapi_websocket import (
     FastAPIWebsocketParams,
     FastAPIWebsocketTransport,
 )
 
+from audio_codec import FastPlivoFrameSerializer
+from admission import output_queue_seconds
+from call_capture import CallCapture
+from call_history import get_history_store
+from call_timeouts import CallTimeouts
+from config import get_config
+from context_manager import ContextBudget
+from pacer import PacedWebsocketTransport
+from pipeline_metrics import CallLatencyObserver, PickupLatencyObserver
+from profiles import get_profile_cache
+from recorder import CallRecorder
+from sessions import get_session_registry
+from speculative import Speculator, llm_completer
+from text_chunker import TextChunker
+from timer_wheel import get_timer_wheel
+from tts_cache import CachedSpeechFrame, TTSCacheRecorder, get_tts_cache
+from vad_gate import STTGate
+from warm_pool import get_component_pools
+
 load_dotenv()
-logger.remove(0)
-logger.add(sys.stderr, level="DEBUG")
 
+# Longest a farewell may take to play before the call is cut off anyway
+FAREWELL_GRACE_SECONDS = 10.0
+
+
+async def run_bot(
+    websocket_client: WebSocket,
+    stream_id: str,
+    call_id: Optional[str],
+    accepted_at: Optional[float] = None,
+    profile: Optional[str] = None,
+):
+    accepted_at = accepted_at or time.monotonic()
+    pools = get_component_pools()
+    # Read settings once so the whole call uses one consistent version
+    settings = get_config().snapshot()
+    # Prompt, voice, audio rate and policies for this call, compiled once per profile
+    bot_profile = get_profile_cache().get(profile, settings)
+    sample_rate = bot_profile.sample_rate
 
-async def run_bot(websocket_client: WebSocket, stream_id: str, call_id: Optional[str]):
-    logger.info(f"🤖 STARTING AI BOT")
-    logger.info(f"🆔 Stream ID: {stream_id}")
-    logger.info(f"📞 Call ID: {call_id}")
+    logger.info(
+        f"🤖 STARTING AI BOT (stream {stream_id}, profile {bot_profile.name}, settings v{settings.version})"
+    )
 
     # Initialize Plivo serializer
-    logger.info("🔧 Initializing Plivo serializer...")
+    logger.debug("🔧 Initializing Plivo serializer...")
     auth_id = os.getenv("PLIVO_AUTH_ID")
     auth_token = os.getenv("PLIVO_AUTH_TOKEN")
-    logger.info(f"🔑 Using Plivo Auth ID: {auth_id}")
+    logger.debug(f"🔑 Using Plivo Auth ID: {auth_id}")
 
-    serializer = PlivoFrameSerializer(
+    serializer = FastPlivoFrameSerializer(
         stream_id=stream_id,
         call_id=call_id,
         auth_id=auth_id,
         auth_token=auth_token,
     )
-    logger.info("✅ Plivo serializer created")
+    logger.debug("✅ Plivo serializer created")
 
     # Initialize transport
-    logger.info("🚀 Initializing WebSocket transport...")
-    transport = FastAPIWebsocketTransport(
-        websocket=websocket_client,
-        params=FastAPIWebsocketParams(
-            audio_in_enabled=True,
-            audio_out_enabled=True,
-            add_wav_header=False,
-            vad_analyzer=SileroVADAnalyzer(),
-            serializer=serializer,
-        ),
+    logger.debug("🚀 Initializing WebSocket transport...")
+    performance = settings.config.performance
+    transport_params = FastAPIWebsocketParams(
+        audio_in_enabled=True,
+        audio_out_enabled=True,
+        add_wav_header=False,
+        vad_analyzer=bot_profile.configure_vad(pools.vad()),
+        serializer=serializer,
     )
-    logger.info("✅ WebSocket transport created")
+    if performance.audio_pacing:
+        # 20 ms bot audio frames off the shared clock; caller audio through a jitter buffer
+        transport_params.audio_out_10ms_chunks = 2
+        transport = PacedWebsocketTransport(
+            websocket_client,
+            transport_params,
+            lead=performance.audio_lead_ms / 1000,
+            min_jitter_depth=performance.jitter_buffer_min_ms / 1000,
+            max_jitter_depth=performance.jitter_buffer_max_ms / 1000,
+        )
+    else:
+        transport = FastAPIWebsocketTransport(websocket=websocket_client, params=transport_params)
+    logger.debug("✅ WebSocket transport created")
 
     # Initialize AI services
-    logger.info("🧠 Initializing OpenAI LLM...")
-    openai_key = os.getenv("OPENAI_API_KEY")
-    logger.info(f"🔑 OpenAI key: {'*' * (len(openai_key) - 4) + openai_key[-4:] if openai_key else 'NOT SET'}")
-    llm = OpenAILLMService(api_key=openai_key)
-    logger.info("✅ OpenAI LLM initialized")
-
-    logger.info("🎤 Initializing Deepgram STT...")
-    deepgram_key = os.getenv("DEEPGRAM_API_KEY")
-    logger.info(f"🔑 Deepgram key: {'*' * (len(deepgram_key) - 4) + deepgram_key[-4:] if deepgram_key else 'NOT SET'}")
-    stt = DeepgramSTTService(api_key=deepgram_key)
-    logger.info("✅ Deepgram STT initialized")
-
-    logger.info("🗣️ Initializing Cartesia TTS...")
-    cartesia_key = os.getenv("CARTESIA_API_KEY")
-    logger.info(f"🔑 Cartesia key: {'*' * (len(cartesia_key) - 4) + cartesia_key[-4:] if cartesia_key else 'NOT SET'}")
-    tts = CartesiaTTSService(
-        api_key=cartesia_key,
-        voice_id="71a7ad14-091c-4e8e-a314-022ece01c121",  # British Reading Lady
-    )
-    logger.info("✅ Cartesia TTS initialized with British Reading Lady voice")
+    logger.debug("🧠 Initializing OpenAI LLM...")
+    llm = pools.llm()
+    logger.debug("✅ OpenAI LLM initialized")
+
+    logger.debug("🎤 Initializing Deepgram STT...")
+    stt = pools.stt()
+    logger.debug("✅ Deepgram STT initialized")
+
+    logger.debug("🗣️ Initializing Cartesia TTS...")
+    voice_id = bot_profile.profile.voice_id
+    tts = pools.tts(voice_id)
+    logger.debug(f"✅ Cartesia TTS initialized with voice {bot_profile.voice_name}")
 
     # Set up conversation context
-    logger.info("📚 Setting up AI conversation context...")
-    messages = [
-        {
-            "role": "system",
-            "content": "You are a friendly elementary teacher in India having an audio call. Your output will be converted to audio so don't include special characters in your answers. Respond to what the student said in a short sentence. Be encouraging and educational. Speak clearly and simply.",
-        },
-    ]
-    logger.info(f"📝 System message: {messages[0]['content']}")
+    logger.debug("📚 Setting up AI conversation context...")
+    messages = bot_profile.messages()
+    logger.debug(f"📝 System message: {messages[0]['content']}")
 
     context = OpenAILLMContext(messages)
     context_aggregator = llm.create_context_aggregator(context)
-    logger.info("✅ AI context and aggregator created")
+    context_budget = ContextBudget(bot_profile.profile.context, pools.summarizer())
+    logger.debug("✅ AI context and aggregator created")
 
-    # Build the AI pipeline
-    logger.info("🔧 Building AI processing pipeline...")
-    pipeline = Pipeline(
-        [
-            transport.input(),  # Websocket input from client
-            stt,  # Speech-To-Text (Deepgram)
-            context_aggregator.user(),
-            llm,  # LLM (OpenAI)
-            tts,  # Text-To-Speech (Cartesia)
-            transport.output(),  # Websocket output to client
-            context_aggregator.assistant(),
-        ]
+    tts_cache = get_tts_cache()
+    tts_recorder = TTSCacheRecorder(tts_cache, voice_id)
+    stt_gate = (
+        STTGate(performance.stt_gate_pre_roll_ms, performance.stt_gate_hangover_ms)
+        if performance.stt_gate_enabled
+        else None
+    )
+    speculator = (
+        Speculator(context, llm_completer(llm), context_budget, performance.speculation_similarity)
+        if performance.speculative_llm
+        else None
     )
-    logger.info("✅ AI pipeline built successfully")
-    logger.info("🔄 Pipeline flow: Audio → STT → AI → TTS → Audio")
+    speculation_gate = speculator.gate() if speculator else None
+
+    # Build the AI pipeline
+    logger.debug("🔧 Building AI processing pipeline...")
+    processors = [
+        transport.input(),  # Websocket input from client
+        stt_gate,  # Keeps caller silence away from STT
+        stt,  # Speech-To-Text (Deepgram)
+        speculator.listener() if speculator else None,  # Starts replies on stable interim transcripts
+        context_aggregator.user(),
+        context_budget,  # Trims history to the template's token budget
+        speculation_gate,  # Replays a speculative reply that still matches
+        llm,  # LLM (OpenAI)
+        TextChunker(bot_profile.profile.chunk),  # Clause/sentence chunks for TTS
+        tts,  # Text-To-Speech (Cartesia)
+        tts_recorder,  # Plays cached fixed lines, or stores their audio on a cache miss
+        transport.output(),  # Websocket output to client
+        context_aggregator.assistant(),
+    ]
+    pipeline = Pipeline([p for p in processors if p is not None])
+    logger.debug("✅ AI pipeline built successfully")
+    logger.debug("🔄 Pipeline flow: Audio → Gate → STT → AI → Chunker → TTS → Audio")
 
     # Create pipeline task
-    logger.info("⚙️ Creating pipeline task...")
+    logger.debug("⚙️ Creating pipeline task...")
+    latency_observer = CallLatencyObserver()
+
+    async def speak_fixed(text: str):
+        """Say a fixed line (greeting, stock reply) from the TTS cache, caching it on a miss"""
+        audio = await tts_cache.get(voice_id, sample_rate, text)
+        if audio:
+            logger.debug(f"⚡ Playing cached audio: {text[:50]}")
+            if recorder:
+                recorder.bot_said(text)
+            # Played by tts_recorder, after STT, so the bot doesn't hear itself
+            await task.queue_frame(CachedSpeechFrame(audio, sample_rate))
+        else:
+            logger.debug(f"📤 Synthesizing: {text}")
+            tts_recorder.expect(text)
+            await task.queue_frames([TTSSpeakFrame(text)])
+
+    hangup_timer = None
+
+    async def end_call(reason: str):
+        nonlocal hangup_timer
+        logger.warning(f"⏰ Ending call: {reason} timeout")
+        get_history_store().record(call_id, "timeout", reason=reason)
+        farewell = bot_profile.profile.farewells.get(reason)
+        if not farewell:
+            await task.cancel()
+            return
+        # Say goodbye, then end once the audio has played; cancel if that stalls
+        await speak_fixed(farewell)
+        await task.queue_frame(EndFrame())
+        hangup_timer = get_timer_wheel().schedule(FAREWELL_GRACE_SECONDS, task.cancel)
+
+    call_config = settings.config.call
+    timeouts = CallTimeouts(call_config.max_call_duration, call_config.idle_timeout, end_call)
+    observers = [PickupLatencyObserver(accepted_at), latency_observer, timeouts]
+    recorder = None
+    if call_config.record_calls:
+        recorder = CallRecorder(call_id or stream_id, transport.input(), transport.output(), stt)
+        observers.append(recorder)
+    capture = None
+    if call_config.capture_calls:
+        # Caller audio and provider timing, for replay with benchmarks/call_replay.py
+        capture = CallCapture(
+            call_id or stream_id,
+            stt,
+            llm,
+            tts,
+            gate=speculation_gate,
+            meta={"stream_id": stream_id, "profile": bot_profile.name, "sample_rate": sample_rate},
+        )
+        serializer.on_media = capture.media
+        observers.append(capture)
     task = PipelineTask(
         pipeline,
         params=PipelineParams(
-            audio_in_sample_rate=8000,
-            audio_out_sample_rate=8000,
+            audio_in_sample_rate=sample_rate,
+            audio_out_sample_rate=sample_rate,
             allow_interruptions=True,
         ),
+        observers=observers,
     )
-    logger.info("✅ Pipeline task created with 8kHz audio and interruptions enabled")
+    logger.debug(f"✅ Pipeline task created with {sample_rate // 1000}kHz audio and interruptions enabled")
 
     # Set up event handlers
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
         logger.info("🔗 CLIENT CONNECTED TO AI BOT!")
-        logger.info("🎬 Starting conversation with introduction...")
-        # Kick off the conversation.
-        intro_message = {
-            "role": "system", 
-            "content": "Please introduce yourself to the caller as a friendly AI teacher from India. Say hello and ask how you can help them learn today."
-        }
-        messages.append(intro_message)
-        logger.info(f"📤 Sending intro message: {intro_message['content']}")
-        await task.queue_frames([context_aggregator.user().get_context_frame()])
+        get_history_store().record(call_id, "bot_connected", stream_id=stream_id)
+        timeouts.start()
+        logger.debug("🎬 Starting conversation with introduction...")
+        # Kick off the conversation with the profile's fixed greeting. It is the same
+        # on every call, so it plays from the TTS cache without an LLM round trip.
+        greeting = bot_profile.profile.greeting
+        messages.append({"role": "assistant", "content": greeting})
+        await speak_fixed(greeting)
 
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
         logger.info("📴 CLIENT DISCONNECTED FROM AI BOT")
-        logger.info("🛑 Cancelling pipeline task...")
+        get_history_store().record(call_id, "bot_disconnected")
+        logger.debug("🛑 Cancelling pipeline task...")
         await task.cancel()
 
     # Start the pipeline runner
-    logger.info("🚀 Starting pipeline runner...")
-    runner = PipelineRunner(handle_sigint=False, force_gc=True)
+    logger.debug("🚀 Starting pipeline runner...")
+    runner = PipelineRunner(handle_sigint=False)
     
-    logger.info("🎯 AI BOT IS READY! Waiting for audio...")
-    logger.info("💫 The magic is about to begin...")
+    logger.debug("🎯 AI BOT IS READY! Waiting for audio...")
 
-    await runner.run(task)
-    
+    # Registered so a drain can wait for this call, or end it at the drain deadline
+    output = transport.output()
+    with get_session_registry().session(
+        stream_id,
+        call_id,
+        end=lambda: task.queue_frame(EndFrame()),
+        output_backlog=lambda: output_queue_seconds(output),
+    ):
+        try:
+            await runner.run(task)
+        finally:
+            timeouts.stop()
+            if hangup_timer:
+                hangup_timer.cancel()
+            if recorder:
+                recorder.close()
+            if capture:
+                capture.close()
+
+    latency = latency_observer.summary()
+    logger.info(f"⏱️ Call latency: {latency}")
+    stt_gate_summary = stt_gate.summary() if stt_gate else None
+    if stt_gate_summary:
+        logger.info(
+            f"🔇 STT gate kept {stt_gate_summary['suppressed_ratio']:.0%} of caller audio "
+            f"({stt_gate_summary['suppressed_seconds']}s) from STT"
+        )
+    context_summary = context_budget.summary()
+    logger.info(f"📏 LLM context: {context_summary}")
+    speculation_summary = speculator.summary() if speculator else None
+    pacing_summary = transport.summary() if performance.audio_pacing else None
+    if pacing_summary:
+        logger.info(f"🎚️ Audio pacing: {pacing_summary}")
+    if speculation_summary:
+        logger.info(f"🔮 Speculation: {speculation_summary}")
+    get_history_store().record(
+        call_id,
+        "bot_finished",
+        profile=bot_profile.name,
+        latency=latency,
+        stt_gate=stt_gate_summary,
+        context=context_summary,
+        speculation=speculation_summary,
+        pacing=pacing_summary,
+        recording=recorder.summary() if recorder else None,
+        capture=capture.summary() if capture else None,
+        timeout=timeouts.reason,
+    )
     logger.info("🏁 AI Bot session completed")
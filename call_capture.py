@@ -0,0 +1,308 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import json
+import os
+import re
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    LLMFullResponseEndFrame,
+    LLMTextFrame,
+    StartInterruptionFrame,
+    TextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSSpeakFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from context_manager import message_text
+from metrics import get_metrics
+from vad_gate import frame_rms
+
+# File layout: MAGIC, version byte, u32 length of a JSON header, then records of
+# (kind u8, offset u32 in TICK units, length u16) followed by the payload
+MAGIC = b"CCAP"
+VERSION = 1
+MEDIA, EVENT = 1, 2
+TICK = 1e-4
+_HEADER = struct.Struct("<BI")
+_RECORD = struct.Struct("<BIH")
+
+# STT audio above this level counts as caller speech; replay keys transcripts on it
+SPEECH_RMS = 500.0
+
+captured_calls = get_metrics().counter("call_captures_total", "Calls captured for offline replay")
+
+
+@dataclass
+class Capture:
+    """A captured call: Plivo's inbound media and the providers' responses, on one timeline
+
+    media is (seconds, μ-law payload) per inbound media event. events are the
+    STT transcripts ("stt"), LLM replies ("llm") and TTS requests ("tts"), each
+    a dict with its offset in "t".
+    """
+
+    meta: Dict[str, Any]
+    media: List[Tuple[float, bytes]]
+    events: List[Dict[str, Any]]
+
+    @property
+    def duration(self) -> float:
+        return self.media[-1][0] + len(self.media[-1][1]) / 8000 if self.media else 0.0
+
+    def of(self, kind: str) -> List[Dict[str, Any]]:
+        return [event for event in self.events if event["type"] == kind]
+
+
+def write_capture(path: str, capture: Capture):
+    """Write a capture, replacing path atomically"""
+    records = [(offset, MEDIA, payload) for offset, payload in capture.media]
+    for event in capture.events:
+        fields = {k: v for k, v in event.items() if k != "t"}
+        records.append((event["t"], EVENT, json.dumps(fields, separators=(",", ":")).encode()))
+    records.sort(key=lambda record: record[0])
+
+    meta = json.dumps(capture.meta, separators=(",", ":")).encode()
+    chunks = [MAGIC, _HEADER.pack(VERSION, len(meta)), meta]
+    for offset, kind, payload in records:
+        chunks.append(_RECORD.pack(kind, max(0, round(offset / TICK)), len(payload)))
+        chunks.append(payload)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(chunks))
+    os.replace(tmp, path)
+
+
+def read_capture(path: str) -> Capture:
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a call capture")
+    version, meta_size = _HEADER.unpack_from(data, 4)
+    if version != VERSION:
+        raise ValueError(f"{path} is capture format v{version}, expected v{VERSION}")
+    pos = 4 + _HEADER.size
+    meta = json.loads(data[pos : pos + meta_size])
+    pos += meta_size
+
+    media: List[Tuple[float, bytes]] = []
+    events: List[Dict[str, Any]] = []
+    while pos < len(data):
+        kind, ticks, size = _RECORD.unpack_from(data, pos)
+        pos += _RECORD.size
+        payload = data[pos : pos + size]
+        pos += size
+        if kind == MEDIA:
+            media.append((ticks * TICK, payload))
+        elif kind == EVENT:
+            events.append({"t": round(ticks * TICK, 4), **json.loads(payload)})
+    return Capture(meta, media, events)
+
+
+def capture_path(call_id: str) -> Optional[str]:
+    """Where a call's capture is written (None for an unsafe id)"""
+    if not re.fullmatch(r"[\w-]+", call_id or ""):
+        return None
+    return os.path.join(os.getenv("CAPTURES_DIR", "data/captures"), f"{call_id}.ccap")
+
+
+class CallCapture(BaseObserver):
+    """Captures a call for offline replay through the real pipeline
+
+    The serializer hands over each inbound media payload as it arrives
+    (media()). The observer records what the providers sent back and when:
+    STT transcripts, keyed on how much caller speech STT had heard; LLM
+    replies, token by token from the request; and each TTS request's time to
+    first audio and audio length. Nothing is written until the call ends.
+    """
+
+    def __init__(
+        self,
+        call_id: str,
+        stt: FrameProcessor,
+        llm: FrameProcessor,
+        tts: FrameProcessor,
+        gate: Optional[FrameProcessor] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.path = capture_path(call_id)
+        self._stt = stt
+        self._llm = llm
+        self._tts = tts
+        self._gate = gate
+        self._meta = {"call_id": call_id, "started": time.time(), **(meta or {})}
+        self._started_ns = time.monotonic_ns()
+        # Observers see pipeline clock time; the smallest (monotonic - pipeline time) seen is its start
+        self._clock_base_ns: Optional[int] = None
+        self._media: List[Tuple[int, bytes]] = []
+        self._events: List[Tuple[int, Dict[str, Any]]] = []
+
+        self._speech = 0.0
+        self._last_speech_ns: Optional[int] = None
+        self._reply: Optional[Dict[str, Any]] = None
+        self._reply_context: Optional[int] = None
+        self._reply_ns = 0
+        self._first_token_ns = 0
+        self._tts_texts: List[str] = []
+        self._tts_request: Optional[Dict[str, Any]] = None
+        self._tts_started_ns = 0
+
+    def media(self, payload: bytes):
+        """An inbound μ-law media payload, as it arrived from Plivo"""
+        if self.path:
+            self._media.append((time.monotonic_ns(), payload))
+
+    async def on_push_frame(self, data: FramePushed):
+        if self.path is None:
+            return
+        ts = data.timestamp
+        if ts:
+            base = time.monotonic_ns() - ts
+            if self._clock_base_ns is None or base < self._clock_base_ns:
+                self._clock_base_ns = base
+        frame = data.frame
+        if isinstance(frame, InputAudioRawFrame):
+            if data.destination is self._stt and frame_rms(frame.audio) > SPEECH_RMS:
+                self._speech += len(frame.audio) / 2 / frame.sample_rate
+                self._last_speech_ns = ts
+        elif isinstance(frame, (TranscriptionFrame, InterimTranscriptionFrame)):
+            if data.source is self._stt:
+                after = (ts - self._last_speech_ns) / 1e9 if self._last_speech_ns is not None else 0.0
+                self._event(ts, {
+                    "type": "stt",
+                    "text": frame.text,
+                    "final": isinstance(frame, TranscriptionFrame),
+                    "speech": round(self._speech, 3),
+                    "after": round(max(0.0, after), 3),
+                })
+        elif isinstance(frame, OpenAILLMContextFrame):
+            if data.direction == FrameDirection.DOWNSTREAM and data.destination in (self._gate, self._llm):
+                self._llm_request(frame, ts, to_provider=data.destination is self._llm)
+        elif isinstance(frame, LLMTextFrame):
+            if self._reply is not None and data.source in (self._gate, self._llm):
+                self._llm_token(frame.text, ts, speculative=data.source is self._gate)
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            if data.source in (self._gate, self._llm):
+                self._end_reply()
+        elif isinstance(frame, (TextFrame, TTSSpeakFrame)):
+            if data.destination is self._tts:
+                self._tts_texts.append(frame.text)
+        elif isinstance(frame, TTSStartedFrame):
+            if data.source is self._tts:
+                # The text that started this request is already in
+                self._end_tts(keep=1)
+                self._tts_request = {"type": "tts", "ttfb": None, "audio": 0.0, "interrupted": False}
+                self._tts_started_ns = ts
+        elif isinstance(frame, TTSAudioRawFrame):
+            if data.source is self._tts and self._tts_request is not None:
+                if self._tts_request["ttfb"] is None:
+                    self._tts_request["ttfb"] = round((ts - self._tts_started_ns) / 1e9, 3)
+                self._tts_request["audio"] += len(frame.audio) / 2 / frame.sample_rate
+        elif isinstance(frame, TTSStoppedFrame):
+            if data.source is self._tts:
+                self._end_tts()
+        elif isinstance(frame, StartInterruptionFrame):
+            if data.destination is self._tts:
+                if self._tts_request is not None:
+                    self._tts_request["interrupted"] = True
+                self._end_tts()
+                if self._reply is not None:
+                    self._reply["interrupted"] = True
+                self._end_reply()
+
+    def _event(self, ts: int, event: Dict[str, Any]):
+        self._events.append((ts, event))
+
+    def _llm_request(self, frame: OpenAILLMContextFrame, ts: int, to_provider: bool):
+        # The same context frame hops from the gate to the LLM
+        if frame.id != self._reply_context:
+            self._end_reply()
+            messages = frame.context.get_messages()
+            user = next((message_text(m) for m in reversed(messages) if m.get("role") == "user"), "")
+            self._reply = {"type": "llm", "user": user, "ttft": None, "tokens": [], "speculative": False}
+            self._reply_context = frame.id
+            self._reply_ns = ts
+        if to_provider:
+            # The gate let the context through: the request goes to the provider now
+            self._reply_ns = ts
+
+    def _llm_token(self, text: str, ts: int, speculative: bool):
+        reply = self._reply
+        if not reply["tokens"]:
+            self._first_token_ns = ts
+            reply["speculative"] = speculative
+            if not speculative:
+                reply["ttft"] = round((ts - self._reply_ns) / 1e9, 3)
+        reply["tokens"].append([round((ts - self._first_token_ns) / 1e9, 3), text])
+
+    def _end_reply(self):
+        if self._reply is not None and self._reply["tokens"]:
+            self._event(self._reply_ns, self._reply)
+        self._reply = None
+
+    def _end_tts(self, keep: int = 0):
+        request, self._tts_request = self._tts_request, None
+        if request is None:
+            return
+        split = max(0, len(self._tts_texts) - keep)
+        texts, self._tts_texts = self._tts_texts[:split], self._tts_texts[split:]
+        if texts:
+            request["text"] = "".join(texts).strip()
+            request["audio"] = round(request["audio"], 3)
+            self._event(self._tts_started_ns, request)
+
+    def capture(self) -> Optional[Capture]:
+        """The call so far, on one timeline starting when the capture was created"""
+        if self.path is None or not self._media:
+            return None
+        base = self._clock_base_ns or self._started_ns
+        media = [((ns - self._started_ns) / 1e9, payload) for ns, payload in self._media]
+        events = [
+            {"t": round((base + ts - self._started_ns) / 1e9, 4), **event} for ts, event in self._events
+        ]
+        return Capture(self._meta, media, events)
+
+    def close(self):
+        """Finish the last reply and write the capture off the event loop"""
+        if self.path is None:
+            return
+        self._end_tts()
+        self._end_reply()
+        capture = self.capture()
+        if capture is None:
+            return
+        captured_calls.inc()
+        logger.info(f"🎞️ Capturing call ({len(capture.media)} media events, {len(capture.events)} provider events)")
+        asyncio.get_running_loop().run_in_executor(None, self._write, capture)
+
+    def _write(self, capture: Capture):
+        try:
+            write_capture(self.path, capture)
+        except Exception as e:
+            logger.error(f"❌ Failed to write call capture {self.path}: {e}")
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if self.path is None:
+            return None
+        return {"path": self.path, "media_events": len(self._media), "provider_events": len(self._events)}
@@ -0,0 +1,299 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import base64
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+# Columns kept on the calls table; anything else goes into the JSON data column
+CALL_COLUMNS = (
+    "request_uuid",
+    "phone",
+    "caller_id",
+    "status",
+    "answered_at",
+    "ended_at",
+    "duration",
+    "hangup_cause",
+    "error",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    call_uuid TEXT PRIMARY KEY,
+    request_uuid TEXT,
+    phone TEXT,
+    caller_id TEXT,
+    status TEXT,
+    outcome TEXT NOT NULL DEFAULT 'pending',
+    started_at REAL NOT NULL,
+    answered_at REAL,
+    ended_at REAL,
+    duration REAL,
+    hangup_cause TEXT,
+    error TEXT,
+    data TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_calls_started ON calls (started_at, call_uuid);
+CREATE INDEX IF NOT EXISTS idx_calls_phone ON calls (phone, started_at);
+CREATE INDEX IF NOT EXISTS idx_calls_request ON calls (request_uuid);
+CREATE TABLE IF NOT EXISTS call_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    call_uuid TEXT NOT NULL,
+    event TEXT NOT NULL,
+    ts REAL NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_call_events_call ON call_events (call_uuid, ts);
+CREATE INDEX IF NOT EXISTS idx_call_events_ts ON call_events (ts);
+CREATE TABLE IF NOT EXISTS call_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Outcome each lifecycle event moves a pending call to
+EVENT_OUTCOMES = {
+    "answered": "successful",
+    "bot_connected": "successful",
+    "dial_failed": "failed",
+}
+
+
+def encode_cursor(started_at: float, call_uuid: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([started_at, call_uuid]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    started_at, call_uuid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return float(started_at), str(call_uuid)
+
+
+class CallHistoryStore:
+    """Append-only call records in SQLite, written in batches from a background thread
+
+    record() never touches disk: events are queued and a writer thread applies
+    them in one transaction per batch. Totals are maintained incrementally in
+    call_stats so the history endpoint never scans the calls table.
+    """
+
+    def __init__(self, path: str = "data/call_history.db", max_batch: int = 500, flush_interval: float = 0.2):
+        self.path = path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._readers = threading.local()
+        self._writer = threading.Thread(target=self._run_writer, name="call-history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(self, call_uuid: Optional[str], event: str, **fields):
+        """Queue a lifecycle event for a call (non-blocking)"""
+        if not call_uuid:
+            return
+        self._queue.put((call_uuid, event, time.time(), fields))
+
+    # Writer thread
+
+    def _run_writer(self):
+        conn = self._connect()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for call_uuid, event, ts, fields in batch:
+                    self._apply(conn, call_uuid, event, ts, fields)
+                conn.execute("COMMIT")
+            except Exception as e:
+                # BEGIN itself fails if the database stays locked; the writer must outlive it either way
+                logger.error(f"❌ Failed to write {len(batch)} call history events: {e}")
+                if conn.in_transaction:
+                    try:
+                        conn.execute("ROLLBACK")
+                    except sqlite3.Error as rollback_error:
+                        logger.error(f"❌ Failed to roll back call history batch: {rollback_error}")
+            if stop:
+                break
+        conn.close()
+
+    def _bump(self, conn: sqlite3.Connection, name: str, amount: int):
+        conn.execute(
+            "INSERT INTO call_stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def _apply(self, conn: sqlite3.Connection, call_uuid: str, event: str, ts: float, fields: Dict[str, Any]):
+        # Outbound calls are created under their RequestUUID; re-key them once Plivo
+        # tells us the CallUUID so the whole lifecycle lands on one row.
+        request_uuid = fields.get("request_uuid")
+        if request_uuid and request_uuid != call_uuid:
+            exists = conn.execute("SELECT 1 FROM calls WHERE call_uuid = ?", (call_uuid,)).fetchone()
+            if not exists:
+                conn.execute("UPDATE calls SET call_uuid = ? WHERE call_uuid = ?", (call_uuid, request_uuid))
+                conn.execute("UPDATE call_events SET call_uuid = ? WHERE call_uuid = ?", (call_uuid, request_uuid))
+
+        conn.execute(
+            "INSERT INTO call_events (call_uuid, event, ts, data) VALUES (?, ?, ?, ?)",
+            (call_uuid, event, ts, json.dumps(fields, default=str) if fields else None),
+        )
+
+        row = conn.execute("SELECT outcome, data FROM calls WHERE call_uuid = ?", (call_uuid,)).fetchone()
+        if row is None:
+            conn.execute(
+                "INSERT INTO calls (call_uuid, started_at, updated_at) VALUES (?, ?, ?)",
+                (call_uuid, ts, ts),
+            )
+            self._bump(conn, "total", 1)
+            outcome, data = "pending", {}
+        else:
+            outcome, data = row[0], json.loads(row[1])
+
+        new_outcome = EVENT_OUTCOMES.get(event)
+        if event == "hangup" and outcome == "pending":
+            new_outcome = "failed"
+        if new_outcome and outcome == "pending":
+            self._bump(conn, new_outcome, 1)
+            outcome = new_outcome
+
+        columns = {k: v for k, v in fields.items() if k in CALL_COLUMNS and v is not None}
+        columns.setdefault("status", event)
+        if event == "answered":
+            columns.setdefault("answered_at", ts)
+        elif event == "hangup":
+            columns.setdefault("ended_at", ts)
+        extra = {k: v for k, v in fields.items() if k not in CALL_COLUMNS and v is not None}
+        if extra:
+            data.update(extra)
+
+        assignments = ", ".join(f"{k} = ?" for k in columns)
+        conn.execute(
+            f"UPDATE calls SET {assignments}, outcome = ?, data = ?, updated_at = ? WHERE call_uuid = ?",
+            (*columns.values(), outcome, json.dumps(data, default=str), ts, call_uuid),
+        )
+
+    # Queries (run in threads so the event loop never waits on SQLite)
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            self._readers.conn = conn
+        return conn
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        call = dict(row)
+        call.update(json.loads(call.pop("data") or "{}"))
+        # Field names used by the web interface
+        call["target_number"] = call.get("phone")
+        call["timestamp"] = call["started_at"] * 1000
+        return call
+
+    def _list_calls(self, limit: int, cursor: Optional[str], phone: Optional[str]) -> Dict[str, Any]:
+        conn = self._reader()
+        clauses, args = [], []
+        if phone:
+            clauses.append("phone = ?")
+            args.append(phone)
+        if cursor:
+            started_at, call_uuid = decode_cursor(cursor)
+            clauses.append("(started_at < ? OR (started_at = ? AND call_uuid < ?))")
+            args.extend([started_at, started_at, call_uuid])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = conn.execute(
+            f"SELECT * FROM calls {where} ORDER BY started_at DESC, call_uuid DESC LIMIT ?",
+            (*args, limit + 1),
+        ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["started_at"], rows[-1]["call_uuid"])
+
+        stats = dict(conn.execute("SELECT name, value FROM call_stats").fetchall())
+        return {
+            "calls": [self._row_to_dict(row) for row in rows],
+            "next_cursor": next_cursor,
+            "total": stats.get("total", 0),
+            "successful": stats.get("successful", 0),
+            "failed": stats.get("failed", 0),
+        }
+
+    def _get_call(self, call_uuid: str) -> Optional[Dict[str, Any]]:
+        conn = self._reader()
+        row = conn.execute("SELECT * FROM calls WHERE call_uuid = ?", (call_uuid,)).fetchone()
+        if row is None:
+            return None
+        call = self._row_to_dict(row)
+        events = conn.execute(
+            "SELECT event, ts, data FROM call_events WHERE call_uuid = ? ORDER BY ts, id", (call_uuid,)
+        ).fetchall()
+        call["events"] = [
+            {"event": e["event"], "ts": e["ts"], **json.loads(e["data"] or "{}")} for e in events
+        ]
+        return call
+
+    async def list_calls(self, limit: int = 50, cursor: Optional[str] = None, phone: Optional[str] = None) -> Dict[str, Any]:
+        """Newest calls first, paginated by an opaque cursor, with running totals"""
+        return await asyncio.to_thread(self._list_calls, limit, cursor, phone)
+
+    async def get_call(self, call_uuid: str) -> Optional[Dict[str, Any]]:
+        """One call with its full event log"""
+        return await asyncio.to_thread(self._get_call, call_uuid)
+
+    def close(self):
+        """Flush queued events and stop the writer thread"""
+        self._queue.put(None)
+        self._writer.join(timeout=30)
+
+
+_call_history: Optional[CallHistoryStore] = None
+
+def get_history_store() -> CallHistoryStore:
+    """Get the process-wide call history store"""
+    global _call_history
+    if _call_history is None:
+        _call_history = CallHistoryStore(os.getenv("CALL_HISTORY_DB", "data/call_history.db"))
+    return _call_history
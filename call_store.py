@@ -0,0 +1,357 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+ACTIVE_STATUSES = ("dialing", "answered", "streaming")
+ENDED_STATUSES = ("completed", "rejected")
+
+# Ended calls are kept briefly for late webhooks; calls silent this long are dropped whatever their status.
+# The call history keeps the long-term record.
+ENDED_CALL_SECONDS = 300.0
+STALE_CALL_SECONDS = 86400.0
+SWEEP_INTERVAL = 60.0
+
+# How long a webhook delivery key is remembered for dropping Plivo's retries
+DEDUPE_SECONDS = 3600.0
+
+
+class RecentKeys:
+    """Keys seen in the last ttl seconds (bounded), for dropping repeated deliveries"""
+
+    def __init__(self, ttl: float = DEDUPE_SECONDS, max_size: int = 100_000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def _expire(self, now: float):
+        while self._seen and (len(self._seen) >= self.max_size or next(iter(self._seen.values())) < now - self.ttl):
+            self._seen.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        self._expire(time.monotonic())
+        return key in self._seen
+
+    def seen(self, key: str) -> bool:
+        """True if key was seen recently; otherwise remember it and return False"""
+        now = time.monotonic()
+        self._expire(now)
+        if key in self._seen:
+            return True
+        self._seen[key] = now
+        return False
+
+
+class CallStateStore(ABC):
+    """Shared per-call state so /answer, /hangup and /ws resolve on any worker
+
+    A call's state is a flat JSON-serializable dict keyed by call UUID. Updates
+    merge into the existing record and stamp it with the worker that wrote it.
+    Ended and stale calls are swept out periodically (start_sweeping()).
+    """
+
+    _sweeper: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    async def get(self, call_uuid: str) -> Optional[Dict[str, Any]]:
+        """Get the state for a call, or None if unknown"""
+
+    @abstractmethod
+    async def update(self, call_uuid: str, **fields) -> Dict[str, Any]:
+        """Merge fields into a call's state, creating it if needed"""
+
+    async def update_many(self, updates: Dict[str, Dict[str, Any]]):
+        """Merge fields into several calls' state at once"""
+        for call_uuid, fields in updates.items():
+            await self.update(call_uuid, **fields)
+
+    @abstractmethod
+    async def delete(self, call_uuid: str):
+        """Forget a call"""
+
+    @abstractmethod
+    async def list_active(self) -> List[Dict[str, Any]]:
+        """Calls that have not ended yet"""
+
+    @abstractmethod
+    async def claim(self, key: str) -> bool:
+        """Remember a webhook delivery key; False if any worker claimed it in the last DEDUPE_SECONDS"""
+
+    @abstractmethod
+    async def claimed(self, key: str) -> bool:
+        """Whether a webhook delivery key was claimed in the last DEDUPE_SECONDS"""
+
+    @abstractmethod
+    async def get_value(self, key: str) -> Optional[Dict[str, Any]]:
+        """A server-wide value shared by every worker (e.g. drain mode), or None"""
+
+    @abstractmethod
+    async def set_value(self, key: str, value: Optional[Dict[str, Any]]):
+        """Set a server-wide value, or clear it with None"""
+
+    @abstractmethod
+    async def sweep(self, ended_before: float, stale_before: float) -> int:
+        """Forget ended calls last updated before ended_before and any call last updated before stale_before"""
+
+    def start_sweeping(self, interval: float = SWEEP_INTERVAL):
+        if self._sweeper is None:
+            self._sweeper = asyncio.get_running_loop().create_task(self._run_sweeper(interval))
+
+    async def _run_sweeper(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            now = time.time()
+            try:
+                swept = await self.sweep(now - ENDED_CALL_SECONDS, now - STALE_CALL_SECONDS)
+                if swept:
+                    logger.debug(f"🧹 Swept {swept} ended calls from the call state store")
+            except Exception as e:
+                logger.error(f"❌ Failed to sweep the call state store: {e}")
+
+    async def close(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    @staticmethod
+    def _merge(current: Optional[Dict[str, Any]], call_uuid: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        state = dict(current or {"call_uuid": call_uuid, "created_at": time.time()})
+        state.update({k: v for k, v in fields.items() if v is not None})
+        state["updated_at"] = time.time()
+        state["updated_by"] = WORKER_ID
+        return state
+
+
+class InMemoryCallStateStore(CallStateStore):
+    """Call state kept in this process only (single worker)"""
+
+    def __init__(self):
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self._keys = RecentKeys()
+        self._values: Dict[str, Dict[str, Any]] = {}
+
+    async def get(self, call_uuid: str) -> Optional[Dict[str, Any]]:
+        state = self._calls.get(call_uuid)
+        return dict(state) if state else None
+
+    async def update(self, call_uuid: str, **fields) -> Dict[str, Any]:
+        state = self._merge(self._calls.get(call_uuid), call_uuid, fields)
+        self._calls[call_uuid] = state
+        return dict(state)
+
+    async def delete(self, call_uuid: str):
+        self._calls.pop(call_uuid, None)
+
+    async def list_active(self) -> List[Dict[str, Any]]:
+        return [dict(s) for s in self._calls.values() if s.get("status") in ACTIVE_STATUSES]
+
+    async def get_value(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._values.get(key)
+        return dict(value) if value is not None else None
+
+    async def set_value(self, key: str, value: Optional[Dict[str, Any]]):
+        if value is None:
+            self._values.pop(key, None)
+        else:
+            self._values[key] = dict(value)
+
+    async def sweep(self, ended_before: float, stale_before: float) -> int:
+        swept = [
+            call_uuid
+            for call_uuid, state in self._calls.items()
+            if state["updated_at"] < stale_before
+            or (state.get("status") in ENDED_STATUSES and state["updated_at"] < ended_before)
+        ]
+        for call_uuid in swept:
+            del self._calls[call_uuid]
+        return len(swept)
+
+    async def claim(self, key: str) -> bool:
+        return not self._keys.seen(key)
+
+    async def claimed(self, key: str) -> bool:
+        return key in self._keys
+
+
+class SQLiteCallStateStore(CallStateStore):
+    """Call state in a SQLite file shared by every worker on the host
+
+    Runs in WAL mode so readers never block the writer, and every query runs in
+    a thread so the event loop never waits on disk.
+    """
+
+    def __init__(self, path: str = "data/call_state.db"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS call_state ("
+                "call_uuid TEXT PRIMARY KEY, status TEXT, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_call_state_status ON call_state (status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_call_state_updated ON call_state (updated_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS shared_values (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS webhook_keys (key TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_webhook_keys_seen ON webhook_keys (seen_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, call_uuid: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT data FROM call_state WHERE call_uuid = ?", (call_uuid,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _update(self, call_uuid: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return self._update_many({call_uuid: fields})[call_uuid]
+
+    def _update_many(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            states = {}
+            for call_uuid, fields in updates.items():
+                state = states[call_uuid] = self._merge(self._get(call_uuid), call_uuid, fields)
+                conn.execute(
+                    "INSERT INTO call_state (call_uuid, status, data, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(call_uuid) DO UPDATE SET "
+                    "status = excluded.status, data = excluded.data, updated_at = excluded.updated_at",
+                    (call_uuid, state.get("status"), json.dumps(state), state["updated_at"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return states
+
+    def _delete(self, call_uuid: str):
+        self._connect().execute("DELETE FROM call_state WHERE call_uuid = ?", (call_uuid,))
+
+    def _list_active(self) -> List[Dict[str, Any]]:
+        placeholders = ",".join("?" for _ in ACTIVE_STATUSES)
+        rows = self._connect().execute(
+            f"SELECT data FROM call_state WHERE status IN ({placeholders})", ACTIVE_STATUSES
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _get_value(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT data FROM shared_values WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set_value(self, key: str, value: Optional[Dict[str, Any]]):
+        if value is None:
+            self._connect().execute("DELETE FROM shared_values WHERE key = ?", (key,))
+        else:
+            self._connect().execute(
+                "INSERT INTO shared_values (key, data) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                (key, json.dumps(value)),
+            )
+
+    def _sweep(self, ended_before: float, stale_before: float) -> int:
+        placeholders = ",".join("?" for _ in ENDED_STATUSES)
+        return self._connect().execute(
+            f"DELETE FROM call_state WHERE updated_at < ? OR (status IN ({placeholders}) AND updated_at < ?)",
+            (stale_before, *ENDED_STATUSES, ended_before),
+        ).rowcount
+
+    def _claim(self, key: str) -> bool:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM webhook_keys WHERE seen_at < ?", (now - DEDUPE_SECONDS,))
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO webhook_keys (key, seen_at) VALUES (?, ?)", (key, now)
+            ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return inserted == 1
+
+    def _claimed(self, key: str) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM webhook_keys WHERE key = ? AND seen_at >= ?", (key, time.time() - DEDUPE_SECONDS)
+        ).fetchone()
+        return row is not None
+
+    async def get(self, call_uuid: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, call_uuid)
+
+    async def update(self, call_uuid: str, **fields) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._update, call_uuid, fields)
+
+    async def update_many(self, updates: Dict[str, Dict[str, Any]]):
+        # One transaction for the whole batch
+        await asyncio.to_thread(self._update_many, updates)
+
+    async def delete(self, call_uuid: str):
+        await asyncio.to_thread(self._delete, call_uuid)
+
+    async def list_active(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._list_active)
+
+    async def get_value(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get_value, key)
+
+    async def set_value(self, key: str, value: Optional[Dict[str, Any]]):
+        await asyncio.to_thread(self._set_value, key, value)
+
+    async def sweep(self, ended_before: float, stale_before: float) -> int:
+        return await asyncio.to_thread(self._sweep, ended_before, stale_before)
+
+    async def claim(self, key: str) -> bool:
+        return await asyncio.to_thread(self._claim, key)
+
+    async def claimed(self, key: str) -> bool:
+        return await asyncio.to_thread(self._claimed, key)
+
+
+def create_call_store(url: str) -> CallStateStore:
+    """Create a store from a URL: "memory" or "sqlite:///path/to/file.db" """
+    if url.startswith("sqlite:///"):
+        path = url[len("sqlite:///"):]
+        logger.info(f"🗄️ Using SQLite call state store at {path}")
+        return SQLiteCallStateStore(path)
+    if url != "memory":
+        logger.warning(f"⚠️ Unknown CALL_STATE_STORE '{url}' - using in-memory store")
+    return InMemoryCallStateStore()
+
+
+# Global call state store instance
+call_store = create_call_store(os.getenv("CALL_STATE_STORE", "memory"))
+
+def get_call_store() -> CallStateStore:
+    """Get the global call state store"""
+    return call_store
+
+def configure_call_store(url: str) -> CallStateStore:
+    """Replace the global call state store"""
+    global call_store
+    call_store = create_call_store(url)
+    return call_store
@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from typing import Awaitable, Callable, Optional
+
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+
+from timer_wheel import Timer, TimerWheel, call_timeouts, get_timer_wheel
+
+
+class CallTimeouts(BaseObserver):
+    """Ends a call that runs past max_duration or where nobody speaks for idle_timeout
+
+    Idle time counts from when the caller or the bot last stopped speaking and
+    pauses while either one is talking. on_timeout(reason) is awaited once,
+    with reason "max_duration" or "idle".
+    """
+
+    def __init__(
+        self,
+        max_duration: float,
+        idle_timeout: float,
+        on_timeout: Callable[[str], Awaitable[None]],
+        wheel: Optional[TimerWheel] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.max_duration = max_duration
+        self.idle_timeout = idle_timeout
+        self.reason: Optional[str] = None
+        self._on_timeout = on_timeout
+        self._wheel = wheel or get_timer_wheel()
+        self._max_timer: Optional[Timer] = None
+        self._idle_timer: Optional[Timer] = None
+        self._started = False
+        self._user_speaking = False
+        self._bot_speaking = False
+
+    def start(self):
+        """Start the clocks (when the caller's stream is connected)"""
+        self._started = True
+        if self.max_duration > 0:
+            self._max_timer = self._wheel.schedule(self.max_duration, lambda: self._expire("max_duration"))
+        self._restart_idle()
+
+    def stop(self):
+        self._started = False
+        for timer in (self._max_timer, self._idle_timer):
+            if timer:
+                timer.cancel()
+        self._max_timer = self._idle_timer = None
+
+    def _restart_idle(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self.idle_timeout > 0 and not self._user_speaking and not self._bot_speaking and self._started:
+            self._idle_timer = self._wheel.schedule(self.idle_timeout, lambda: self._expire("idle"))
+
+    async def _expire(self, reason: str):
+        if self.reason is not None:
+            return
+        self.reason = reason
+        self.stop()
+        call_timeouts.inc(labels={"reason": reason})
+        await self._on_timeout(reason)
+
+    async def on_push_frame(self, data: FramePushed):
+        frame = data.frame
+        if isinstance(frame, UserStartedSpeakingFrame):
+            speaking = self._user_speaking = True
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            speaking = self._user_speaking = False
+        elif isinstance(frame, BotStartedSpeakingFrame):
+            speaking = self._bot_speaking = True
+        elif isinstance(frame, BotStoppedSpeakingFrame):
+            speaking = self._bot_speaking = False
+        else:
+            return
+        # Frames are seen at every hop; only state changes touch the timer
+        if speaking and self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        elif not speaking and not self._idle_timer:
+            self._restart_idle()
@@ -4,38 +4,131 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import fcntl
 import json
 import os
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+import threading
+import time
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterator, List, Mapping, Optional
+from dataclasses import dataclass, asdict, field, fields, replace
 from loguru import logger
 
-@dataclass
+@dataclass(frozen=True)
 class AIConfig:
     """AI Configuration settings"""
     system_prompt: str = "You are a friendly elementary teacher in India having an audio call. Your output will be converted to audio so don't include special characters in your answers. Respond to what the student said in a short sentence. Be encouraging and educational. Speak clearly and simply."
     voice_id: str = "71a7ad14-091c-4e8e-a314-022ece01c121"  # British Reading Lady
     audio_quality: int = 8000
 
-@dataclass
+@dataclass(frozen=True)
 class CallConfig:
     """Call Configuration settings"""
     default_caller_id: str = "+912269976211"
     default_target_number: str = "+919136820958"
-    auto_answer_delay: int = 2
+    auto_answer_delay: int = 2  # Not enforced: the greeting plays as soon as the stream starts
     max_call_duration: int = 300  # 5 minutes
+    idle_timeout: int = 30  # End the call after this long with nobody speaking
+    stream_start_timeout: int = 10  # Close a /ws connection that sends no start event
+    record_calls: bool = False  # Save both legs' audio and a transcript of every call
+    capture_calls: bool = False  # Save caller audio and provider timing of every call for offline replay
+    dial_concurrency: int = 10  # Concurrent Plivo API requests
+    dial_rate_per_second: float = 1.0  # Per caller ID
 
-@dataclass
+@dataclass(frozen=True)
+class PerformanceConfig:
+    """Runtime performance tuning settings"""
+    warm_pool_size: int = 4  # Pre-built VAD analyzers and service clients per pool
+    tts_socket_pool_size: int = 4  # Cartesia WebSockets kept open ahead of calls
+    stt_socket_pool_size: int = 4  # Deepgram streams kept open ahead of calls
+    llm_http_connections: int = 100  # Keep-alive connections to OpenAI shared by all calls
+    provider_health_check_seconds: int = 15  # How often idle provider sockets are checked
+    recording_buffer_frames: int = 20000  # Audio frames (all calls) queued for the recording writer
+    recording_drop_policy: str = "oldest"  # Audio dropped when that buffer is full: "oldest" or "newest"
+    tts_cache_memory_mb: int = 32  # In-memory audio for cached greetings and fixed replies
+    stt_gate_enabled: bool = True  # Keep caller silence away from STT
+    stt_gate_pre_roll_ms: int = 500  # Audio replayed to STT ahead of detected speech
+    stt_gate_hangover_ms: int = 800  # Audio still sent to STT after speech ends
+    speculative_llm: bool = False  # Start LLM replies on stable interim transcripts
+    speculation_similarity: float = 0.9  # How close the final transcript must be to reuse a speculative reply
+    audio_pacing: bool = True  # Send bot audio in 20 ms frames off a shared clock; jitter-buffer caller audio
+    audio_lead_ms: int = 200  # Bot audio kept ahead of real time at Plivo (cleared on barge-in)
+    jitter_buffer_min_ms: int = 20  # Smallest caller audio cushion kept by the jitter buffer
+    jitter_buffer_max_ms: int = 200  # Caller audio above this is released at once (an overrun)
+    max_sessions: int = 50  # Bot sessions per worker before new calls are held
+    max_loop_lag_ms: int = 100  # Event loop lag above which new calls are held
+    max_output_queue_seconds: float = 30.0  # Per-call unsent bot audio above which new calls are held
+    admission_queue_size: int = 10  # Calls that may wait on hold for a session
+    admission_hold_seconds: int = 5  # Hold music between admission retries
+    admission_max_wait_seconds: int = 60  # Longest a call waits on hold before it is turned away
+
+@dataclass(frozen=True)
+class LoggingConfig:
+    """Logging settings"""
+    level: str = "INFO"
+    module_levels: Mapping[str, str] = field(default_factory=lambda: {"pipecat": "INFO"})
+    json_file: str = "chatbot.log"
+    audio_debug_sample_rate: float = 0.0  # Fraction of audio-path debug lines to keep
+
+    def __post_init__(self):
+        # Read-only, so a snapshot can't be changed through it
+        object.__setattr__(self, "module_levels", MappingProxyType(dict(self.module_levels)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**{f.name: getattr(self, f.name) for f in fields(self)}, "module_levels": dict(self.module_levels)}
+
+@dataclass(frozen=True)
+class ChunkPolicy:
+    """How LLM text is split into chunks for TTS (see text_chunker.py)"""
+    first_chunk: str = "clause"  # "clause" or "sentence"
+    min_first_chars: int = 12  # Shortest first clause worth sending on its own
+    min_chunk_chars: int = 40  # Later sentences shorter than this are merged
+    max_chunk_chars: int = 250  # Force a split at a safe space beyond this
+
+@dataclass(frozen=True)
+class ContextPolicy:
+    """How much of the conversation is resent to the LLM each turn (see context_manager.py)"""
+    max_tokens: int = 1500  # Budget for the whole request context
+    keep_turns: int = 6  # Most recent exchanges kept word for word
+    summary_tokens: int = 150  # Target length of the rolling summary of older turns
+
+@dataclass(frozen=True)
+class VADPolicy:
+    """When the caller counts as speaking (see pipecat's VADParams)"""
+    confidence: float = 0.7  # Voice probability needed per frame
+    start_secs: float = 0.2  # Speech needed before the caller is speaking
+    stop_secs: float = 0.8  # Silence needed before the caller's turn ends
+    min_volume: float = 0.6  # Quieter audio is never speech
+
+@dataclass(frozen=True)
+class BotProfile:
+    """A named bot persona picked per call: prompt, voice, audio rate and pipeline policies"""
+    name: str
+    system_prompt: str
+    voice_id: str
+    greeting: str
+    farewells: Mapping[str, str] = field(default_factory=lambda: DEFAULT_FAREWELLS)  # Spoken when a timeout ends the call
+    sample_rate: int = 8000  # Pipeline audio rate; Plivo's μ-law stream is resampled to it
+    vad: VADPolicy = field(default_factory=VADPolicy)
+    context: ContextPolicy = field(default_factory=ContextPolicy)
+    chunk: ChunkPolicy = field(default_factory=ChunkPolicy)
+
+@dataclass(frozen=True)
 class AppConfig:
     """Main application configuration"""
     ai: AIConfig
     call: CallConfig
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         return {
             'ai': asdict(self.ai),
-            'call': asdict(self.call)
+            'call': asdict(self.call),
+            'performance': asdict(self.performance),
+            'logging': self.logging.to_dict()
         }
     
     @classmethod
@@ -43,55 +136,245 @@ class AppConfig:
         """Create from dictionary"""
         ai_config = AIConfig(**data.get('ai', {}))
         call_config = CallConfig(**data.get('call', {}))
-        return cls(ai=ai_config, call=call_config)
+        performance_config = PerformanceConfig(**data.get('performance', {}))
+        logging_config = LoggingConfig(**data.get('logging', {}))
+        return cls(ai=ai_config, call=call_config, performance=performance_config, logging=logging_config)
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One immutable, versioned view of the configuration
+    
+    A call reads the snapshot once when its pipeline is built, so a settings
+    change mid-call never gives it a mix of old and new values.
+    """
+    version: int
+    config: AppConfig
+    
+    def prompt_template_id(self) -> Optional[str]:
+        """The predefined template the system prompt came from, if any"""
+        prompt = self.config.ai.system_prompt.strip()
+        for template_id, content in PROMPT_TEMPLATES.items():
+            if content == prompt:
+                return template_id
+        return None
+    
+    def chunk_policy(self) -> 'ChunkPolicy':
+        return CHUNK_POLICIES.get(self.prompt_template_id(), DEFAULT_CHUNK_POLICY)
+    
+    def greeting(self) -> str:
+        return GREETINGS.get(self.prompt_template_id(), DEFAULT_GREETING)
+
+    def farewells(self) -> Mapping[str, str]:
+        return FAREWELLS.get(self.prompt_template_id(), DEFAULT_FAREWELLS)
+
+    def context_policy(self) -> 'ContextPolicy':
+        return CONTEXT_POLICIES.get(self.prompt_template_id(), DEFAULT_CONTEXT_POLICY)
+
+    def profile(self, name: Optional[str] = None) -> BotProfile:
+        """A named profile, or the "default" profile built from these settings"""
+        if name in BOT_PROFILES:
+            return BOT_PROFILES[name]
+        return BotProfile(
+            name=DEFAULT_PROFILE,
+            system_prompt=self.config.ai.system_prompt,
+            voice_id=self.config.ai.voice_id,
+            greeting=self.greeting(),
+            farewells=self.farewells(),
+            sample_rate=self.config.ai.audio_quality,
+            context=self.context_policy(),
+            chunk=self.chunk_policy(),
+        )
 
 class ConfigManager:
-    """Manages application configuration with persistence"""
+    """Manages application configuration with persistence
+    
+    Reads are lock-free: the current ConfigSnapshot is swapped in whole on every
+    update. Writes to disk happen on a background thread, coalescing bursts of
+    updates into one atomic rename of the settings file, and a watcher thread
+    picks up changes written by other worker processes. Writes hold a lock file;
+    if another worker saved since this one last read the file, the unsaved
+    changes are replayed on top of theirs, so all workers end up agreeing.
+    """
     
-    def __init__(self, config_file: str = "data/settings.json"):
+    def __init__(self, config_file: str = "data/settings.json", write_delay: float = 0.2, watch_interval: float = 1.0):
         self.config_file = config_file
-        self.config = self._load_config()
+        self.write_delay = write_delay
+        self.watch_interval = watch_interval
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(config_file), exist_ok=True)
+        
+        self._update_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._closed = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[ConfigSnapshot, ConfigSnapshot], None]] = []
+        # Changes not yet written, replayed onto the file if another worker saved first
+        self._pending: List[Callable[[AppConfig], AppConfig]] = []
+        self._saved_version = 0
+        self._saved_mtime = 0
+        self._snapshot = self._load_config()
+    
+    @property
+    def config(self) -> AppConfig:
+        """Current configuration (read-only)"""
+        return self._snapshot.config
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """Current configuration snapshot; read it once and keep using it"""
+        return self._snapshot
     
-    def _load_config(self) -> AppConfig:
+    def _read_file(self) -> ConfigSnapshot:
+        with open(self.config_file, 'r') as f:
+            data = json.load(f)
+        return ConfigSnapshot(version=int(data.get('version', 0)), config=AppConfig.from_dict(data))
+    
+    def _load_config(self) -> ConfigSnapshot:
         """Load configuration from file or create default"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    data = json.load(f)
-                logger.info(f"✅ Loaded configuration from {self.config_file}")
-                return AppConfig.from_dict(data)
+                snapshot = self._read_file()
+                self._saved_version = snapshot.version
+                self._saved_mtime = os.stat(self.config_file).st_mtime_ns
+                logger.info(f"✅ Loaded configuration v{snapshot.version} from {self.config_file}")
+                return snapshot
         except Exception as e:
             logger.warning(f"⚠️ Failed to load config: {e}")
         
         # Return default configuration
         logger.info("📝 Using default configuration")
-        return AppConfig(
-            ai=AIConfig(),
-            call=CallConfig()
-        )
+        return ConfigSnapshot(version=0, config=AppConfig(ai=AIConfig(), call=CallConfig()))
+    
+    def _write(self, snapshot: ConfigSnapshot):
+        data = {'version': snapshot.version, **snapshot.config.to_dict()}
+        tmp = f"{self.config_file}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.config_file)
+        self._saved_version = snapshot.version
+        self._saved_mtime = os.stat(self.config_file).st_mtime_ns
+        logger.info(f"💾 Configuration v{snapshot.version} saved to {self.config_file}")
+    
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Serialize settings writes across worker processes"""
+        with open(f"{self.config_file}.lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
     
     def save_config(self) -> bool:
-        """Save current configuration to file"""
+        """Write the current configuration to disk now (blocking)"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config.to_dict(), f, indent=2)
-            logger.info(f"💾 Configuration saved to {self.config_file}")
+            with self._write_lock, self._file_lock():
+                try:
+                    on_disk: Optional[ConfigSnapshot] = self._read_file()
+                except FileNotFoundError:
+                    on_disk = None
+                rebased = None
+                with self._update_lock:
+                    changes, self._pending = self._pending, []
+                    if not changes:
+                        return True
+                    if on_disk is not None and on_disk.version != self._saved_version:
+                        # Another worker saved since we last read or wrote the file
+                        config = on_disk.config
+                        for change in changes:
+                            config = change(config)
+                        rebased = (self._snapshot, ConfigSnapshot(version=on_disk.version + 1, config=config))
+                        self._snapshot = rebased[1]
+                    snapshot = self._snapshot
+                self._write(snapshot)
+            if rebased:
+                logger.info(f"🔀 Merged configuration changes onto v{on_disk.version} written by another worker")
+                self._notify(*rebased)
             return True
         except Exception as e:
             logger.error(f"❌ Failed to save config: {e}")
             return False
     
+    def _run_writer(self):
+        while not self._closed.is_set():
+            self._dirty.wait()
+            # Let a burst of updates settle into a single write
+            time.sleep(self.write_delay)
+            self._dirty.clear()
+            self.save_config()
+    
+    def _apply(self, change: Callable[[AppConfig], AppConfig]) -> bool:
+        """Swap in a new snapshot built by change(current config) and queue a save"""
+        with self._update_lock:
+            current = self._snapshot
+            version = max(current.version, self._saved_version) + 1
+            self._snapshot = ConfigSnapshot(version=version, config=change(current.config))
+            self._pending.append(change)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="config-writer", daemon=True)
+                self._writer.start()
+        self._dirty.set()
+        return True
+    
+    # Changes made by other workers
+    
+    def add_listener(self, callback: Callable[[ConfigSnapshot, ConfigSnapshot], None]):
+        """Call callback(old, new) when a change from another worker is loaded"""
+        self._listeners.append(callback)
+    
+    def start_watching(self):
+        """Reload the settings file whenever another worker rewrites it"""
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._run_watcher, name="config-watcher", daemon=True)
+            self._watcher.start()
+    
+    def _run_watcher(self):
+        while not self._closed.wait(self.watch_interval):
+            try:
+                mtime = os.stat(self.config_file).st_mtime_ns
+                if mtime == self._saved_mtime:
+                    continue
+                loaded = self._read_file()
+            except (OSError, ValueError) as e:
+                logger.debug(f"Config watch: {e}")
+                continue
+            with self._update_lock:
+                if self._pending:
+                    # Our next save replays these changes on top of the file
+                    continue
+                old = self._snapshot
+                self._saved_mtime = mtime
+                self._saved_version = loaded.version
+                if loaded == old:
+                    continue
+                self._snapshot = loaded
+            logger.info(f"🔄 Reloaded configuration v{loaded.version} written by another worker")
+            self._notify(old, loaded)
+    
+    def _notify(self, old: ConfigSnapshot, new: ConfigSnapshot):
+        for callback in self._listeners:
+            try:
+                callback(old, new)
+            except Exception as e:
+                logger.error(f"❌ Config listener failed: {e}")
+    
+    def close(self):
+        """Stop background threads and write any pending change"""
+        self._closed.set()
+        self._dirty.set()
+        self.save_config()
+    
     def update_ai_config(self, **kwargs) -> bool:
         """Update AI configuration"""
         try:
-            for key, value in kwargs.items():
-                if hasattr(self.config.ai, key):
-                    setattr(self.config.ai, key, value)
-                    logger.info(f"🔧 Updated AI config: {key} = {value}")
-            return self.save_config()
+            updates = {k: v for k, v in kwargs.items() if hasattr(self.config.ai, k)}
+            for key, value in updates.items():
+                logger.info(f"🔧 Updated AI config: {key} = {value}")
+            return self._apply(lambda config: replace(config, ai=replace(config.ai, **updates)))
         except Exception as e:
             logger.error(f"❌ Failed to update AI config: {e}")
             return False
@@ -99,11 +382,10 @@ class ConfigManager:
     def update_call_config(self, **kwargs) -> bool:
         """Update call configuration"""
         try:
-            for key, value in kwargs.items():
-                if hasattr(self.config.call, key):
-                    setattr(self.config.call, key, value)
-                    logger.info(f"📞 Updated call config: {key} = {value}")
-            return self.save_config()
+            updates = {k: v for k, v in kwargs.items() if hasattr(self.config.call, k)}
+            for key, value in updates.items():
+                logger.info(f"📞 Updated call config: {key} = {value}")
+            return self._apply(lambda config: replace(config, call=replace(config.call, **updates)))
         except Exception as e:
             logger.error(f"❌ Failed to update call config: {e}")
             return False
@@ -112,6 +394,18 @@ class ConfigManager:
         """Get current system prompt"""
         return self.config.ai.system_prompt
     
+    def get_prompt_template_id(self) -> Optional[str]:
+        """Get the predefined template the current system prompt came from, if any"""
+        return self._snapshot.prompt_template_id()
+    
+    def get_chunk_policy(self) -> ChunkPolicy:
+        """Get the TTS chunking policy for the current prompt template"""
+        return self._snapshot.chunk_policy()
+    
+    def get_greeting(self) -> str:
+        """Get the fixed opening line for the current prompt template"""
+        return self._snapshot.greeting()
+    
     def get_voice_id(self) -> str:
         """Get current voice ID"""
         return self.config.ai.voice_id
@@ -124,9 +418,49 @@ class ConfigManager:
         """Get default target number"""
         return self.config.call.default_target_number
     
+    def get_dial_concurrency(self) -> int:
+        """Get maximum concurrent outbound dial requests"""
+        return self.config.call.dial_concurrency
+    
+    def get_dial_rate(self) -> float:
+        """Get outbound dial rate per caller ID (calls per second)"""
+        return self.config.call.dial_rate_per_second
+    
     def get_audio_quality(self) -> int:
         """Get audio quality setting"""
         return self.config.ai.audio_quality
+    
+    def get_logging_config(self) -> LoggingConfig:
+        """Get logging settings (levels per module, JSON log file, audio sampling)"""
+        return self.config.logging
+    
+    def update_log_levels(self, audio_debug_sample_rate: Optional[float] = None, **module_levels) -> bool:
+        """Update per-module log levels (use \"\" for the default level)"""
+        module_levels = {module: level.upper() for module, level in module_levels.items()}
+        for module, level in module_levels.items():
+            logger.info(f"🔧 Updated log level: {module or 'default'} = {level}")
+        
+        def change(config: AppConfig) -> AppConfig:
+            levels = {**config.logging.module_levels, **{m: l for m, l in module_levels.items() if m}}
+            logging_config = replace(
+                config.logging,
+                level=module_levels.get("", config.logging.level),
+                module_levels=levels,
+                audio_debug_sample_rate=(
+                    config.logging.audio_debug_sample_rate if audio_debug_sample_rate is None else audio_debug_sample_rate
+                ),
+            )
+            return replace(config, logging=logging_config)
+        
+        return self._apply(change)
+    
+    def get_warm_pool_size(self) -> int:
+        """Get number of pre-built pipeline components kept per pool"""
+        return self.config.performance.warm_pool_size
+    
+    def get_tts_cache_memory_mb(self) -> int:
+        """Get the in-memory TTS cache budget in megabytes"""
+        return self.config.performance.tts_cache_memory_mb
 
 # Predefined voice options for Cartesia
 CARTESIA_VOICES = {
@@ -146,6 +480,88 @@ PROMPT_TEMPLATES = {
     "assistant": "You are a personal assistant. You are organized, efficient, and helpful. Provide clear and actionable responses. Be professional yet friendly in your communication."
 }
 
+# Opening line per prompt template, spoken from the TTS cache when the call connects
+DEFAULT_GREETING = "Hello! Thanks for taking my call. How can I help you today?"
+GREETINGS = {
+    "teacher": "Hello! I am your friendly AI teacher from India. How can I help you learn today?",
+    "support": "Hello! Thank you for taking our call. I am here to help with any questions or issues you have.",
+    "sales": "Hello! Thanks for taking my call. I would love to hear a little about what you are looking for.",
+    "assistant": "Hello! I am your personal assistant. What can I help you get done today?",
+}
+
+# Stock replies per prompt template for a call ended by a timeout ("idle" or
+# "max_duration"); fixed text, so they play from the TTS cache like greetings
+DEFAULT_FAREWELLS = MappingProxyType({
+    "idle": "I haven't heard anything for a while, so I will end the call here. Goodbye!",
+    "max_duration": "We are out of time for this call. Thanks for talking with me. Goodbye!",
+})
+FAREWELLS = {
+    "teacher": MappingProxyType({
+        "idle": "I haven't heard from you for a while, so let's stop here. Keep practising, and goodbye!",
+        "max_duration": "That is all the time we have today. You did great. Goodbye!",
+    }),
+    "support": MappingProxyType({
+        "idle": "I haven't heard anything for a while, so I will end the call now. Please call us back any time. Goodbye!",
+        "max_duration": "We have reached the time limit for this call. Please call us back if you need more help. Goodbye!",
+    }),
+    "sales": MappingProxyType({
+        "idle": "It sounds like now isn't a good time, so I will let you go. Thanks, and goodbye!",
+        "max_duration": "I don't want to take up more of your time. Thanks so much for chatting. Goodbye!",
+    }),
+    "assistant": MappingProxyType({
+        "idle": "I haven't heard anything for a while, so I will end the call here. Goodbye!",
+        "max_duration": "We have reached the time limit for this call. Goodbye!",
+    }),
+}
+
+# TTS chunking per prompt template: short conversational replies start speaking
+# at the first clause, longer structured answers wait for a full sentence.
+DEFAULT_CHUNK_POLICY = ChunkPolicy()
+CHUNK_POLICIES = {
+    "teacher": ChunkPolicy(first_chunk="clause", min_first_chars=10, min_chunk_chars=30),
+    "support": ChunkPolicy(first_chunk="clause", min_first_chars=15, min_chunk_chars=40),
+    "sales": ChunkPolicy(first_chunk="clause", min_first_chars=12, min_chunk_chars=40),
+    "assistant": ChunkPolicy(first_chunk="sentence", min_chunk_chars=60),
+}
+
+# Context budget per prompt template: short-reply personas need little history,
+# the assistant keeps more so it can follow multi-step requests.
+DEFAULT_CONTEXT_POLICY = ContextPolicy()
+CONTEXT_POLICIES = {
+    "teacher": ContextPolicy(max_tokens=1000, keep_turns=4),
+    "support": ContextPolicy(max_tokens=1500, keep_turns=6, summary_tokens=200),
+    "sales": ContextPolicy(max_tokens=1200, keep_turns=5),
+    "assistant": ContextPolicy(max_tokens=2500, keep_turns=8, summary_tokens=250),
+}
+
+# Bot profiles selectable per call (?profile= on /make-call, or "profile" in a
+# campaign), one per prompt template. Calls without one use the "default"
+# profile, which follows the settings page.
+DEFAULT_PROFILE = "default"
+BOT_PROFILE_VOICES = {
+    "teacher": "71a7ad14-091c-4e8e-a314-022ece01c121",  # British Reading Lady
+    "support": "41534e16-2966-4c6b-9670-111411def906",  # Calm Male
+    "sales": "b7d50908-b17c-442d-ad8d-810c63997ed9",  # Energetic Female
+    "assistant": "a0e99841-438c-4a64-b679-ae501e7d6091",  # Conversational Female
+}
+BOT_PROFILE_VAD = {
+    "teacher": VADPolicy(stop_secs=1.0),  # Students pause mid-answer
+    "assistant": VADPolicy(stop_secs=0.6),
+}
+BOT_PROFILES = {
+    name: BotProfile(
+        name=name,
+        system_prompt=prompt,
+        voice_id=BOT_PROFILE_VOICES[name],
+        greeting=GREETINGS.get(name, DEFAULT_GREETING),
+        farewells=FAREWELLS.get(name, DEFAULT_FAREWELLS),
+        vad=BOT_PROFILE_VAD.get(name, VADPolicy()),
+        context=CONTEXT_POLICIES.get(name, DEFAULT_CONTEXT_POLICY),
+        chunk=CHUNK_POLICIES.get(name, DEFAULT_CHUNK_POLICY),
+    )
+    for name, prompt in PROMPT_TEMPLATES.items()
+}
+
 # Global configuration instance
 config_manager = ConfigManager()
 
@@ -0,0 +1,221 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from pipecat.frames.frames import Frame
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext, OpenAILLMContextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from config import DEFAULT_CONTEXT_POLICY, ContextPolicy
+from metrics import get_metrics
+
+Message = Dict[str, Any]
+Summarizer = Callable[[str, List[Message], int], Awaitable[str]]
+
+# Per-message overhead of the chat format, in tokens
+MESSAGE_OVERHEAD = 4
+
+context_tokens = get_metrics().histogram(
+    "llm_context_tokens",
+    "Estimated tokens in each LLM request's context",
+    buckets=(250, 500, 1000, 1500, 2000, 3000, 4000, 8000, 16000),
+)
+context_summaries = get_metrics().counter("llm_context_summaries_total", "Rolling summaries of trimmed turns")
+
+SUMMARY_PREFIX = "Summary of the conversation so far: "
+SUMMARY_PROMPT = (
+    "You keep a running summary of a phone call for the assistant on the call. "
+    "Update the summary with the new messages. Keep names, numbers, decisions, "
+    "open questions and anything the caller asked for. Write plain sentences, "
+    "at most {words} words."
+)
+
+
+def message_text(message: Message) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+def _is_summary(message: Message) -> bool:
+    return message.get("role") == "system" and message_text(message).startswith(SUMMARY_PREFIX)
+
+
+def estimate_tokens(messages: List[Message]) -> int:
+    """Rough token count (about four characters per token) for budget checks"""
+    return sum(MESSAGE_OVERHEAD + len(message_text(m)) // 4 for m in messages)
+
+
+async def extractive_summary(summary: str, messages: List[Message], max_tokens: int) -> str:
+    """Offline summarizer: the first sentence of each trimmed caller message
+
+    Used with the stub providers and whenever the LLM summary call fails. Older
+    material falls off the front once the summary outgrows its budget.
+    """
+    lines = [summary] if summary else []
+    for message in messages:
+        if message.get("role") == "user":
+            first = re.split(r"(?<=[.!?])\s", message_text(message).strip(), maxsplit=1)[0]
+            if first:
+                lines.append(f"Caller said: {first}")
+    text = " ".join(lines)
+    limit = max_tokens * 4
+    # Cut at a word boundary so the summary doesn't start mid-word
+    return text[-limit:].split(" ", 1)[-1] if len(text) > limit else text
+
+
+class LLMSummarizer:
+    """Summarizes trimmed turns with a small chat model"""
+
+    def __init__(self, model: str = "gpt-4o-mini", client=None):
+        self.model = model
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._client
+
+    async def __call__(self, summary: str, messages: List[Message], max_tokens: int) -> str:
+        transcript = "\n".join(f"{m.get('role')}: {message_text(m)}" for m in messages)
+        response = await self._get_client().chat.completions.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT.format(words=max_tokens * 3 // 4)},
+                {"role": "user", "content": f"Summary so far: {summary or '(none)'}\n\nNew messages:\n{transcript}"},
+            ],
+        )
+        return (response.choices[0].message.content or "").strip()
+
+
+class ContextBudget(FrameProcessor):
+    """Keeps each LLM request within a token budget
+
+    Sits between the user context aggregator and the LLM. Before a context goes
+    to the LLM it keeps the system prompt, a rolling summary and the most
+    recent turns, dropping the oldest turns until the request fits the policy's
+    budget. Dropped turns are folded into the summary by a background task, so
+    the LLM request never waits on summarization; the summary it carries is at
+    most one turn behind.
+    """
+
+    def __init__(
+        self,
+        policy: ContextPolicy = DEFAULT_CONTEXT_POLICY,
+        summarizer: Summarizer = extractive_summary,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.policy = policy
+        self._summarizer = summarizer
+        self._summary = ""
+        self._summary_message: Optional[Message] = None
+        self._unsummarized: List[Message] = []
+        self._summary_task: Optional[asyncio.Task] = None
+
+        self.turn_tokens: List[int] = []
+        self.trimmed_turns = 0
+        self.summaries = 0
+
+    def trim(self, messages: List[Message]) -> Tuple[List[Message], List[List[Message]], int]:
+        """Messages that fit the budget, the turns dropped and the estimated tokens
+
+        Doesn't change the context or the summary, so a request can be sized
+        ahead of time (speculative generation).
+        """
+        head: List[Message] = []
+        if messages and messages[0].get("role") == "system":
+            head.append(messages[0])
+        conversation = [m for m in messages[len(head):] if not _is_summary(m)]
+
+        # A turn starts at each caller message; anything before the first is its own turn
+        turns: List[List[Message]] = []
+        for message in conversation:
+            if message.get("role") == "user" or not turns:
+                turns.append([])
+            turns[-1].append(message)
+
+        summary = [self._summary_message] if self._summary_message else []
+        tokens = estimate_tokens(head + summary + conversation)
+        dropped: List[List[Message]] = []
+        while len(turns) > 1 and (len(turns) > self.policy.keep_turns or tokens > self.policy.max_tokens):
+            turn = turns.pop(0)
+            dropped.append(turn)
+            tokens -= estimate_tokens(turn)
+
+        return head + summary + [m for turn in turns for m in turn], dropped, tokens
+
+    def fit(self, context: OpenAILLMContext) -> int:
+        """Trim the context to the budget in place; returns its estimated tokens"""
+        messages = context.get_messages()
+        fitted, dropped, tokens = self.trim(messages)
+        if len(fitted) != len(messages) or any(a is not b for a, b in zip(fitted, messages)):
+            context.set_messages(fitted)
+        if dropped:
+            self.trimmed_turns += len(dropped)
+            self._unsummarized.extend(m for turn in dropped for m in turn)
+            self._summarize_in_background()
+
+        self.turn_tokens.append(tokens)
+        context_tokens.observe(tokens)
+        logger.debug(f"📏 LLM context: {tokens} tokens, {len(fitted)} messages")
+        return tokens
+
+    def _summarize_in_background(self):
+        if self._summary_task is None or self._summary_task.done():
+            self._summary_task = asyncio.get_running_loop().create_task(self._summarize())
+
+    async def _summarize(self):
+        # Turns trimmed while a summary is being written are picked up by the next pass
+        while self._unsummarized:
+            batch, self._unsummarized = self._unsummarized, []
+            try:
+                summary = await self._summarizer(self._summary, batch, self.policy.summary_tokens)
+            except Exception as e:
+                logger.warning(f"⚠️ Context summary failed ({e}) - using extractive summary")
+                summary = await extractive_summary(self._summary, batch, self.policy.summary_tokens)
+            self._summary = summary
+            self.summaries += 1
+            context_summaries.inc()
+            self._summary_message = {"role": "system", "content": SUMMARY_PREFIX + summary} if summary else None
+
+    async def wait_for_summary(self):
+        """Wait for a summary in progress (for tests and benchmarks)"""
+        if self._summary_task:
+            await self._summary_task
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, OpenAILLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            self.fit(frame.context)
+        await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        await super().cleanup()
+        if self._summary_task and not self._summary_task.done():
+            self._summary_task.cancel()
+
+    def summary(self) -> Dict[str, Any]:
+        """Context size per LLM request over the call"""
+        tokens = self.turn_tokens
+        return {
+            "requests": len(tokens),
+            "max_tokens": max(tokens, default=0),
+            "mean_tokens": round(sum(tokens) / len(tokens)) if tokens else 0,
+            "last_tokens": tokens[-1] if tokens else 0,
+            "trimmed_turns": self.trimmed_turns,
+            "summaries": self.summaries,
+        }
@@ -47,12 +47,33 @@ if [ ! -f ".env" ]; then
     exit 1
 fi
 
-# Build and start the application
-echo "🏗️ Building and starting the application..."
-docker-compose down
+# Build the new image while the old container keeps serving calls
+echo "🏗️ Building the application..."
 docker-compose build --no-cache
+
+# Let live calls finish before replacing the container
+if curl -sf -X POST http://localhost:8765/api/drain > /dev/null; then
+    echo "🚰 Draining live calls (new calls go to DRAIN_REDIRECT_URL if set)..."
+    while status=$(curl -sf "http://localhost:8765/api/drain?wait=30") && ! echo "$status" | grep -q '"active_calls":0,'; do
+        # Every worker ends its calls at the deadline; don't wait on calls the store never saw end
+        if echo "$status" | grep -q '"deadline_in_seconds":0.0,'; then
+            echo "⚠️ Drain deadline passed with $(echo "$status" | grep -o '"active_calls":[0-9]*') left in the call store"
+            break
+        fi
+        echo "⏳ $(echo "$status" | grep -o '"active_calls":[0-9]*') still running across all workers..."
+    done
+fi
+
+echo "🚀 Starting the application..."
+docker-compose down
 docker-compose up -d
 
+echo "⏳ Waiting for the warm pools to fill..."
+for _ in $(seq 1 60); do
+    curl -sf http://localhost:8765/readyz > /dev/null && break
+    sleep 1
+done
+
 # Setup firewall
 echo "🔥 Configuring firewall..."
 sudo ufw allow 8765/tcp
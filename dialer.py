@@ -0,0 +1,344 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import csv
+import io
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+import aiohttp
+from loguru import logger
+
+PLIVO_API_BASE_URL = os.getenv("PLIVO_API_BASE_URL", "https://api.plivo.com")
+
+# Finished campaigns stay queryable this long, and at most this many are kept
+FINISHED_CAMPAIGN_SECONDS = 3600.0
+MAX_FINISHED_CAMPAIGNS = 100
+
+
+class TokenBucket:
+    """Async token bucket used to rate limit dialing per caller ID
+
+    Waiters are served in order, priority waiters (single calls) ahead of the
+    rest (campaign calls), by one task that sleeps until the next token; no
+    lock is held while waiting, so a cancelled waiter just drops out.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._waiters: Dict[bool, Deque[asyncio.Future]] = {True: deque(), False: deque()}
+        self._task: Optional[asyncio.Task] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def idle(self) -> bool:
+        """No one waiting and the bucket full again, so it can be dropped"""
+        self._refill()
+        return not (self._waiters[True] or self._waiters[False]) and self._tokens >= self.capacity
+
+    async def acquire(self, priority: bool = False):
+        """Wait until a token is available and consume it"""
+        self._refill()
+        if self._tokens >= 1 and not (self._waiters[True] or self._waiters[False]):
+            self._tokens -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._serve())
+        await waiter
+
+    async def _serve(self):
+        while True:
+            for waiters in (self._waiters[True], self._waiters[False]):
+                while waiters and waiters[0].done():
+                    waiters.popleft()
+            waiters = self._waiters[True] or self._waiters[False]
+            if not waiters:
+                return
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                waiters.popleft().set_result(None)
+            else:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class DialResult:
+    """Outcome of a single outbound dial attempt"""
+    phone: str
+    caller_id: str
+    success: bool
+    call_uuid: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class Campaign:
+    """A bulk dialing job and its running counters"""
+    campaign_id: str
+    caller_id: str
+    numbers: List[str]
+    params: Dict[str, str] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    dialed: int = 0
+    successful: int = 0
+    failed: int = 0
+    finished: bool = False
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for the campaigns API (without the number list)"""
+        return {
+            "campaign_id": self.campaign_id,
+            "caller_id": self.caller_id,
+            "params": self.params,
+            "created_at": self.created_at,
+            "total": len(self.numbers),
+            "dialed": self.dialed,
+            "successful": self.successful,
+            "failed": self.failed,
+            "finished": self.finished,
+        }
+
+
+def parse_numbers(payload: str) -> List[str]:
+    """Extract phone numbers from CSV text (first column, optional header)"""
+    numbers = []
+    for row in csv.reader(io.StringIO(payload)):
+        if not row:
+            continue
+        number = row[0].strip().replace(" ", "").replace("-", "")
+        if number.lstrip("+").isdigit():
+            numbers.append(number)
+    return numbers
+
+
+class PlivoDialer:
+    """Non-blocking Plivo dialer with a bounded worker pool and per-caller-ID rate limits
+
+    Calls the Plivo REST API directly over aiohttp so that dialing never blocks the
+    event loop that carries live /ws audio streams. Single calls have their own
+    request slots and go ahead of campaign calls in the caller ID's rate limit,
+    so a large campaign never holds them up.
+    """
+
+    def __init__(
+        self,
+        auth_id: Optional[str],
+        auth_token: Optional[str],
+        base_url: str = PLIVO_API_BASE_URL,
+        concurrency: int = 10,
+        rate_per_second: float = 1.0,
+        timeout: float = 10.0,
+        single_call_concurrency: int = 2,
+    ):
+        self.auth_id = auth_id
+        self.auth_token = auth_token
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = max(1, concurrency)
+        self.single_call_concurrency = max(1, single_call_concurrency)
+        self.rate_per_second = rate_per_second
+        self.timeout = timeout
+        self.campaigns: Dict[str, Campaign] = {}
+        self.on_dialed: Optional[Callable[[DialResult], Awaitable[None]]] = None
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._campaign_slots = asyncio.Semaphore(self.concurrency)
+        self._single_slots = asyncio.Semaphore(self.single_call_concurrency)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def start(self):
+        """Open the shared HTTP session"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                auth=aiohttp.BasicAuth(self.auth_id or "", self.auth_token or ""),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.concurrency + self.single_call_concurrency),
+            )
+
+    async def close(self):
+        """Cancel running campaigns and close the HTTP session"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _bucket(self, caller_id: str) -> TokenBucket:
+        bucket = self._buckets.get(caller_id)
+        if bucket is None:
+            # A full bucket nobody waits on is the same as a new one
+            for idle in [key for key, b in self._buckets.items() if b.idle]:
+                del self._buckets[idle]
+            bucket = TokenBucket(self.rate_per_second)
+            self._buckets[caller_id] = bucket
+        return bucket
+
+    async def dial(
+        self, phone: str, caller_id: str, answer_url: str, hangup_url: str, campaign: bool = False
+    ) -> DialResult:
+        """Place one outbound call, honouring the pool size and caller ID rate limit"""
+        slots = self._campaign_slots if campaign else self._single_slots
+        result = await self._dial(phone, caller_id, answer_url, hangup_url, slots)
+        if self.on_dialed:
+            try:
+                await self.on_dialed(result)
+            except Exception as e:
+                logger.error(f"❌ Dial result hook failed: {e}")
+        return result
+
+    async def _dial(
+        self, phone: str, caller_id: str, answer_url: str, hangup_url: str, slots: asyncio.Semaphore
+    ) -> DialResult:
+        await self.start()
+        # Single calls share the caller ID's rate limit but go ahead of campaign calls
+        await self._bucket(caller_id).acquire(priority=slots is self._single_slots)
+
+        async with slots:
+            started = time.perf_counter()
+            endpoint = f"{self.base_url}/v1/Account/{self.auth_id}/Call/"
+            body = {
+                "from": caller_id,
+                "to": phone,
+                "answer_url": answer_url,
+                "answer_method": "POST",
+                "hangup_url": hangup_url,
+                "hangup_method": "POST",
+            }
+            try:
+                async with self._session.post(endpoint, json=body) as response:
+                    data = await response.json(content_type=None)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    if response.status >= 400:
+                        error = (data or {}).get("error") or f"HTTP {response.status}"
+                        return DialResult(phone, caller_id, False, error=str(error), elapsed_ms=elapsed_ms)
+                    call_uuid = data.get("request_uuid") or data.get("call_uuid")
+                    return DialResult(phone, caller_id, True, call_uuid=call_uuid, elapsed_ms=elapsed_ms)
+            except Exception as e:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                return DialResult(phone, caller_id, False, error=f"{type(e).__name__}: {e}", elapsed_ms=elapsed_ms)
+
+    def create_campaign(
+        self,
+        numbers: List[str],
+        caller_id: str,
+        answer_url: str,
+        hangup_url: str,
+        params: Optional[Dict[str, str]] = None,
+    ) -> Campaign:
+        """Register a campaign and start dialing it in the background"""
+        self._prune()
+        campaign = Campaign(
+            campaign_id=uuid.uuid4().hex,
+            caller_id=caller_id,
+            numbers=numbers,
+            params=params or {},
+        )
+        self.campaigns[campaign.campaign_id] = campaign
+        self._subscribers[campaign.campaign_id] = []
+        self._tasks[campaign.campaign_id] = asyncio.create_task(
+            self._run_campaign(campaign, answer_url, hangup_url)
+        )
+        logger.info(f"📣 Campaign {campaign.campaign_id} created with {len(numbers)} numbers")
+        return campaign
+
+    async def _run_campaign(self, campaign: Campaign, answer_url: str, hangup_url: str):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker():
+            while True:
+                phone = await queue.get()
+                try:
+                    result = await self.dial(phone, campaign.caller_id, answer_url, hangup_url, campaign=True)
+                    campaign.dialed += 1
+                    if result.success:
+                        campaign.successful += 1
+                    else:
+                        campaign.failed += 1
+                    self._publish(campaign, {"type": "progress", **asdict(result), **campaign.to_dict()})
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            for phone in campaign.numbers:
+                await queue.put(phone)
+            await queue.join()
+        finally:
+            for w in workers:
+                w.cancel()
+            campaign.finished = True
+            campaign.finished_at = time.time()
+            self._publish(campaign, {"type": "summary", **campaign.to_dict()})
+            self._publish(campaign, None)
+            # Subscribers already hold the end of the stream
+            self._subscribers.pop(campaign.campaign_id, None)
+            self._tasks.pop(campaign.campaign_id, None)
+            self._prune()
+            logger.info(
+                f"🏁 Campaign {campaign.campaign_id} finished: "
+                f"{campaign.successful} ok, {campaign.failed} failed"
+            )
+
+    def _prune(self):
+        """Forget finished campaigns past FINISHED_CAMPAIGN_SECONDS, keeping at most MAX_FINISHED_CAMPAIGNS"""
+        finished = sorted(
+            (c for c in self.campaigns.values() if c.finished_at is not None), key=lambda c: c.finished_at
+        )
+        expired = time.time() - FINISHED_CAMPAIGN_SECONDS
+        excess = len(finished) - MAX_FINISHED_CAMPAIGNS
+        for i, campaign in enumerate(finished):
+            if i < excess or campaign.finished_at < expired:
+                del self.campaigns[campaign.campaign_id]
+
+    def _publish(self, campaign: Campaign, event: Optional[Dict[str, Any]]):
+        for subscriber in self._subscribers.get(campaign.campaign_id, []):
+            subscriber.put_nowait(event)
+
+    def progress(self, campaign_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Subscribe to a campaign and iterate its progress events until it finishes
+
+        The subscription is registered immediately so no events are missed between
+        creating a campaign and starting to stream its response.
+        """
+        campaign = self.campaigns[campaign_id]
+        subscriber: asyncio.Queue = asyncio.Queue()
+        if campaign.finished:
+            subscriber.put_nowait({"type": "summary", **campaign.to_dict()})
+            subscriber.put_nowait(None)
+        else:
+            self._subscribers[campaign_id].append(subscriber)
+        return self._iter_progress(campaign_id, subscriber)
+
+    async def _iter_progress(self, campaign_id: str, subscriber: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            while True:
+                event = await subscriber.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            subscribers = self._subscribers.get(campaign_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
@@ -0,0 +1,177 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import fcntl
+import json
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from config import LoggingConfig
+
+
+class BatchedJSONSink:
+    """Loguru sink that writes JSON lines from a background thread in batches
+
+    The logging call only pushes a small tuple onto a queue; encoding, writing and
+    rotation happen on the writer thread so the event loop never waits on disk.
+    Worker processes share the file: rotation happens under a lock file, and a
+    writer whose file was rotated by another worker reopens the new one.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_batch: int = 256,
+        flush_interval: float = 0.25,
+        rotation_bytes: int = 1_000_000,
+    ):
+        self.path = path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.rotation_bytes = rotation_bytes
+        self.dropped = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message):
+        record = message.record
+        exception = record["exception"]
+        self._queue.put(
+            (
+                record["time"].timestamp(),
+                record["level"].name,
+                record["name"],
+                record["function"],
+                record["line"],
+                record["message"],
+                dict(record["extra"]) if record["extra"] else None,
+                repr(exception.value) if exception else None,
+            )
+        )
+
+    def _encode(self, item) -> str:
+        ts, level, name, function, line, msg, extra, exception = item
+        entry = {"ts": ts, "level": level, "module": name, "fn": function, "line": line, "msg": msg}
+        if extra:
+            entry.update({k: v if isinstance(v, (str, int, float, bool)) else str(v) for k, v in extra.items()})
+        if exception:
+            entry["exception"] = exception
+        return json.dumps(entry, ensure_ascii=False)
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+
+            batch: List[str] = [self._encode(item)]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(self._encode(item))
+
+            self._file.write("\n".join(batch) + "\n")
+            self._file.flush()
+            if self._file.tell() > self.rotation_bytes:
+                self._rotate()
+            if stop:
+                break
+        self._file.close()
+
+    def _rotate(self):
+        # Appends land at the shared end of file, so tell() also counts other
+        # workers' lines; past the limit we either rotate or were rotated
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                current = os.stat(self.path) if os.path.exists(self.path) else None
+                mine = os.fstat(self._file.fileno())
+                if current and (current.st_dev, current.st_ino) == (mine.st_dev, mine.st_ino):
+                    os.replace(self.path, f"{self.path}.1")
+                self._file.close()
+                self._file = open(self.path, "a", encoding="utf-8")
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def stop(self):
+        """Flush pending records and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+_audio_debug_sample_rate = 0.0
+
+def audio_debug_sampled() -> bool:
+    """Whether to emit a per-frame/per-event debug line from the audio path
+
+    Audio-path debug logging (the Plivo serializer and the STT gate) is off unless
+    logging.audio_debug_sample_rate is set; call sites guard with
+    `if audio_debug_sampled(): logger.debug(...)`.
+    """
+    return _audio_debug_sample_rate > 0 and random.random() < _audio_debug_sample_rate
+
+
+# Minimum level number per module prefix ("" is the default), swapped in whole
+_levels: Dict[str, int] = {"": 0}
+_json_file: Optional[str] = None
+
+
+def _level_filter(record) -> bool:
+    # Most specific module prefix wins, as with loguru's dict filters
+    name = record["name"] or ""
+    while name not in _levels:
+        name = name.rpartition(".")[0] if "." in name else ""
+    return record["level"].no >= _levels[name]
+
+
+def configure_logging(config: LoggingConfig, json_file: Optional[str] = None):
+    """Install the console and batched JSON sinks with per-module levels
+
+    Once the sinks are in, later calls only swap the level table, which is cheap
+    and safe from the event loop; the sinks are replaced only when the JSON file
+    changes.
+    """
+    global _audio_debug_sample_rate, _levels, _json_file
+    _audio_debug_sample_rate = config.audio_debug_sample_rate
+
+    levels: Dict[str, int] = {"": logger.level(config.level.upper()).no}
+    levels.update({module: logger.level(level.upper()).no for module, level in config.module_levels.items()})
+    _levels = levels
+
+    json_file = json_file or config.json_file
+    if json_file == _json_file:
+        return
+    _json_file = json_file
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level="TRACE",
+        filter=_level_filter,
+        enqueue=True,
+        format="<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+        "{extra[call_id]} | <cyan>{name}</cyan> - <level>{message}</level>",
+    )
+    logger.add(BatchedJSONSink(json_file), level="TRACE", filter=_level_filter, format="{message}")
+    logger.configure(extra={"call_id": "-"})
@@ -0,0 +1,74 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+from typing import Optional
+
+from loguru import logger
+
+from metrics import get_metrics
+
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+loop_lag_seconds = get_metrics().histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer that should have fired immediately", LAG_BUCKETS
+)
+loop_lag_recent = get_metrics().gauge("event_loop_lag_recent_seconds", "Largest event loop lag in the last second")
+
+
+class LoopLagMonitor:
+    """Measures event loop lag by timing a short sleep in a background task
+
+    Every call shares one loop, so lag here is delay added to every call's
+    20 ms audio frames.
+    """
+
+    def __init__(self, interval: float = 0.05, window: float = 1.0):
+        self.interval = interval
+        self.window = window
+        self.recent_max = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        window_start = time.monotonic()
+        window_max = 0.0
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - started - self.interval)
+            loop_lag_seconds.observe(lag)
+            window_max = max(window_max, lag)
+            if now - window_start >= self.window:
+                self.recent_max = window_max
+                loop_lag_recent.set(window_max)
+                if window_max > 0.1:
+                    logger.warning(f"⚠️ Event loop lag {window_max * 1000:.0f} ms")
+                window_start, window_max = now, 0.0
+
+
+_loop_monitor: Optional[LoopLagMonitor] = None
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get the process-wide event loop lag monitor"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = LoopLagMonitor()
+    return _loop_monitor
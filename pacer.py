@@ -0,0 +1,376 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    OutputAudioRawFrame,
+    StartFrame,
+    StartInterruptionFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.transports.network.fastapi_websocket import (
+    FastAPIWebsocketInputTransport,
+    FastAPIWebsocketOutputTransport,
+    FastAPIWebsocketParams,
+    FastAPIWebsocketTransport,
+)
+
+from metrics import get_metrics
+
+FRAME_SECONDS = 0.02  # Plivo media frames are 20 ms
+
+audio_underruns = get_metrics().counter(
+    "audio_underruns_total", "20 ms audio slots with nothing to play (in: jitter buffer ran dry, out: caller heard a gap)"
+)
+audio_overruns = get_metrics().counter(
+    "audio_overruns_total", "Times the inbound jitter buffer went over its maximum depth and was flushed"
+)
+paced_streams = get_metrics().gauge("audio_clock_streams", "Audio streams driven by the shared 20 ms clock")
+
+
+class AudioClock:
+    """One task ticks every 20 ms for every paced audio stream
+
+    Calls don't get a timer each: their audio tasks wait on a future the clock
+    task resolves once per tick, and compare tick numbers taken from one
+    monotonic epoch. After an event loop stall every stream sees the ticks it
+    missed at once and catches up, so no stream drifts from real time.
+    A rate above 1 runs the clock faster than real time, for offline replay.
+    """
+
+    def __init__(self, interval: float = FRAME_SECONDS, rate: float = 1.0):
+        self.interval = interval
+        self.rate = rate
+        self._epoch = time.monotonic()
+        self._tick: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self._streams: Set[Any] = set()
+
+    def elapsed(self) -> float:
+        """Seconds of audio time since the epoch"""
+        return (time.monotonic() - self._epoch) * self.rate
+
+    def now(self) -> int:
+        """The current tick number"""
+        return int(self.elapsed() / self.interval)
+
+    def attach(self, stream: Any):
+        self._streams.add(stream)
+        paced_streams.set(len(self._streams))
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def detach(self, stream: Any):
+        self._streams.discard(stream)
+        paced_streams.set(len(self._streams))
+
+    async def wait_until(self, tick: float):
+        """Return once tick has started (straight away if it already has)"""
+        while self.now() < tick:
+            if self._tick is None:
+                self._tick = asyncio.get_running_loop().create_future()
+            if self._task is None:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            await asyncio.shield(self._tick)
+
+    async def _run(self):
+        try:
+            # Runs while streams are attached or anything still waits for a tick
+            while self._streams or self._tick is not None:
+                # Sleep to an absolute tick boundary so a slow tick doesn't shift the next
+                next_tick = self._epoch + (self.now() + 1) * self.interval / self.rate
+                await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+                tick, self._tick = self._tick, None
+                if tick is not None and not tick.done():
+                    tick.set_result(None)
+        finally:
+            self._task = None
+
+
+class OutboundPacer:
+    """Lets a call's bot audio out one 20 ms frame per clock tick
+
+    Each bot turn starts `lead` ahead of real time, so the far end has a
+    little audio buffered, and then holds that lead. A frame that arrives
+    after its play time means the caller heard a gap: the missed slots count
+    as underruns and the turn carries on from there. A pause longer than
+    `turn_gap` starts a new turn.
+    """
+
+    def __init__(self, clock: AudioClock, lead: float = 0.2, turn_gap: float = 0.35):
+        self.clock = clock
+        self.lead_ticks = lead / clock.interval
+        self.turn_gap_ticks = turn_gap / clock.interval
+        self.underruns = 0
+        self.frames = 0
+        self.closed = False
+        self._anchor: Optional[float] = None
+        self._position = 0.0
+
+    def reset(self):
+        """The caller interrupted: the next frame starts a new turn"""
+        self._anchor = None
+
+    def close(self):
+        self.closed = True
+
+    async def wait_turn(self, seconds: float):
+        """Wait until the next frame (`seconds` long) may be sent"""
+        now = self.clock.now()
+        if self._anchor is None or now - (self._anchor + self._position) > self.turn_gap_ticks:
+            self._anchor = now
+            self._position = 0.0
+        elif now > self._anchor + self._position:
+            missed = math.floor(now - (self._anchor + self._position))
+            if missed:
+                self.underruns += missed
+                audio_underruns.inc(missed, labels={"direction": "out"})
+            self._anchor = now - self._position
+        due = self._anchor + self._position - self.lead_ticks
+        self._position += seconds / self.clock.interval
+        self.frames += 1
+        await self.clock.wait_until(due)
+
+
+class JitterBuffer:
+    """Adaptive jitter buffer for a call's inbound audio, released one tick at a time
+
+    Arrival jitter is tracked as in RFC 3550 (a running mean of how far each
+    frame's arrival gap is from its duration). The target depth is a multiple
+    of it, between `min_depth` and `max_depth`. Playback starts once the
+    buffer holds the target; running dry counts an underrun and waits for the
+    target again. Going over `max_depth` counts an overrun and releases the
+    excess at once, so delay stays bounded and no caller audio is lost.
+    """
+
+    def __init__(self, min_depth: float = 0.02, max_depth: float = 0.2, jitter_multiple: float = 3.0):
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.jitter_multiple = jitter_multiple
+        self.jitter = 0.0
+        self.underruns = 0
+        self.overruns = 0
+        self.frames = 0
+        self._frames: Deque[InputAudioRawFrame] = deque()
+        self._depth = 0.0
+        self._playing = False
+        self._starved = False
+        self._credit = 0.0
+        self._last_arrival: Optional[float] = None
+        self._last_duration = 0.0
+
+    @property
+    def depth(self) -> float:
+        """Seconds of audio waiting"""
+        return self._depth
+
+    @property
+    def target(self) -> float:
+        return min(self.max_depth, max(self.min_depth, self.jitter * self.jitter_multiple))
+
+    def put(self, frame: InputAudioRawFrame, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        duration = _duration(frame)
+        if self._last_arrival is not None:
+            deviation = abs((now - self._last_arrival) - self._last_duration)
+            self.jitter += (deviation - self.jitter) / 16
+        self._last_arrival = now
+        self._last_duration = duration
+        if self._starved:
+            self._starved = False
+            self.underruns += 1
+            audio_underruns.inc(labels={"direction": "in"})
+        self._frames.append(frame)
+        self._depth += duration
+        self.frames += 1
+
+    def release(self, seconds: float) -> Deque[InputAudioRawFrame]:
+        """Frames to play for one tick of `seconds`"""
+        out: Deque[InputAudioRawFrame] = deque()
+        if not self._playing:
+            # Keep the target buffered after this tick's frame goes out
+            if not self._frames or self._depth < self.target + seconds:
+                return out
+            self._playing = True
+            self._credit = 0.0
+        if not self._frames:
+            # Counted when audio comes back, so the end of the call isn't an underrun
+            self._starved = True
+            self._playing = False
+            return out
+        self._credit += seconds
+        if self._depth > self.max_depth:
+            self.overruns += 1
+            audio_overruns.inc(labels={"direction": "in"})
+            self._credit += self._depth - self.target
+        while self._frames and self._credit >= _duration(self._frames[0]) - 1e-9:
+            frame = self._frames.popleft()
+            self._credit -= _duration(frame)
+            self._depth -= _duration(frame)
+            out.append(frame)
+        if not self._frames:
+            self._credit = 0.0
+        return out
+
+
+def _duration(frame) -> float:
+    return len(frame.audio) / 2 / frame.num_channels / frame.sample_rate
+
+
+class JitterBufferedInputTransport(FastAPIWebsocketInputTransport):
+    """WebSocket input that feeds caller audio to the pipeline through a jitter buffer"""
+
+    def __init__(self, *args, clock: AudioClock, jitter_buffer: JitterBuffer, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._audio_clock = clock
+        self.jitter_buffer = jitter_buffer
+        self._release_task: Optional[asyncio.Task] = None
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        if not self._release_task:
+            self._audio_clock.attach(self)
+            self._release_task = self.create_task(self._release_audio())
+
+    async def stop(self, frame: EndFrame):
+        await self._stop_release()
+        await super().stop(frame)
+
+    async def cancel(self, frame: CancelFrame):
+        await self._stop_release()
+        await super().cancel(frame)
+
+    async def _stop_release(self):
+        if self._release_task:
+            await self.cancel_task(self._release_task)
+            self._release_task = None
+        self._audio_clock.detach(self)
+
+    async def _cancel_audio_task(self):
+        # On Python 3.11 the VAD task's asyncio.wait_for swallows a cancel that
+        # lands while a frame is ready, and the call then never ends, so cancel
+        # until it is done
+        task = self._audio_task
+        while task and not task.done():
+            task.cancel()
+            await asyncio.wait([task], timeout=0.1)
+        self._audio_task = None
+
+    async def push_audio_frame(self, frame: InputAudioRawFrame):
+        self.jitter_buffer.put(frame, self._audio_clock.elapsed())
+
+    async def _release_audio(self):
+        tick = self._audio_clock.now()
+        while True:
+            tick += 1
+            await self._audio_clock.wait_until(tick)
+            for frame in self.jitter_buffer.release(self._audio_clock.interval):
+                await super().push_audio_frame(frame)
+
+
+class PacedOutputTransport(FastAPIWebsocketOutputTransport):
+    """WebSocket output that sends bot audio in 20 ms frames on the shared clock"""
+
+    def __init__(self, *args, pacer: OutboundPacer, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pacer = pacer
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        self.pacer.clock.attach(self)
+
+    async def stop(self, frame: EndFrame):
+        # Queued bot audio is still written out while stopping
+        await super().stop(frame)
+        self.pacer.clock.detach(self)
+
+    async def cancel(self, frame: CancelFrame):
+        self.pacer.close()
+        await super().cancel(frame)
+        self.pacer.clock.detach(self)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartInterruptionFrame):
+            self.pacer.reset()
+
+    async def write_audio_frame(self, frame: OutputAudioRawFrame):
+        if self.pacer.closed:
+            # asyncio.wait_for in the audio task can swallow the cancel when a
+            # frame is already queued, and a hung-up call drains its backlog
+            # without waiting, so end the task from here
+            raise asyncio.CancelledError()
+        if self._client.is_closing or not self._client.is_connected:
+            return
+        await self.pacer.wait_turn(len(frame.audio) / 2 / self._params.audio_out_channels / self.sample_rate)
+        await self._write_frame(
+            OutputAudioRawFrame(audio=frame.audio, sample_rate=self.sample_rate, num_channels=self._params.audio_out_channels)
+        )
+
+
+class PacedWebsocketTransport(FastAPIWebsocketTransport):
+    """FastAPIWebsocketTransport with clock-paced output and a jitter-buffered input
+
+    Bot audio goes out in 20 ms frames (set audio_out_10ms_chunks=2), so each
+    write is one Plivo media frame.
+    """
+
+    def __init__(
+        self,
+        websocket,
+        params: FastAPIWebsocketParams,
+        clock: Optional[AudioClock] = None,
+        lead: float = 0.2,
+        min_jitter_depth: float = 0.02,
+        max_jitter_depth: float = 0.2,
+        **kwargs,
+    ):
+        super().__init__(websocket, params, **kwargs)
+        clock = clock or get_audio_clock()
+        self._input = JitterBufferedInputTransport(
+            self,
+            self._client,
+            self._params,
+            clock=clock,
+            jitter_buffer=JitterBuffer(min_jitter_depth, max_jitter_depth),
+            name=self._input_name,
+        )
+        self._output = PacedOutputTransport(
+            self, self._client, self._params, pacer=OutboundPacer(clock, lead), name=self._output_name
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-call pacing counters"""
+        jitter_buffer = self._input.jitter_buffer
+        pacer = self._output.pacer
+        return {
+            "out_frames": pacer.frames,
+            "out_underruns": pacer.underruns,
+            "in_frames": jitter_buffer.frames,
+            "in_underruns": jitter_buffer.underruns,
+            "in_overruns": jitter_buffer.overruns,
+            "in_jitter_ms": round(jitter_buffer.jitter * 1000, 1),
+            "in_target_ms": round(jitter_buffer.target * 1000, 1),
+        }
+
+
+_audio_clock: Optional[AudioClock] = None
+
+def get_audio_clock() -> AudioClock:
+    """Get the process-wide 20 ms audio clock"""
+    global _audio_clock
+    if _audio_clock is None:
+        _audio_clock = AudioClock()
+    return _audio_clock
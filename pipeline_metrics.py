@@ -0,0 +1,157 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    LLMFullResponseEndFrame,
+    LLMTextFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
+from pipecat.services.llm_service import LLMService
+
+from metrics import get_metrics
+
+pipeline_start_seconds = get_metrics().histogram(
+    "call_pipeline_start_seconds", "Time from /ws accept to the first pipeline frame (StartFrame)"
+)
+pickup_seconds = get_metrics().histogram(
+    "call_pickup_seconds", "Time from /ws accept to the first bot audio sent to the caller"
+)
+stage_seconds = get_metrics().histogram(
+    "pipeline_stage_seconds", "Per-stage latency: stt, llm_ttft, tts_ttfb and voice_to_voice"
+)
+interruptions_total = get_metrics().counter("call_interruptions_total", "Times the caller interrupted the bot")
+
+STAGES = ("stt", "llm_ttft", "tts_ttfb", "voice_to_voice")
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class PickupLatencyObserver(BaseObserver):
+    """Records how long a call waits from WebSocket accept until the pipeline is live"""
+
+    def __init__(self, accepted_at: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._accepted_at = accepted_at or time.monotonic()
+        self.pipeline_start: Optional[float] = None
+        self.pickup: Optional[float] = None
+
+    async def on_push_frame(self, data: FramePushed):
+        if self.pipeline_start is None and isinstance(data.frame, StartFrame):
+            self.pipeline_start = time.monotonic() - self._accepted_at
+            pipeline_start_seconds.observe(self.pipeline_start)
+            logger.debug(f"⏱️ Pipeline started {self.pipeline_start * 1000:.0f} ms after accept")
+        elif self.pickup is None and isinstance(data.frame, BotStartedSpeakingFrame):
+            self.pickup = time.monotonic() - self._accepted_at
+            pickup_seconds.observe(self.pickup)
+            logger.info(f"⏱️ First bot audio {self.pickup * 1000:.0f} ms after accept")
+
+
+class CallLatencyObserver(BaseObserver):
+    """Per-call latency for each STT → LLM → TTS stage of every turn
+
+    Measures, per turn:
+        stt: caller stops speaking (VAD) → final transcript
+        llm_ttft: context sent to the LLM → first LLM token
+        tts_ttfb: TTS request started → first TTS audio
+        voice_to_voice: caller stops speaking → bot starts speaking
+    and counts interruptions. Frames are seen at every hop, so each marker only
+    counts the first time a given frame is observed.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.interruptions = 0
+
+        self._seen_ids: Dict[type, int] = {}
+        self._user_stopped: Optional[float] = None
+        self._stt_done = False
+        self._llm_request: Optional[float] = None
+        self._tts_started: Optional[float] = None
+
+    def _first_sighting(self, frame) -> bool:
+        if self._seen_ids.get(type(frame)) == frame.id:
+            return False
+        self._seen_ids[type(frame)] = frame.id
+        return True
+
+    def _record(self, stage: str, seconds: float):
+        seconds = max(0.0, seconds)
+        self.samples[stage].append(seconds)
+        stage_seconds.observe(seconds, labels={"stage": stage})
+
+    async def on_push_frame(self, data: FramePushed):
+        frame = data.frame
+        now = time.monotonic()
+
+        if isinstance(frame, UserStoppedSpeakingFrame):
+            if self._first_sighting(frame):
+                self._user_stopped = now
+                self._stt_done = False
+        elif isinstance(frame, TranscriptionFrame):
+            if self._user_stopped is not None and not self._stt_done and self._first_sighting(frame):
+                self._stt_done = True
+                self._record("stt", now - self._user_stopped)
+        elif isinstance(frame, OpenAILLMContextFrame):
+            # The assistant aggregator also forwards the context once the bot has
+            # replied; only the hop into the LLM is a request.
+            if self._llm_request is None and isinstance(data.destination, LLMService):
+                self._llm_request = now
+        elif isinstance(frame, LLMTextFrame):
+            if self._llm_request is not None:
+                self._record("llm_ttft", now - self._llm_request)
+                self._llm_request = None
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            self._llm_request = None
+        elif isinstance(frame, TTSStartedFrame):
+            if self._tts_started is None and self._first_sighting(frame):
+                self._tts_started = now
+        elif isinstance(frame, TTSAudioRawFrame):
+            if self._tts_started is not None:
+                self._record("tts_ttfb", now - self._tts_started)
+                self._tts_started = None
+        elif isinstance(frame, BotStartedSpeakingFrame):
+            if self._user_stopped is not None:
+                self._record("voice_to_voice", now - self._user_stopped)
+                self._user_stopped = None
+        elif isinstance(frame, StartInterruptionFrame):
+            if self._first_sighting(frame):
+                self.interruptions += 1
+                interruptions_total.inc()
+                # Whatever the bot was generating has been cancelled
+                self._llm_request = None
+                self._tts_started = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage count and p50/p95/p99 in milliseconds, plus interruptions"""
+        stages = {}
+        for stage, values in self.samples.items():
+            stages[stage] = {"count": len(values)}
+            for q in (50, 95, 99):
+                value = percentile(values, q)
+                stages[stage][f"p{q}_ms"] = round(value * 1000, 1) if value is not None else None
+        return {"turns": len(self.samples["voice_to_voice"]), "interruptions": self.interruptions, "stages": stages}
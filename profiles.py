@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+from config import CARTESIA_VOICES, DEFAULT_PROFILE, BotProfile, ConfigSnapshot
+from context_manager import Message, estimate_tokens
+from metrics import get_metrics
+
+profile_calls = get_metrics().counter("profile_calls_total", "Calls started per bot profile")
+profile_compiles = get_metrics().counter("profile_compiles_total", "Bot profiles compiled (cache misses)")
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """A bot profile with everything a call needs from it prepared up front"""
+
+    profile: BotProfile
+    settings_version: int
+    vad_params: VADParams
+    system_message: Message
+    prompt_tokens: int
+    voice_name: str
+
+    @property
+    def name(self) -> str:
+        return self.profile.name
+
+    @property
+    def sample_rate(self) -> int:
+        return self.profile.sample_rate
+
+    def messages(self) -> List[Message]:
+        """A fresh message list for a call's context (the context appends to it)"""
+        return [dict(self.system_message)]
+
+    def configure_vad(self, analyzer: VADAnalyzer) -> VADAnalyzer:
+        """Apply the profile's VAD params to a fresh analyzer from the warm pool"""
+        # set_params needs the sample rate; the transport sets the same rate again at start
+        analyzer.set_sample_rate(self.sample_rate)
+        analyzer.set_params(self.vad_params)
+        return analyzer
+
+
+def compile_profile(profile: BotProfile, settings_version: int) -> CompiledProfile:
+    vad = profile.vad
+    system_message = {"role": "system", "content": profile.system_prompt}
+    return CompiledProfile(
+        profile=profile,
+        settings_version=settings_version,
+        vad_params=VADParams(
+            confidence=vad.confidence,
+            start_secs=vad.start_secs,
+            stop_secs=vad.stop_secs,
+            min_volume=vad.min_volume,
+        ),
+        system_message=system_message,
+        prompt_tokens=estimate_tokens([system_message]),
+        voice_name=CARTESIA_VOICES.get(profile.voice_id, profile.voice_id),
+    )
+
+
+class ProfileCache:
+    """Compiles each bot profile once, so setting up a call's pipeline is a lookup
+
+    Named profiles are fixed for the life of the process. The default profile
+    follows the settings page, so it is cached per settings version.
+    """
+
+    def __init__(self):
+        self._compiled: Dict[Tuple[str, int], CompiledProfile] = {}
+
+    def get(self, name: Optional[str], snapshot: ConfigSnapshot) -> CompiledProfile:
+        profile = snapshot.profile(name)
+        if name and profile.name != name:
+            logger.warning(f"⚠️ Unknown bot profile {name!r}, using the default profile")
+        key = (profile.name, snapshot.version if profile.name == DEFAULT_PROFILE else 0)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            if profile.name == DEFAULT_PROFILE:
+                # New calls read the latest settings, so older versions are done with
+                for stale in [k for k in self._compiled if k[0] == DEFAULT_PROFILE]:
+                    del self._compiled[stale]
+            compiled = compile_profile(profile, snapshot.version)
+            self._compiled[key] = compiled
+            profile_compiles.inc(labels={"profile": profile.name})
+            logger.debug(f"🧩 Compiled bot profile {profile.name} (settings v{snapshot.version})")
+        profile_calls.inc(labels={"profile": compiled.name})
+        return compiled
+
+
+_profile_cache: Optional[ProfileCache] = None
+
+def get_profile_cache() -> ProfileCache:
+    """Get the process-wide compiled profile cache"""
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = ProfileCache()
+    return _profile_cache
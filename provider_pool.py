@@ -0,0 +1,358 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Generic, Optional, Tuple, TypeVar
+
+import httpx
+from deepgram import DeepgramClient, DeepgramClientOptions, LiveTranscriptionEvents
+from loguru import logger
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from websockets.asyncio.client import connect as websocket_connect
+from websockets.protocol import State
+
+from pipecat.frames.frames import EndFrame
+from pipecat.services.cartesia.tts import CartesiaTTSService
+from pipecat.services.deepgram.stt import DeepgramSTTService
+from pipecat.services.openai.llm import OpenAILLMService
+
+from config import get_config
+from metrics import get_metrics
+
+T = TypeVar("T")
+
+CARTESIA_URL = "wss://api.cartesia.ai/tts/websocket"
+CARTESIA_VERSION = "2025-04-16"
+
+provider_handshakes = get_metrics().counter(
+    "provider_handshakes_total", "Provider WebSocket connections opened ahead of calls by the socket pools"
+)
+socket_hits = get_metrics().counter("provider_socket_hits_total", "Calls handed a pre-opened provider socket")
+socket_misses = get_metrics().counter(
+    "provider_socket_misses_total", "Calls that had to open their own provider socket"
+)
+socket_reuses = get_metrics().counter("provider_socket_reuses_total", "Provider sockets returned to a pool after a call")
+sockets_idle = get_metrics().gauge("provider_sockets_idle", "Open provider sockets waiting for a call")
+
+
+class SocketPool(Generic[T]):
+    """Pre-opened provider WebSockets, health-checked and topped up in the background
+
+    acquire() hands out an open socket, or None when none is ready and the
+    caller should connect inline. Sockets that died, or sat idle longer than
+    max_idle (providers close idle streams), are replaced off the call path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Awaitable[T]],
+        is_open: Callable[[T], Awaitable[bool]],
+        close: Callable[[T], Awaitable[Any]],
+        size: int,
+        health_interval: float = 15.0,
+        max_idle: float = 240.0,
+    ):
+        self.name = name
+        self.size = size
+        self.health_interval = health_interval
+        self.max_idle = max_idle
+        self._connect = connect
+        self._is_open = is_open
+        self._close = close
+        self._idle: Deque[Tuple[T, float]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    async def acquire(self) -> Optional[T]:
+        while self._idle:
+            sock, since = self._idle.popleft()
+            if time.monotonic() - since < self.max_idle and await self._is_open(sock):
+                socket_hits.inc(labels={"provider": self.name})
+                self._changed()
+                return sock
+            await self._discard(sock)
+        socket_misses.inc(labels={"provider": self.name})
+        self._changed()
+        return None
+
+    def release(self, sock: T) -> bool:
+        """Return a socket that is still good for another call; False if the pool is full
+
+        Up to twice the pool size may be held, so sockets coming back from calls
+        are kept even though the pool already replaced them when they went out.
+        """
+        if len(self._idle) >= 2 * self.size:
+            return False
+        self._idle.append((sock, time.monotonic()))
+        socket_reuses.inc(labels={"provider": self.name})
+        sockets_idle.set(len(self._idle), labels={"provider": self.name})
+        return True
+
+    def _changed(self):
+        sockets_idle.set(len(self._idle), labels={"provider": self.name})
+        self._wakeup.set()
+
+    def start(self):
+        if self._task is None and self.size > 0:
+            self._task = asyncio.get_running_loop().create_task(self._maintain())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        while self._idle:
+            await self._discard(self._idle.popleft()[0])
+
+    async def _discard(self, sock: T):
+        try:
+            await self._close(sock)
+        except Exception as e:
+            logger.debug(f"Closing {self.name} socket failed: {e}")
+
+    async def _maintain(self):
+        while True:
+            now = time.monotonic()
+            for entry in list(self._idle):
+                sock, since = entry
+                if now - since >= self.max_idle or not await self._is_open(sock):
+                    # acquire() may have taken it while we awaited
+                    if entry in self._idle:
+                        self._idle.remove(entry)
+                        await self._discard(sock)
+            while len(self._idle) < self.size:
+                try:
+                    sock = await self._connect()
+                except Exception as e:
+                    logger.error(f"❌ Failed to pre-open {self.name} socket: {e}")
+                    break
+                provider_handshakes.inc(labels={"provider": self.name})
+                self._idle.append((sock, time.monotonic()))
+            sockets_idle.set(len(self._idle), labels={"provider": self.name})
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.health_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+class PooledOpenAILLMService(OpenAILLMService):
+    """OpenAI LLM service that sends requests through the process-wide client"""
+
+    def __init__(self, client: AsyncOpenAI, **kwargs):
+        self._shared_client = client
+        super().__init__(**kwargs)
+
+    def create_client(self, *args, **kwargs):
+        return self._shared_client
+
+
+class PooledCartesiaTTSService(CartesiaTTSService):
+    """Cartesia TTS service that starts on a pre-opened socket
+
+    A call that ends normally with no synthesis in flight hands its socket back
+    to the pool for the next call.
+    """
+
+    def __init__(self, sockets: SocketPool, **kwargs):
+        super().__init__(**kwargs)
+        self._sockets = sockets
+        self._ended = False
+
+    async def stop(self, frame: EndFrame):
+        self._ended = True
+        await super().stop(frame)
+
+    async def _connect_websocket(self):
+        if self._websocket and self._websocket.state is State.OPEN:
+            return
+        self._websocket = await self._sockets.acquire()
+        if self._websocket is None:
+            await super()._connect_websocket()
+
+    async def _disconnect_websocket(self):
+        websocket = self._websocket
+        if self._ended and websocket and websocket.state is State.OPEN and not self._context_id:
+            await self.stop_all_metrics()
+            self._websocket = None
+            if self._sockets.release(websocket):
+                return
+            self._websocket = websocket
+        await super()._disconnect_websocket()
+
+
+class PooledDeepgramSTTService(DeepgramSTTService):
+    """Deepgram STT service that starts on a pre-opened live transcription stream
+
+    Streams carry the previous caller's audio state, so they are never reused.
+    """
+
+    def __init__(self, sockets: SocketPool, options: Dict[str, Any], **kwargs):
+        super().__init__(**kwargs)
+        self._sockets = sockets
+        self._pool_options = options
+
+    async def _connect(self):
+        # Pooled streams were opened with the pool's options; anything else connects itself
+        connection = await self._sockets.acquire() if self._settings == self._pool_options else None
+        if connection is None:
+            await super()._connect()
+            return
+        logger.debug("Using pre-opened Deepgram stream")
+        self._connection = connection
+        self._connection.on(LiveTranscriptionEvents(LiveTranscriptionEvents.Transcript), self._on_message)
+        self._connection.on(LiveTranscriptionEvents(LiveTranscriptionEvents.Error), self._on_error)
+        if self.vad_enabled:
+            self._connection.on(
+                LiveTranscriptionEvents(LiveTranscriptionEvents.SpeechStarted), self._on_speech_started
+            )
+            self._connection.on(LiveTranscriptionEvents(LiveTranscriptionEvents.UtteranceEnd), self._on_utterance_end)
+
+
+class ProviderPool:
+    """Process-wide provider connections shared by every call
+
+    One keep-alive HTTP pool carries all OpenAI requests (LLM turns and context
+    summaries), and Cartesia and Deepgram WebSockets are opened ahead of calls,
+    so a new call doesn't wait on TLS handshakes and WebSocket upgrades before
+    it can speak. The URLs can point at local mock servers for testing.
+    """
+
+    def __init__(
+        self,
+        tts_sockets: int,
+        stt_sockets: int,
+        http_connections: int,
+        health_interval: float = 15.0,
+        openai_base_url: Optional[str] = None,
+        cartesia_url: str = CARTESIA_URL,
+        deepgram_url: str = "",
+        sample_rate: int = 8000,
+    ):
+        self.cartesia_url = cartesia_url
+        self.deepgram_url = deepgram_url
+        self.openai_base_url = openai_base_url
+        self.http_connections = http_connections
+        self._openai: Optional[AsyncOpenAI] = None
+        self.tts_sockets = SocketPool(
+            "cartesia", self._open_cartesia, _websocket_open, _close_websocket, tts_sockets, health_interval
+        )
+        self.stt_sockets = SocketPool(
+            "deepgram", self._open_deepgram, _deepgram_open, _close_deepgram, stt_sockets, health_interval
+        )
+        # What DeepgramSTTService sends on start() for our 8 kHz calls
+        defaults = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY", "unused"))._settings
+        self.stt_options = {**defaults, "sample_rate": sample_rate}
+
+    @property
+    def openai(self) -> AsyncOpenAI:
+        """The OpenAI client (and keep-alive HTTP pool) every call shares"""
+        if self._openai is None:
+            self._openai = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                base_url=self.openai_base_url,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.http_connections,
+                        max_keepalive_connections=self.http_connections,
+                        keepalive_expiry=None,
+                    )
+                ),
+            )
+        return self._openai
+
+    def start(self):
+        """Begin opening provider sockets in the background"""
+        logger.info(
+            f"🔌 Pre-opening provider sockets ({self.tts_sockets.size} Cartesia, {self.stt_sockets.size} Deepgram)"
+        )
+        try:
+            self.openai
+        except Exception as e:
+            logger.error(f"❌ Failed to create OpenAI client: {e}")
+        self.tts_sockets.start()
+        self.stt_sockets.start()
+
+    async def close(self):
+        await self.tts_sockets.close()
+        await self.stt_sockets.close()
+        if self._openai:
+            await self._openai.close()
+
+    async def _open_cartesia(self):
+        return await websocket_connect(
+            f"{self.cartesia_url}?api_key={os.getenv('CARTESIA_API_KEY')}&cartesia_version={CARTESIA_VERSION}"
+        )
+
+    async def _open_deepgram(self):
+        client = DeepgramClient(
+            os.getenv("DEEPGRAM_API_KEY", ""),
+            config=DeepgramClientOptions(url=self.deepgram_url, options={"keepalive": "true"}),
+        )
+        connection = client.listen.asyncwebsocket.v("1")
+        if not await connection.start(options=self.stt_options):
+            raise ConnectionError("Deepgram refused the stream")
+        return connection
+
+    def llm(self) -> OpenAILLMService:
+        return PooledOpenAILLMService(self.openai, api_key=os.getenv("OPENAI_API_KEY"))
+
+    def stt(self) -> DeepgramSTTService:
+        return PooledDeepgramSTTService(
+            self.stt_sockets, self.stt_options, api_key=os.getenv("DEEPGRAM_API_KEY"), base_url=self.deepgram_url
+        )
+
+    def tts(self, voice_id: str) -> CartesiaTTSService:
+        return PooledCartesiaTTSService(
+            self.tts_sockets,
+            api_key=os.getenv("CARTESIA_API_KEY"),
+            voice_id=voice_id,
+            url=self.cartesia_url,
+            cartesia_version=CARTESIA_VERSION,
+            # Chunking is done by the TextChunker stage in front of TTS
+            aggregate_sentences=False,
+        )
+
+
+async def _websocket_open(websocket) -> bool:
+    return websocket.state is State.OPEN
+
+
+async def _close_websocket(websocket):
+    await websocket.close()
+
+
+async def _deepgram_open(connection) -> bool:
+    return await connection.is_connected()
+
+
+async def _close_deepgram(connection):
+    await connection.finish()
+
+
+_provider_pool: Optional[ProviderPool] = None
+
+def get_provider_pool() -> ProviderPool:
+    """Get the process-wide provider connections, creating them on first use"""
+    global _provider_pool
+    if _provider_pool is None:
+        performance = get_config().config.performance
+        _provider_pool = ProviderPool(
+            tts_sockets=performance.tts_socket_pool_size,
+            stt_sockets=performance.stt_socket_pool_size,
+            http_connections=performance.llm_http_connections,
+            health_interval=performance.provider_health_check_seconds,
+            # Mock provider servers for offline replay (the OpenAI SDK reads OPENAI_BASE_URL itself)
+            cartesia_url=os.getenv("CARTESIA_URL", CARTESIA_URL),
+            deepgram_url=os.getenv("DEEPGRAM_URL", ""),
+        )
+    return _provider_pool
@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import importlib
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from metrics import get_metrics
+
+server_ready = get_metrics().gauge("server_ready", "1 once the call pipeline is loaded and the warm pools are full")
+warm_up_timeouts = get_metrics().counter("warm_up_timeouts_total", "Times the warm pools were still not full after the warm-up timeout")
+startup_seconds = get_metrics().gauge(
+    "startup_seconds", "Seconds from server start to each warm-up stage: loaded, ready"
+)
+
+
+class Readiness:
+    """Loads the call pipeline in the background and reports when the worker can take calls
+
+    Importing pipecat, Silero and the provider SDKs takes seconds, so server.py
+    doesn't do it at import time: the web server comes up straight away and
+    answers liveness checks while start() imports the bot module in a thread,
+    fills the warm pools and opens provider sockets. The worker is ready once
+    every component pool is full; it stays ready after that while calls take
+    components. A pool still short after warm_timeout is logged, reported in
+    status() and its refill restarted, and the wait carries on.
+    """
+
+    def __init__(self, module: str = "bot", poll_interval: float = 0.1, warm_timeout: float = 60.0):
+        self.module = module
+        self.poll_interval = poll_interval
+        self.warm_timeout = warm_timeout
+        self.error: Optional[str] = None
+        self._loaded = asyncio.Event()
+        self._started_at = time.monotonic()
+        self._ready_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready_at is not None
+
+    def start(self):
+        if self._task is None:
+            self._started_at = time.monotonic()
+            self._task = asyncio.get_running_loop().create_task(self._warm_up())
+
+    async def _warm_up(self):
+        logger.info(f"🔥 Loading the call pipeline ({self.module}) in the background")
+        try:
+            await asyncio.to_thread(importlib.import_module, self.module)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            logger.error(f"❌ Failed to load the call pipeline: {self.error}")
+            return
+        self._loaded.set()
+        startup_seconds.set(time.monotonic() - self._started_at, labels={"stage": "loaded"})
+        logger.info(f"📦 Call pipeline loaded in {time.monotonic() - self._started_at:.2f}s")
+
+        from warm_pool import get_component_pools
+
+        pools = get_component_pools()
+        pools.start()
+        timeout_at = time.monotonic() + self.warm_timeout
+        while not pools.warm():
+            if time.monotonic() >= timeout_at:
+                short = {name: pool for name, pool in pools.status().items() if pool["ready"] < pool["size"]}
+                self.error = f"warm pools not full after {time.monotonic() - self._started_at:.0f}s: {short}"
+                logger.error(f"❌ {self.error} - retrying")
+                warm_up_timeouts.inc()
+                for pool in pools.pools.values():
+                    pool.refill()
+                timeout_at = time.monotonic() + self.warm_timeout
+            await asyncio.sleep(self.poll_interval)
+        self.error = None
+        self._ready_at = time.monotonic()
+        server_ready.set(1)
+        startup_seconds.set(self._ready_at - self._started_at, labels={"stage": "ready"})
+        logger.info(f"✅ Ready for calls {self._ready_at - self._started_at:.2f}s after start")
+
+    async def wait_loaded(self):
+        """Wait until the call pipeline can be imported without blocking the event loop"""
+        self.start()
+        while not self._loaded.is_set():
+            if self.error:
+                raise RuntimeError(f"Call pipeline failed to load: {self.error}")
+            try:
+                await asyncio.wait_for(self._loaded.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def status(self) -> Dict[str, Any]:
+        now = self._ready_at or time.monotonic()
+        status: Dict[str, Any] = {
+            "ready": self.ready,
+            "loaded": self.loaded,
+            "seconds": round(now - self._started_at, 3),
+        }
+        if self.error:
+            status["error"] = self.error
+        if self.loaded:
+            from warm_pool import get_component_pools
+
+            status["pools"] = get_component_pools().status()
+        return status
+
+    async def close(self):
+        """Stop warming up and release what the warm-up created"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self.loaded:
+            from warm_pool import get_component_pools
+
+            await get_component_pools().close()
+        # Only a loaded pipeline can have recorded calls
+        if "recorder" in sys.modules:
+            from recorder import get_recording_writer
+
+            get_recording_writer().close()
+
+
+_readiness: Optional[Readiness] = None
+
+def get_readiness() -> Readiness:
+    """Get the process-wide readiness tracker"""
+    global _readiness
+    if _readiness is None:
+        _readiness = Readiness()
+    return _readiness
@@ -0,0 +1,349 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import json
+import os
+import re
+import struct
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    BotStoppedSpeakingFrame,
+    InputAudioRawFrame,
+    OutputAudioRawFrame,
+    TranscriptionFrame,
+    TTSTextFrame,
+    UserStartedSpeakingFrame,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from audio_codec import ulaw_encode
+from config import get_config
+from metrics import get_metrics
+
+SAMPLE_RATE = 8000
+CALLER, BOT = 0, 1
+ULAW_SILENCE = ulaw_encode(b"\x00\x00")
+# Gaps shorter than this are network jitter, not silence, and are closed up
+GAP_TOLERANCE = int(0.2 * SAMPLE_RATE)
+# A leg that has sent nothing for this long is padded with silence so the other can be written
+MAX_LEG_SKEW = SAMPLE_RATE
+WAV_HEADER_SIZE = 58
+
+recorded_seconds = get_metrics().counter("recording_audio_seconds_total", "Call audio written to recordings, per leg")
+dropped_frames = get_metrics().counter(
+    "recording_dropped_frames_total", "Audio frames dropped because the recording buffer was full"
+)
+buffered_frames = get_metrics().gauge("recording_buffer_frames", "Audio frames waiting for the recording writer")
+
+
+def _wav_header(data_bytes: int) -> bytes:
+    """Stereo 8 kHz μ-law WAV header (with the fact chunk non-PCM formats need)"""
+    return (
+        b"RIFF" + struct.pack("<I", WAV_HEADER_SIZE - 8 + data_bytes) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHHH", 18, 7, 2, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 8, 0)
+        + b"fact" + struct.pack("<II", 4, data_bytes // 2)
+        + b"data" + struct.pack("<I", data_bytes)
+    )
+
+
+class Recording:
+    """One call's recording, as handed between the event loop and the writer thread"""
+
+    def __init__(self, call_id: str, wav_path: str, transcript_path: str):
+        self.call_id = call_id
+        self.wav_path = wav_path
+        self.transcript_path = transcript_path
+        self.dropped = 0
+        # Owned by the writer thread
+        self.wav = None
+        self.transcript = None
+        self.pending: List[bytearray] = [bytearray(), bytearray()]
+        self.cursor = [0, 0]
+        self.data_bytes = 0
+
+
+class RecordingWriter:
+    """One background thread writing every call's recording and transcript
+
+    The event loop only appends to a bounded buffer. The writer thread drains
+    it, lines both legs up on the call's clock and appends stereo μ-law audio
+    (caller left, bot right) and JSONL transcript lines, keeping the WAV header
+    valid after every batch so a recording can be read while the call is live.
+    When the buffer is full, drop_policy "oldest" discards the oldest queued
+    audio and "newest" the incoming audio. Transcript lines are never dropped.
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/recordings",
+        capacity: int = 20000,
+        drop_policy: str = "oldest",
+        flush_interval: float = 0.25,
+    ):
+        self.directory = directory
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self._items: Deque[list] = deque()
+        self._audio: Deque[list] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="recording-writer", daemon=True)
+        self._thread.start()
+
+    def paths(self, call_id: str) -> Optional[Dict[str, str]]:
+        """Where a call's recording and transcript live (None for an unsafe id)"""
+        if not re.fullmatch(r"[\w-]+", call_id or ""):
+            return None
+        base = os.path.join(self.directory, call_id)
+        return {"recording": f"{base}.wav", "transcript": f"{base}.jsonl"}
+
+    def open(self, call_id: str) -> Optional[Recording]:
+        paths = self.paths(call_id)
+        if paths is None:
+            return None
+        recording = Recording(call_id, paths["recording"], paths["transcript"])
+        self._put(["open", recording])
+        return recording
+
+    def audio(self, recording: Recording, leg: int, offset: float, pcm: bytes):
+        """Queue 8 kHz 16-bit audio that started offset seconds into the call"""
+        self._put(["audio", recording, leg, offset, pcm], audio=True)
+
+    def transcript(self, recording: Recording, line: Dict[str, Any]):
+        self._put(["text", recording, line])
+
+    def close_recording(self, recording: Recording):
+        self._put(["close", recording])
+
+    def _put(self, item: list, audio: bool = False):
+        with self._lock:
+            if audio:
+                if len(self._audio) >= self.capacity:
+                    if self.drop_policy == "newest":
+                        self._drop(item)
+                        return
+                    self._drop(self._audio.popleft())
+                self._audio.append(item)
+            self._items.append(item)
+        self._wakeup.set()
+
+    def _drop(self, item: list):
+        # The writer skips emptied items; the alignment pads their time with silence
+        item[4] = None
+        item[1].dropped += 1
+        dropped_frames.inc(labels={"policy": self.drop_policy})
+
+    def close(self):
+        """Write out everything queued and stop the writer thread"""
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5.0)
+
+    # Writer thread
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            with self._lock:
+                buffered_frames.set(len(self._audio))
+                batch = list(self._items)
+                self._items.clear()
+                self._audio.clear()
+            touched = {}
+            for item in batch:
+                try:
+                    self._apply(item)
+                    touched[id(item[1])] = item[1]
+                except Exception as e:
+                    logger.error(f"❌ Recording write failed for {item[1].call_id}: {e}")
+            for recording in touched.values():
+                if recording.wav:
+                    self._flush(recording)
+            if self._closed and not self._items:
+                break
+
+    def _apply(self, item: list):
+        kind, recording = item[0], item[1]
+        if kind == "open":
+            os.makedirs(os.path.dirname(recording.wav_path) or ".", exist_ok=True)
+            recording.wav = open(recording.wav_path, "wb")
+            recording.wav.write(_wav_header(0))
+            recording.transcript = open(recording.transcript_path, "a", encoding="utf-8")
+        elif recording.wav is None:
+            return
+        elif kind == "audio" and item[4] is not None:
+            self._append(recording, item[2], item[3], item[4])
+        elif kind == "text":
+            recording.transcript.write(json.dumps(item[2], ensure_ascii=False) + "\n")
+        elif kind == "close":
+            longest = max(recording.cursor)
+            for leg in (CALLER, BOT):
+                self._pad(recording, leg, longest)
+            self._flush(recording)
+            recording.wav.close()
+            recording.transcript.close()
+            recording.wav = recording.transcript = None
+
+    def _pad(self, recording: Recording, leg: int, position: int):
+        if position > recording.cursor[leg]:
+            recording.pending[leg] += ULAW_SILENCE * (position - recording.cursor[leg])
+            recording.cursor[leg] = position
+
+    def _append(self, recording: Recording, leg: int, offset: float, pcm: bytes):
+        position = int(offset * SAMPLE_RATE)
+        if position - recording.cursor[leg] > GAP_TOLERANCE:
+            self._pad(recording, leg, position)
+        ulaw = ulaw_encode(pcm)
+        recording.pending[leg] += ulaw
+        recording.cursor[leg] += len(ulaw)
+        recorded_seconds.inc(len(ulaw) / SAMPLE_RATE, labels={"leg": "caller" if leg == CALLER else "bot"})
+
+    def _flush(self, recording: Recording):
+        # Pad a leg that went quiet so the other leg isn't held back indefinitely
+        horizon = max(recording.cursor) - MAX_LEG_SKEW
+        for leg in (CALLER, BOT):
+            self._pad(recording, leg, horizon)
+        caller, bot = recording.pending
+        samples = min(len(caller), len(bot))
+        if samples:
+            stereo = bytearray(samples * 2)
+            stereo[0::2] = caller[:samples]
+            stereo[1::2] = bot[:samples]
+            del caller[:samples], bot[:samples]
+            recording.wav.write(stereo)
+            recording.data_bytes += len(stereo)
+            # Keep the header valid so the file can be fetched mid-call
+            end = recording.wav.tell()
+            recording.wav.seek(0)
+            recording.wav.write(_wav_header(recording.data_bytes))
+            recording.wav.seek(end)
+        recording.wav.flush()
+        recording.transcript.flush()
+
+
+class CallRecorder(BaseObserver):
+    """Taps a call's pipeline for its recording and timestamped transcript
+
+    Records caller audio as it leaves the input transport and bot audio as the
+    output transport sends it, plus the caller's transcriptions and the words
+    the bot actually spoke. Observers run off the audio path, and all file I/O
+    happens on the RecordingWriter thread.
+    """
+
+    def __init__(
+        self,
+        call_id: str,
+        input: FrameProcessor,
+        output: FrameProcessor,
+        stt: FrameProcessor,
+        writer: Optional["RecordingWriter"] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._writer = writer or get_recording_writer()
+        self._recording = self._writer.open(call_id)
+        self._input = input
+        self._output = output
+        self._stt = stt
+        self._start_ns: Optional[int] = None
+        self._last_offset = 0.0
+        self._bot_words: List[str] = []
+        self._bot_started: Optional[float] = None
+        self._seconds = [0.0, 0.0]
+
+    def _offset(self, data: FramePushed) -> float:
+        if self._start_ns is None:
+            self._start_ns = data.timestamp
+        self._last_offset = (data.timestamp - self._start_ns) / 1e9
+        return self._last_offset
+
+    async def on_push_frame(self, data: FramePushed):
+        if self._recording is None:
+            return
+        frame = data.frame
+        # Frames are seen at every hop; only their first hop out of each source counts
+        if isinstance(frame, InputAudioRawFrame) and data.source is self._input:
+            duration = len(frame.audio) / 2 / frame.sample_rate
+            self._audio(CALLER, max(0.0, self._offset(data) - duration), frame)
+        elif (
+            isinstance(frame, OutputAudioRawFrame)
+            and data.source is self._output
+            and data.direction == FrameDirection.DOWNSTREAM
+        ):
+            offset = self._offset(data)
+            if self._bot_words and self._bot_started is None:
+                self._bot_started = offset
+            self._audio(BOT, offset, frame)
+        elif isinstance(frame, TranscriptionFrame) and data.source is self._stt:
+            self._flush_bot_line()
+            self._line(self._offset(data), "caller", frame.text)
+        elif isinstance(frame, TTSTextFrame) and data.source is self._output:
+            if not self._bot_words:
+                self._bot_started = self._offset(data)
+            self._bot_words.append(frame.text)
+        elif isinstance(frame, (BotStoppedSpeakingFrame, UserStartedSpeakingFrame)):
+            self._flush_bot_line()
+
+    def bot_said(self, text: str):
+        """Transcribe bot speech that plays without text frames (cached audio)"""
+        self._flush_bot_line()
+        self._bot_words = [text]
+        self._bot_started = None
+
+    def _audio(self, leg: int, offset: float, frame):
+        if frame.sample_rate != SAMPLE_RATE:
+            return
+        self._seconds[leg] += len(frame.audio) / 2 / SAMPLE_RATE
+        self._writer.audio(self._recording, leg, offset, frame.audio)
+
+    def _line(self, offset: float, role: str, text: str):
+        self._writer.transcript(self._recording, {"t": round(offset, 2), "role": role, "text": text})
+
+    def _flush_bot_line(self):
+        if self._bot_words:
+            offset = self._bot_started if self._bot_started is not None else self._last_offset
+            self._line(offset, "bot", " ".join(w.strip() for w in self._bot_words if w.strip()))
+            self._bot_words = []
+
+    def close(self):
+        if self._recording:
+            self._flush_bot_line()
+            self._writer.close_recording(self._recording)
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if self._recording is None:
+            return None
+        return {
+            "caller_seconds": round(self._seconds[CALLER], 1),
+            "bot_seconds": round(self._seconds[BOT], 1),
+            "dropped_frames": self._recording.dropped,
+        }
+
+
+_recording_writer: Optional[RecordingWriter] = None
+
+def get_recording_writer() -> RecordingWriter:
+    """Get the process-wide recording writer"""
+    global _recording_writer
+    if _recording_writer is None:
+        performance = get_config().config.performance
+        _recording_writer = RecordingWriter(
+            os.getenv("RECORDINGS_DIR", "data/recordings"),
+            capacity=performance.recording_buffer_frames,
+            drop_policy=performance.recording_drop_policy,
+        )
+    return _recording_writer
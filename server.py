@@ -5,62 +5,125 @@
 #
 
 import argparse
+import asyncio
+import binascii
 import json
+import math
 import os
+import signal
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlencode
 
 import uvicorn
-import plivo
-from bot import run_bot
+from admission import ACCEPT, QUEUE, get_admission_controller, parse_queued_since
+from call_history import decode_cursor, get_history_store
+from call_store import WORKER_ID, configure_call_store, get_call_store
+from dialer import DialResult, PlivoDialer, parse_numbers
 from fastapi import FastAPI, WebSocket, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from loguru import logger
 from starlette.responses import HTMLResponse
 from dotenv import load_dotenv
-from config import get_config, CARTESIA_VOICES, PROMPT_TEMPLATES
+from config import get_config, ConfigSnapshot, BOT_PROFILES, CARTESIA_VOICES, DEFAULT_PROFILE, PROMPT_TEMPLATES
+from logging_setup import configure_logging
+from loop_monitor import get_loop_monitor
+from metrics import get_metrics
+from readiness import get_readiness
+from sessions import DRAIN_KEY, get_session_registry
+from stream_xml import get_answer_xml, get_busy_xml, get_hold_xml, get_redirect_xml, invalidate_answer_xml
+from timer_wheel import call_timeouts, get_timer_wheel
+from webhooks import (
+    NONCE_HEADER,
+    SIGNATURE_HEADER,
+    get_signature_validator,
+    get_webhook_processor,
+    webhook_ack_seconds,
+    webhook_events,
+)
 
 load_dotenv()
 
-# Configure detailed logging
-logger.remove()
-logger.add("chatbot.log", rotation="1 MB", level="DEBUG")
-logger.add(lambda msg: print(f"🔍 {msg}", end=""), level="DEBUG")
+# Configure batched structured logging with per-module levels
+configure_logging(get_config().get_logging_config())
 
 logger.info("🚀 Starting Plivo Outbound AI Chatbot")
 
-# Auto-update streams.xml with server URL
-def update_streams_xml():
-    """Update streams.xml with the SERVER_URL from .env"""
-    server_url = os.getenv("SERVER_URL")
-    if not server_url:
-        logger.warning("⚠️ SERVER_URL not set in .env - streams.xml may need manual update")
-        return False
-    
-    template_path = "templates/streams.xml.template"
-    output_path = "templates/streams.xml"
-    
-    try:
-        with open(template_path, 'r') as f:
-            content = f.read()
-        
-        updated_content = content.replace('<your server url>', server_url)
-        
-        with open(output_path, 'w') as f:
-            f.write(updated_content)
-        
-        logger.info(f"✅ Updated streams.xml with WebSocket URL: wss://{server_url}/ws")
-        return True
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to update streams.xml: {e}")
-        return False
+# Initialize Plivo dialer for outbound calls
+plivo_auth_id = os.getenv("PLIVO_AUTH_ID")
+plivo_auth_token = os.getenv("PLIVO_AUTH_TOKEN")
 
-# Update streams.xml on startup
-update_streams_xml()
+logger.info(f"🔑 Plivo Auth ID: {plivo_auth_id}")
+logger.info(f"🔑 Plivo Auth Token: {'*' * (len(plivo_auth_token) - 4) + plivo_auth_token[-4:] if plivo_auth_token else 'NOT SET'}")
 
-app = FastAPI()
+dialer = PlivoDialer(
+    auth_id=plivo_auth_id,
+    auth_token=plivo_auth_token,
+    concurrency=get_config().get_dial_concurrency(),
+    rate_per_second=get_config().get_dial_rate(),
+)
+
+async def record_dialed(result: DialResult):
+    """Record a dialed call in the shared call state store and call history"""
+    if result.success and result.call_uuid:
+        await get_call_store().update(
+            result.call_uuid, status="dialing", phone=result.phone, caller_id=result.caller_id
+        )
+        get_history_store().record(
+            result.call_uuid, "dialed", request_uuid=result.call_uuid, phone=result.phone, caller_id=result.caller_id
+        )
+    else:
+        get_history_store().record(
+            uuid.uuid4().hex, "dial_failed", phone=result.phone, caller_id=result.caller_id, error=result.error
+        )
+
+dialer.on_dialed = record_dialed
+
+def on_config_reload(old: ConfigSnapshot, new: ConfigSnapshot):
+    """Apply settings another worker changed (called from the config watcher thread)"""
+    if old.config.logging != new.config.logging:
+        configure_logging(new.config.logging)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await dialer.start()
+    logger.info(f"✅ Plivo dialer initialized on worker {WORKER_ID}")
+    # Pipecat and the provider SDKs load in the background; /readyz reports when they're warm
+    get_readiness().start()
+    get_loop_monitor().start()
+    get_timer_wheel().start()
+    get_webhook_processor().start()
+    get_call_store().start_sweeping()
+    get_session_registry().start_watching()
+    if not get_signature_validator().enabled:
+        logger.warning("⚠️ Plivo webhook signatures are not checked (PLIVO_AUTH_TOKEN unset or PLIVO_VERIFY_SIGNATURES=false)")
+    get_config().add_listener(on_config_reload)
+    get_config().start_watching()
+    if hasattr(signal, "SIGUSR1"):
+        # kill -USR1 <worker pid> drains every worker ahead of a restart (the uvicorn
+        # parent does not forward it; use POST /api/drain when running --workers N)
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGUSR1, lambda: asyncio.create_task(get_session_registry().request_drain("SIGUSR1"))
+        )
+    if not os.getenv("SERVER_URL"):
+        logger.warning("⚠️ SERVER_URL not set in .env - answer XML will point at a placeholder URL")
+    yield
+    await get_session_registry().stop_watching()
+    await get_loop_monitor().stop()
+    await get_timer_wheel().stop()
+    await dialer.close()
+    await get_readiness().close()
+    await get_webhook_processor().close()
+    await get_call_store().close()
+    get_history_store().close()
+    get_config().close()
+
+app = FastAPI(lifespan=lifespan)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -76,82 +139,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Plivo client for outbound calls
-plivo_auth_id = os.getenv("PLIVO_AUTH_ID")
-plivo_auth_token = os.getenv("PLIVO_AUTH_TOKEN")
-
-logger.info(f"🔑 Plivo Auth ID: {plivo_auth_id}")
-logger.info(f"🔑 Plivo Auth Token: {'*' * (len(plivo_auth_token) - 4) + plivo_auth_token[-4:] if plivo_auth_token else 'NOT SET'}")
-
-plivo_client = plivo.RestClient(
-    auth_id=plivo_auth_id,
-    auth_token=plivo_auth_token
-)
-
-logger.info("✅ Plivo client initialized")
+def get_webhook_urls():
+    """Answer and hangup webhook URLs for outbound calls"""
+    server_url = os.getenv("SERVER_URL", "your-ngrok-url.ngrok.io")
+    return f"https://{server_url}/answer", f"https://{server_url}/hangup"
 
 @app.get("/")
 async def home(request: Request):
     """Modern web interface to initiate outbound calls"""
-    logger.info("📱 Loading modern web interface")
+    logger.debug("📱 Loading modern web interface")
     config = get_config()
     
     return templates.TemplateResponse("index.html", {
         "request": request,
         "default_caller_id": config.get_caller_id(),
-        "default_target_number": config.get_target_number()
+        "default_target_number": config.get_target_number(),
+        "profiles": list(BOT_PROFILES),
     })
 
+def unknown_profile(profile: Optional[str]) -> Optional[str]:
+    """An error message if a requested bot profile doesn't exist"""
+    if profile and profile != DEFAULT_PROFILE and profile not in BOT_PROFILES:
+        return f"Unknown bot profile {profile!r} (available: {', '.join([DEFAULT_PROFILE, *BOT_PROFILES])})"
+    return None
+
 @app.post("/make-call")
-async def make_outbound_call(request: Request, phone: str = Form(...), caller_id: str = Form(...)):
-    """Initiate an outbound call using Plivo API"""
-    logger.info("🚀 STARTING OUTBOUND CALL")
-    logger.info(f"📞 Target Number: {phone}")
-    logger.info(f"🆔 Caller ID: {caller_id}")
+async def make_outbound_call(
+    request: Request, phone: str = Form(...), caller_id: str = Form(...), profile: Optional[str] = Form(None)
+):
+    """Initiate an outbound call using Plivo API, optionally with a named bot profile"""
+    if get_session_registry().draining:
+        logger.warning(f"🚰 Refusing call to {phone} - server is draining")
+        return templates.TemplateResponse("call_error.html", {
+            "request": request,
+            "phone": phone,
+            "caller_id": caller_id,
+            "error": "Server is restarting - please try again in a moment"
+        }, status_code=503)
+
+    error = unknown_profile(profile)
+    if error:
+        return templates.TemplateResponse("call_error.html", {
+            "request": request,
+            "phone": phone,
+            "caller_id": caller_id,
+            "error": error
+        }, status_code=400)
+
+    logger.info(f"🚀 Starting outbound call to {phone} from {caller_id} (profile {profile or DEFAULT_PROFILE})")
     
-    try:
-        # Get the server URL
-        server_url = os.getenv("SERVER_URL", "your-ngrok-url.ngrok.io")
-        logger.info(f"🌐 Server URL: {server_url}")
-        
-        answer_url = f"https://{server_url}/answer"
-        hangup_url = f"https://{server_url}/hangup"
-        
-        logger.info(f"🔗 Answer URL: {answer_url}")
-        logger.info(f"🔗 Hangup URL: {hangup_url}")
-        
-        # Make the outbound call
-        logger.info("📡 Making Plivo API call...")
-        response = plivo_client.calls.create(
-            from_=caller_id,
-            to_=phone,
-            answer_url=answer_url,
-            answer_method='POST',
-            hangup_url=hangup_url,
-            hangup_method='POST'
-        )
-        
-        logger.info("✅ CALL INITIATED SUCCESSFULLY!")
-        
-        # Log the full response to see its structure
-        logger.info(f"📊 API Response type: {type(response)}")
-        logger.info(f"📊 API Response dir: {dir(response)}")
-        logger.info(f"📊 API Response: {response}")
-        
-        # Try to get call UUID - different ways Plivo might return it
-        call_uuid = None
-        if hasattr(response, 'call_uuid'):
-            call_uuid = response.call_uuid
-        elif hasattr(response, 'request_uuid'):
-            call_uuid = response.request_uuid
-        elif hasattr(response, 'uuid'):
-            call_uuid = response.uuid
-        elif hasattr(response, 'message_uuid'):
-            call_uuid = response.message_uuid
-        else:
-            call_uuid = "Generated successfully"
-            
-        logger.info(f"🆔 Call UUID: {call_uuid}")
+    answer_url, hangup_url = get_webhook_urls()
+    if profile and profile != DEFAULT_PROFILE:
+        # Carried through the answer webhook to the stream URL, where /ws picks it up
+        answer_url += "?" + urlencode({"profile": profile})
+    logger.debug(f"🔗 Answer URL: {answer_url} Hangup URL: {hangup_url}")
+
+    # Dial through the async pool so live audio streams never wait on the Plivo API
+    result = await dialer.dial(phone, caller_id, answer_url, hangup_url)
+
+    if result.success:
+        call_uuid = result.call_uuid or "Generated successfully"
+        logger.info(f"✅ CALL INITIATED SUCCESSFULLY! UUID: {call_uuid} ({result.elapsed_ms:.0f} ms)")
         
         return templates.TemplateResponse("call_success.html", {
             "request": request,
@@ -159,30 +207,196 @@ async def make_outbound_call(request: Request, phone: str = Form(...), caller_id
             "caller_id": caller_id,
             "call_uuid": call_uuid
         })
-        
+
+    logger.error(f"❌ CALL FAILED: {result.error}")
+    return templates.TemplateResponse("call_error.html", {
+        "request": request,
+        "phone": phone,
+        "caller_id": caller_id,
+        "error": result.error
+    })
+
+@app.post("/api/campaigns")
+async def create_campaign(request: Request):
+    """Start a bulk dialing campaign and stream its progress as NDJSON
+
+    Accepts JSON ({"numbers": [...], "caller_id": "...", "profile": "..."}), a raw
+    CSV body or a multipart upload with a "file" field. The bot profile can also
+    be given as params.profile, a "profile" form field or ?profile=. Pass
+    ?stream=false to return immediately.
+    """
+    if get_session_registry().draining:
+        return JSONResponse({"status": "error", "message": "Server is draining"}, status_code=503)
+
+    content_type = request.headers.get("content-type", "")
+    params = {}
+    try:
+        if content_type.startswith("application/json"):
+            data = await request.json()
+            numbers = [str(n).strip() for n in data.get("numbers", []) if str(n).strip()]
+            caller_id = data.get("caller_id")
+            params = {k: str(v) for k, v in data.get("params", {}).items()}
+            if data.get("profile"):
+                params["profile"] = str(data["profile"])
+        elif content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            numbers = parse_numbers((await upload.read()).decode("utf-8")) if upload else []
+            caller_id = form.get("caller_id")
+            if form.get("profile"):
+                params["profile"] = str(form.get("profile"))
+        else:
+            numbers = parse_numbers((await request.body()).decode("utf-8"))
+            caller_id = request.query_params.get("caller_id")
     except Exception as e:
-        logger.error(f"❌ CALL FAILED: {str(e)}")
-        logger.error(f"📊 Exception details: {type(e).__name__}")
-        
-        return templates.TemplateResponse("call_error.html", {
-            "request": request,
-            "phone": phone,
-            "caller_id": caller_id,
-            "error": str(e)
-        })
+        logger.error(f"❌ Invalid campaign payload: {e}")
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
+
+    if not numbers:
+        return JSONResponse({"status": "error", "message": "No phone numbers provided"}, status_code=400)
+    if request.query_params.get("profile") and "profile" not in params:
+        params["profile"] = request.query_params["profile"]
+    error = unknown_profile(params.get("profile"))
+    if error:
+        return JSONResponse({"status": "error", "message": error}, status_code=400)
+
+    answer_url, hangup_url = get_webhook_urls()
+    if params:
+        answer_url += "?" + urlencode(sorted(params.items()))
+    campaign = dialer.create_campaign(
+        numbers,
+        caller_id or get_config().get_caller_id(),
+        answer_url,
+        hangup_url,
+        params=params,
+    )
+
+    if request.query_params.get("stream", "true").lower() == "false":
+        return JSONResponse(campaign.to_dict(), status_code=202)
+
+    progress = dialer.progress(campaign.campaign_id)
+
+    async def stream_progress():
+        async for event in progress:
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(stream_progress(), media_type="application/x-ndjson")
+
+@app.get("/api/campaigns/{campaign_id}")
+async def get_campaign(campaign_id: str):
+    """Get the progress counters for a campaign"""
+    campaign = dialer.campaigns.get(campaign_id)
+    if campaign is None:
+        return JSONResponse({"status": "error", "message": "Campaign not found"}, status_code=404)
+    return JSONResponse(campaign.to_dict())
+
+async def read_webhook(request: Request) -> Optional[Dict[str, str]]:
+    """Plivo's webhook params, or None if the request isn't signed by Plivo"""
+    params = {key: str(value) for key, value in (await request.form()).items()}
+    validator = get_signature_validator()
+    if validator.enabled:
+        # Plivo signs the public URL it called, not the one behind our proxy
+        server_url = os.getenv("SERVER_URL")
+        url = str(request.url.replace(scheme="https", netloc=server_url)) if server_url else str(request.url)
+        signature = request.headers.get(SIGNATURE_HEADER)
+        if not validator.validate(request.method, url, params, request.headers.get(NONCE_HEADER), signature):
+            logger.warning(f"🚫 Rejecting {request.url.path} webhook with a bad Plivo signature")
+            webhook_events.inc(labels={"event": request.url.path.strip("/"), "result": "invalid_signature"})
+            return None
+    return params
 
 @app.post("/answer")
-async def answer_call():
+async def answer_call(request: Request):
     """Handle when outbound call is answered - return XML to start streaming"""
-    logger.info("📞 OUTBOUND CALL ANSWERED!")
-    logger.info("🎵 Returning stream XML to start audio streaming")
-    
+    received = time.perf_counter()
+    form = await read_webhook(request)
+    if form is None:
+        return PlainTextResponse("Invalid signature", status_code=403)
+    call_uuid = form.get("CallUUID")
+    request_uuid = form.get("RequestUUID")
+    dedupe_key = request_uuid or call_uuid
+    events = get_webhook_processor()
+    params = dict(request.query_params)
+    queued_since = parse_queued_since(params.pop("queued_since", None))
+    logger.info(f"📞 Outbound call answered: {call_uuid}")
+    if get_session_registry().draining:
+        redirect_url = os.getenv("DRAIN_REDIRECT_URL")
+        if redirect_url:
+            # Hand the call to a sibling instance; Plivo re-posts the answer webhook there
+            logger.info(f"↪️ Draining - redirecting call {call_uuid} to {redirect_url}")
+            await events.submit("redirected", call_uuid, history={"worker": WORKER_ID, "url": redirect_url})
+            return xml_response(get_redirect_xml(redirect_url, params), received)
+        # Nowhere to send it, and this worker is shutting down
+        logger.warning(f"🚫 Draining - turning away call {call_uuid}")
+        await events.submit(
+            "rejected",
+            call_uuid,
+            state={"status": "rejected"},
+            history={"reason": "draining"},
+            dedupe_key=dedupe_key,
+        )
+        return xml_response(get_busy_xml(), received)
+    if call_uuid and await events.seen("answered", dedupe_key):
+        # Plivo retried an answer this or another worker already accepted: same XML, no second slot
+        logger.info(f"🔁 Repeated answer webhook for {call_uuid}")
+        webhook_events.inc(labels={"event": "answered", "result": "duplicate"})
+        return xml_response(get_answer_xml(params), received)
+    if call_uuid:
+        # Hold or turn away the call rather than degrade the calls already running
+        admission = get_admission_controller().admit(call_uuid, queued_since)
+        if admission.decision == QUEUE:
+            if queued_since is None:
+                await events.submit(
+                    "queued",
+                    call_uuid,
+                    state={"status": "queued", "request_uuid": request_uuid},
+                    history={"reason": admission.reason},
+                    dedupe_key=dedupe_key,
+                )
+            retry_url = get_webhook_urls()[0] + "?" + urlencode(
+                sorted({**params, "queued_since": f"{admission.queued_since:.3f}"}.items())
+            )
+            hold_seconds = get_config().config.performance.admission_hold_seconds
+            return xml_response(get_hold_xml(retry_url, hold_seconds, first=queued_since is None), received)
+        if admission.decision != ACCEPT:
+            await events.submit(
+                "rejected",
+                call_uuid,
+                state={"status": "rejected"},
+                history={"reason": admission.reason},
+                dedupe_key=dedupe_key,
+            )
+            return xml_response(get_busy_xml(), received)
+
+        answered = await events.submit(
+            "answered",
+            call_uuid,
+            state={
+                "status": "answered",
+                "request_uuid": request_uuid,
+                "phone": form.get("To"),
+                "caller_id": form.get("From"),
+                "answered_by": WORKER_ID,
+                "profile": params.get("profile", DEFAULT_PROFILE),
+            },
+            history={
+                "request_uuid": request_uuid,
+                "phone": form.get("To"),
+                "caller_id": form.get("From"),
+                "profile": params.get("profile", DEFAULT_PROFILE),
+            },
+            dedupe_key=dedupe_key,
+        )
+        if not answered:
+            # A concurrent delivery of the same answer got there first; its stream takes the slot
+            get_admission_controller().release(call_uuid)
     try:
-        xml_content = open("templates/streams.xml").read()
-        logger.info(f"📋 Stream XML content: {xml_content}")
-        return HTMLResponse(content=xml_content, media_type="application/xml")
+        # Query params on the answer URL (e.g. campaign, profile) are passed through to /ws
+        xml_content = get_answer_xml(params)
+        logger.debug(f"📋 Stream XML content: {xml_content}")
+        return xml_response(xml_content, received)
     except Exception as e:
-        logger.error(f"❌ Failed to read streams.xml: {e}")
+        logger.error(f"❌ Failed to render stream XML: {e}")
         # Fallback XML
         fallback_xml = """<?xml version="1.0" encoding="UTF-8"?>
 <Response>
@@ -190,11 +404,50 @@ async def answer_call():
 </Response>"""
         return HTMLResponse(content=fallback_xml, media_type="application/xml")
 
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Plivo's call Duration in seconds, or None if missing or malformed"""
+    try:
+        duration = float(value)
+    except (TypeError, ValueError):
+        return None
+    return duration if math.isfinite(duration) and duration >= 0 else None
+
 @app.post("/hangup")
-async def hangup_call():
+async def hangup_call(request: Request):
     """Handle call hangup events"""
-    logger.info("📴 CALL ENDED - Hangup received")
-    return HTMLResponse(content="<Response></Response>", media_type="application/xml")
+    received = time.perf_counter()
+    form = await read_webhook(request)
+    if form is None:
+        return PlainTextResponse("Invalid signature", status_code=403)
+    call_uuid = form.get("CallUUID")
+    logger.info(f"📴 Call ended: {call_uuid} ({form.get('HangupCause')})")
+    await get_webhook_processor().submit(
+        "hangup",
+        call_uuid,
+        state={
+            "status": "completed",
+            "request_uuid": form.get("RequestUUID"),
+            "hangup_cause": form.get("HangupCause"),
+            "duration": form.get("Duration"),
+            "hangup_by": WORKER_ID,
+        },
+        history={
+            # Merges a dialed call that was never answered into its RequestUUID row
+            "request_uuid": form.get("RequestUUID"),
+            "hangup_cause": form.get("HangupCause"),
+            "hangup_source": form.get("HangupSource"),
+            "duration": parse_duration(form.get("Duration")),
+            "bill_duration": form.get("BillDuration"),
+            "bill_rate": form.get("BillRate"),
+            "total_cost": form.get("TotalCost"),
+        },
+        dedupe_key=form.get("RequestUUID") or call_uuid,
+    )
+    return xml_response("<Response></Response>", received)
+
+def xml_response(content: str, received: float) -> HTMLResponse:
+    webhook_ack_seconds.observe(time.perf_counter() - received)
+    return HTMLResponse(content=content, media_type="application/xml")
 
 # API Endpoints for Configuration
 @app.get("/api/settings")
@@ -231,6 +484,8 @@ async def update_settings(request: Request):
         
         if ai_updates:
             config.update_ai_config(**ai_updates)
+            if "audio_quality" in ai_updates:
+                invalidate_answer_xml()
         
         # Update call settings
         call_updates = {}
@@ -249,6 +504,36 @@ async def update_settings(request: Request):
         logger.error(f"❌ Failed to update settings: {e}")
         return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
 
+@app.get("/api/logging")
+async def get_logging_settings():
+    """Get log levels and audio-path debug sampling"""
+    logging_config = get_config().get_logging_config()
+    return JSONResponse({
+        "level": logging_config.level,
+        "module_levels": dict(logging_config.module_levels),
+        "audio_debug_sample_rate": logging_config.audio_debug_sample_rate
+    })
+
+@app.post("/api/logging")
+async def update_logging_settings(request: Request):
+    """Update per-module log levels, e.g. {"module_levels": {"bot": "DEBUG"}}"""
+    try:
+        data = await request.json()
+        config = get_config()
+        levels = dict(data.get("module_levels", {}))
+        if "level" in data:
+            levels[""] = data["level"]
+        sample_rate = data.get("audio_debug_sample_rate")
+        config.update_log_levels(
+            audio_debug_sample_rate=float(sample_rate) if sample_rate is not None else None,
+            **levels,
+        )
+        configure_logging(config.get_logging_config())
+        return JSONResponse({"status": "success", "message": "Logging updated successfully"})
+    except Exception as e:
+        logger.error(f"❌ Failed to update logging: {e}")
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
+
 @app.get("/api/voices")
 async def get_voices():
     """Get available voice options"""
@@ -269,62 +554,214 @@ async def get_prompt_templates():
         ]
     })
 
-@app.get("/api/call-history")
-async def get_call_history():
-    """Get call history (placeholder for future implementation)"""
-    # This would integrate with a database or log file
+@app.get("/api/profiles")
+async def get_profiles():
+    """Get the bot profiles a call or campaign can select"""
     return JSONResponse({
-        "calls": [],
-        "total": 0,
-        "successful": 0,
-        "failed": 0
+        "profiles": [
+            {
+                "id": profile.name,
+                "voice": CARTESIA_VOICES.get(profile.voice_id, profile.voice_id),
+                "sample_rate": profile.sample_rate,
+                "vad_stop_secs": profile.vad.stop_secs,
+                "max_context_tokens": profile.context.max_tokens,
+            }
+            for profile in [get_config().snapshot().profile(DEFAULT_PROFILE), *BOT_PROFILES.values()]
+        ]
     })
 
+@app.get("/api/call-history")
+async def get_call_history(limit: int = 50, cursor: Optional[str] = None, phone: Optional[str] = None):
+    """Get call history, newest first, paginated with next_cursor"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except (binascii.Error, json.JSONDecodeError, TypeError, ValueError):
+            return JSONResponse({"status": "error", "message": "Invalid cursor"}, status_code=400)
+    history = await get_history_store().list_calls(limit=max(1, min(limit, 500)), cursor=cursor, phone=phone)
+    return JSONResponse(history)
+
+@app.get("/api/call-history/{call_uuid}")
+async def get_call_record(call_uuid: str):
+    """Get one call record with its lifecycle events"""
+    call = await get_history_store().get_call(call_uuid)
+    if call is None:
+        return JSONResponse({"status": "error", "message": "Call not found"}, status_code=404)
+    return JSONResponse(call)
+
+@app.get("/api/call-history/{call_uuid}/recording")
+async def get_call_recording(call_uuid: str):
+    """Stereo μ-law WAV of a call (caller left, bot right); supports Range requests"""
+    return await recording_file(call_uuid, "recording", "audio/wav")
+
+@app.get("/api/call-history/{call_uuid}/transcript")
+async def get_call_transcript(call_uuid: str):
+    """Timestamped JSONL transcript of a call; supports Range requests"""
+    return await recording_file(call_uuid, "transcript", "application/x-ndjson")
+
+async def recording_file(call_uuid: str, kind: str, media_type: str):
+    await get_readiness().wait_loaded()
+    from recorder import get_recording_writer
+
+    paths = get_recording_writer().paths(call_uuid)
+    if not paths or not os.path.exists(paths[kind]):
+        return JSONResponse({"error": f"No {kind} for call {call_uuid}"}, status_code=404)
+    return FileResponse(paths[kind], media_type=media_type, filename=os.path.basename(paths[kind]))
+
+@app.get("/api/calls")
+async def get_active_calls():
+    """List calls that have not ended yet, across all workers"""
+    calls = await get_call_store().list_active()
+    return JSONResponse({"calls": calls, "total": len(calls)})
+
+@app.get("/api/calls/{call_uuid}")
+async def get_call_state(call_uuid: str):
+    """Get the shared state for a call"""
+    state = await get_call_store().get(call_uuid)
+    if state is None:
+        return JSONResponse({"status": "error", "message": "Call not found"}, status_code=404)
+    return JSONResponse(state)
+
+@app.get("/api/capacity")
+async def get_capacity():
+    """Whether this worker is taking new calls, with the load figures behind the decision"""
+    return JSONResponse(get_admission_controller().capacity())
+
+@app.get("/api/drain")
+async def get_drain_status(wait: float = 0):
+    """Drain state and calls still running on any worker; ?wait=N blocks up to N seconds for them to finish"""
+    registry = get_session_registry()
+    if wait > 0 and registry.draining:
+        await registry.wait_all_drained(min(wait, 300))
+    return JSONResponse(await registry.status())
+
+@app.post("/api/drain")
+async def start_drain():
+    """Stop accepting new calls on every worker and let running calls finish (up to max_call_duration)"""
+    registry = get_session_registry()
+    await registry.request_drain("admin API")
+    return JSONResponse(await registry.status(), status_code=202)
+
+@app.delete("/api/drain")
+async def cancel_drain():
+    """Leave drain mode and accept calls again on every worker"""
+    registry = get_session_registry()
+    await registry.request_cancel()
+    return JSONResponse(await registry.status())
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and its event loop is serving requests"""
+    return JSONResponse({"status": "ok", "worker": WORKER_ID})
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 once the VAD model and provider pools are warm and the worker isn't draining"""
+    status = get_readiness().status()
+    status["draining"] = get_session_registry().draining
+    ready = status["ready"] and not status["draining"]
+    return JSONResponse(status, status_code=200 if ready else 503)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4")
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    logger.info("🔌 NEW WEBSOCKET CONNECTION ATTEMPT")
     await websocket.accept()
-    logger.info("✅ WebSocket connection accepted")
+    accepted_at = time.monotonic()
+    logger.debug("✅ WebSocket connection accepted")
 
+    # Drop connections that never send Plivo's start event
+    handler = asyncio.current_task()
+    start_timed_out = False
+
+    def no_start():
+        nonlocal start_timed_out
+        start_timed_out = True
+        handler.cancel()
+
+    start_timer = get_timer_wheel().schedule(get_config().config.call.stream_start_timeout, no_start)
     try:
         # Plivo sends a start event when the stream begins
-        logger.info("⏳ Waiting for start message from Plivo...")
+        logger.debug("⏳ Waiting for start message from Plivo...")
         start_data = websocket.iter_text()
-        start_message = json.loads(await start_data.__anext__())
-
-        logger.info("📨 RECEIVED START MESSAGE:")
-        logger.info(f"📊 Full message: {json.dumps(start_message, indent=2)}")
+        try:
+            start_message = json.loads(await start_data.__anext__())
+        except asyncio.CancelledError:
+            if not start_timed_out:
+                raise
+            logger.warning("⏰ No start message from Plivo - closing stream")
+            call_timeouts.inc(labels={"reason": "no_start"})
+            await websocket.close()
+            return
+        start_timer.cancel()
 
         # Extract stream_id and call_id from the start event
         start_info = start_message.get("start", {})
         stream_id = start_info.get("streamId")
         call_id = start_info.get("callId")
-
-        logger.info(f"🆔 Stream ID: {stream_id}")
-        logger.info(f"📞 Call ID: {call_id}")
+        logger.debug(f"📨 Start message: {start_message}")
 
         if not stream_id:
             logger.error("❌ NO STREAM ID FOUND IN START MESSAGE!")
             await websocket.close()
             return
 
-        logger.info("🤖 STARTING AI BOT...")
-        await run_bot(websocket, stream_id, call_id)
+        with logger.contextualize(call_id=call_id or stream_id):
+            logger.info(f"📨 Stream {stream_id} started for call {call_id}")
+            get_admission_controller().started(call_id)
+            # Through the webhook queue so a late "answered" write can't land after it
+            await get_webhook_processor().submit(
+                "streaming", call_id, state={"status": "streaming", "stream_id": stream_id, "streamed_by": WORKER_ID}
+            )
+
+            # Plivo answered before warm-up finished: wait for the pipeline rather than block the loop importing it
+            await get_readiness().wait_loaded()
+            from bot import run_bot
+
+            await run_bot(websocket, stream_id, call_id, accepted_at, websocket.query_params.get("profile"))
         
     except Exception as e:
-        logger.error(f"❌ WebSocket error: {e}")
-        logger.error(f"📊 Exception type: {type(e).__name__}")
+        logger.error(f"❌ WebSocket error: {type(e).__name__}: {e}")
         await websocket.close()
+    finally:
+        start_timer.cancel()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plivo Outbound AI Chatbot server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument(
+        "--call-store",
+        default=os.getenv("CALL_STATE_STORE"),
+        help='Call state store: "memory" or "sqlite:///data/call_state.db"',
+    )
+    args = parser.parse_args()
+
+    # Workers re-import this module, so hand them the store through the environment
+    call_store_url = args.call_store or ("sqlite:///data/call_state.db" if args.workers > 1 else "memory")
+    if args.workers > 1 and call_store_url == "memory":
+        logger.warning("⚠️ In-memory call state is not shared between workers - using SQLite")
+        call_store_url = "sqlite:///data/call_state.db"
+    os.environ["CALL_STATE_STORE"] = call_store_url
+    configure_call_store(call_store_url)
+    # A fresh start takes calls: clear a drain left in the store by the server this one replaces
+    asyncio.run(get_call_store().set_value(DRAIN_KEY, None))
+
     config = get_config()
-    logger.info("🌟 Starting FastAPI server on port 8765")
-    logger.info(f"🔗 Web interface will be available at: http://localhost:8765")
+    logger.info(f"🌟 Starting FastAPI server on port {args.port} with {args.workers} worker(s)")
+    logger.info(f"🔗 Web interface will be available at: http://localhost:{args.port}")
     logger.info(f"📞 Default configuration:")
     logger.info(f"   🆔 Caller ID: {config.get_caller_id()}")
     logger.info(f"   📱 Target: {config.get_target_number()}")
     logger.info(f"   🎵 Voice: {config.get_voice_id()}")
     logger.info(f"   🧠 System prompt: {config.get_system_prompt()[:50]}...")
     
-    uvicorn.run(app, host="0.0.0.0", port=8765)
+    if args.workers > 1:
+        uvicorn.run("server:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from loguru import logger
+
+from call_store import WORKER_ID, get_call_store
+from config import get_config
+from metrics import get_metrics
+
+# Drain mode is kept in the shared call store so every worker honours it
+DRAIN_KEY = "drain"
+DRAIN_POLL_SECONDS = 1.0
+
+active_sessions = get_metrics().gauge("bot_sessions_active", "Bot pipelines running in this worker")
+draining_gauge = get_metrics().gauge("server_draining", "1 while this worker is draining for a restart")
+drain_ended_sessions = get_metrics().counter(
+    "drain_ended_sessions_total", "Calls ended because a drain outlived max_call_duration"
+)
+
+
+@dataclass
+class BotSession:
+    stream_id: str
+    call_id: Optional[str]
+    end: Callable[[], Awaitable[None]]
+    output_backlog: Optional[Callable[[], float]] = None
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class SessionRegistry:
+    """Live bot sessions in this worker, and drain mode for restarts
+
+    While draining the server turns away new calls (/make-call, campaigns,
+    /answer) and lets sessions already running finish. Sessions still running
+    max_call_duration after the drain started are ended so the worker can exit.
+    request_drain() records the drain in the shared call store; every worker
+    polls it (start_watching()) and drains or resumes to match.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, BotSession] = {}
+        self.draining = False
+        self.drain_started: Optional[float] = None
+        self.drain_deadline: Optional[float] = None
+        self._drained = asyncio.Event()
+        self._deadline_task: Optional[asyncio.Task] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def session(
+        self,
+        stream_id: str,
+        call_id: Optional[str],
+        end: Callable[[], Awaitable[None]],
+        output_backlog: Optional[Callable[[], float]] = None,
+    ):
+        """Track a bot pipeline for as long as the block runs"""
+        self._sessions[stream_id] = BotSession(stream_id, call_id, end, output_backlog)
+        active_sessions.set(len(self._sessions))
+        try:
+            yield
+        finally:
+            self._sessions.pop(stream_id, None)
+            active_sessions.set(len(self._sessions))
+            if self.draining and not self._sessions:
+                logger.info("✅ Drain complete - no calls left on this worker")
+                self._drained.set()
+
+    @property
+    def active(self) -> int:
+        return len(self._sessions)
+
+    def max_output_backlog(self) -> float:
+        """Largest amount of bot audio (seconds) any session has queued but not sent"""
+        return max((s.output_backlog() for s in self._sessions.values() if s.output_backlog), default=0.0)
+
+    async def request_drain(self, reason: str = "requested"):
+        """Drain every worker: record the drain in the shared store and start it here"""
+        store = get_call_store()
+        state = await store.get_value(DRAIN_KEY)
+        if state is None:
+            state = {"started_at": time.time(), "reason": reason, "requested_by": WORKER_ID}
+            await store.set_value(DRAIN_KEY, state)
+        self.start_drain(reason, state["started_at"])
+
+    async def request_cancel(self):
+        """Resume taking calls on every worker"""
+        await get_call_store().set_value(DRAIN_KEY, None)
+        self.cancel_drain()
+
+    def start_watching(self, interval: float = DRAIN_POLL_SECONDS):
+        """Follow drain requests made through any worker"""
+        if self._watcher is None:
+            self._watcher = asyncio.get_running_loop().create_task(self._run_watcher(interval))
+
+    async def stop_watching(self):
+        if self._watcher:
+            self._watcher.cancel()
+            self._watcher = None
+
+    async def _run_watcher(self, interval: float):
+        while True:
+            try:
+                state = await get_call_store().get_value(DRAIN_KEY)
+            except Exception as e:
+                logger.error(f"❌ Failed to read the shared drain state: {e}")
+            else:
+                if state is not None and not self.draining:
+                    self.start_drain(f"{state.get('reason', 'requested')} on {state.get('requested_by')}", state.get("started_at"))
+                elif state is None and self.draining:
+                    self.cancel_drain()
+            await asyncio.sleep(interval)
+
+    def start_drain(self, reason: str = "requested", started_at: Optional[float] = None):
+        """Stop taking new calls in this worker and end remaining ones after max_call_duration"""
+        if self.draining:
+            return
+        self.draining = True
+        # Wall clock, so every worker agrees on the deadline of a shared drain
+        self.drain_started = started_at or time.time()
+        self.drain_deadline = self.drain_started + get_config().config.call.max_call_duration
+        self._drained.clear()
+        draining_gauge.set(1)
+        logger.warning(f"🚰 Draining ({reason}) - {self.active} call(s) in progress, no new calls accepted")
+        if not self._sessions:
+            self._drained.set()
+        self._deadline_task = asyncio.get_running_loop().create_task(self._end_at_deadline())
+
+    def cancel_drain(self):
+        """Accept new calls again"""
+        if not self.draining:
+            return
+        self.draining = False
+        self.drain_started = self.drain_deadline = None
+        draining_gauge.set(0)
+        if self._deadline_task:
+            self._deadline_task.cancel()
+            self._deadline_task = None
+        logger.info("🚿 Drain cancelled - accepting calls again")
+
+    async def _end_at_deadline(self):
+        await asyncio.sleep(max(0.0, self.drain_deadline - time.time()))
+        for session in list(self._sessions.values()):
+            logger.warning(f"⏰ Ending call {session.call_id or session.stream_id} - drain deadline reached")
+            drain_ended_sessions.inc()
+            try:
+                await session.end()
+            except Exception as e:
+                logger.error(f"❌ Failed to end call {session.call_id}: {e}")
+
+    async def wait_drained(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a drain has no calls left; False on timeout"""
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def total_active(self) -> int:
+        """Calls not yet ended on any worker (from the shared call store)"""
+        return len(await get_call_store().list_active())
+
+    async def wait_all_drained(self, timeout: float, interval: float = DRAIN_POLL_SECONDS) -> bool:
+        """Wait until no worker has a call left; False on timeout"""
+        deadline = time.monotonic() + timeout
+        while await self.total_active():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+        return True
+
+    async def status(self) -> Dict[str, Any]:
+        """Drain state; active_calls counts every worker, worker_active_calls only this one"""
+        now = time.time()
+        monotonic_now = time.monotonic()
+        return {
+            "draining": self.draining,
+            "active_calls": await self.total_active(),
+            "worker": WORKER_ID,
+            "worker_active_calls": self.active,
+            "drain_seconds": round(now - self.drain_started, 1) if self.drain_started else None,
+            "deadline_in_seconds": round(max(0.0, self.drain_deadline - now), 1) if self.drain_deadline else None,
+            "worker_calls": [
+                {"call_id": s.call_id, "stream_id": s.stream_id, "age_seconds": round(monotonic_now - s.started_at, 1)}
+                for s in self._sessions.values()
+            ],
+        }
+
+
+_session_registry: Optional[SessionRegistry] = None
+
+def get_session_registry() -> SessionRegistry:
+    """Get the process-wide session registry"""
+    global _session_registry
+    if _session_registry is None:
+        _session_registry = SessionRegistry()
+    return _session_registry
@@ -0,0 +1,327 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import re
+import time
+from difflib import SequenceMatcher
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    Frame,
+    InterimTranscriptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    StartInterruptionFrame,
+    TranscriptionFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext, OpenAILLMContextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from context_manager import ContextBudget, Message, estimate_tokens, message_text
+from metrics import get_metrics
+
+Completer = Callable[[List[Message]], AsyncIterator[str]]
+
+speculation_results = get_metrics().counter(
+    "llm_speculation_total", "Speculative LLM replies by outcome: hit, miss, restarted, abandoned"
+)
+speculation_wasted_tokens = get_metrics().counter(
+    "llm_speculation_wasted_tokens_total", "Estimated tokens of discarded speculative replies (prompt, completion)"
+)
+speculation_head_start = get_metrics().histogram(
+    "llm_speculation_head_start_seconds",
+    "How long a committed speculative reply had been generating when the turn ended",
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0),
+)
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-level similarity of two transcripts, ignoring case and punctuation (1.0 is identical)"""
+    return SequenceMatcher(None, _words(a), _words(b), autojunk=False).ratio()
+
+
+def llm_completer(llm) -> Completer:
+    """Stream reply text for a message list from the call's LLM service, outside the pipeline"""
+    stream_text = getattr(llm, "stream_text", None)
+    if stream_text:
+        # Offline stubs script their replies
+        return stream_text
+
+    async def complete(messages: List[Message]) -> AsyncIterator[str]:
+        chunks = await llm.get_chat_completions(OpenAILLMContext(messages), messages)
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    return complete
+
+
+class Speculation:
+    """One speculative LLM reply, generated in the background and buffered for replay"""
+
+    def __init__(self, text: str, messages: List[Message], complete: Completer):
+        self.text = text
+        self.started = time.monotonic()
+        self.prompt_tokens = estimate_tokens(messages)
+        self.last_message = messages[-1] if messages else None
+        self.chunks: List[str] = []
+        self.error: Optional[str] = None
+        self.done = False
+        self._updated = asyncio.Event()
+        self._messages = messages + [{"role": "user", "content": text}]
+        self._task = asyncio.get_running_loop().create_task(self._generate(complete))
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks) // 4
+
+    async def _generate(self, complete: Completer):
+        try:
+            async for chunk in complete(self._messages):
+                self.chunks.append(chunk)
+                self._updated.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            logger.warning(f"⚠️ Speculative LLM request failed: {self.error}")
+        finally:
+            self.done = True
+            self._updated.set()
+
+    async def stream(self) -> AsyncIterator[str]:
+        """The reply so far, then the rest as it is generated"""
+        sent = 0
+        while True:
+            while sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+            if self.done:
+                return
+            self._updated.clear()
+            await self._updated.wait()
+
+    def cancel(self):
+        self._task.cancel()
+
+
+class Speculator:
+    """Starts the LLM reply on stable interim transcripts, before the caller's turn ends
+
+    The caller's turn reaches the LLM once the final transcript is in and VAD
+    has seen the end of speech. Speculation starts the request as soon as the
+    transcript is stable: a final transcript, the same interim twice, or an
+    interim when VAD stops. A speculation is kept while the caller's final
+    words are within the similarity threshold of what it was started on, and
+    restarted otherwise (or when a newer stable interim has different words).
+    When the turn reaches the LLM, the gate replays the kept reply in place of
+    the LLM if the history hasn't moved since; if nothing matches, the LLM
+    runs as usual.
+
+    listener() goes after STT and gate() right in front of the LLM, like a
+    context aggregator's user() and assistant().
+    """
+
+    def __init__(
+        self,
+        context: OpenAILLMContext,
+        complete: Completer,
+        budget: Optional[ContextBudget] = None,
+        threshold: float = 0.9,
+        stable_interims: int = 2,
+        min_words: int = 1,
+    ):
+        self.context = context
+        self.threshold = threshold
+        self.stable_interims = stable_interims
+        self.min_words = min_words
+        self._complete = complete
+        self._budget = budget
+        self._finals: List[str] = []
+        self._interim: Optional[str] = None
+        self._interim_repeats = 0
+        self._pending: Optional[Speculation] = None
+        self._committed: Optional[Speculation] = None
+
+        self.turns = 0
+        self.results: Dict[str, int] = {"hit": 0, "miss": 0, "restarted": 0, "abandoned": 0}
+        self.wasted_prompt_tokens = 0
+        self.wasted_completion_tokens = 0
+        self.head_starts: List[float] = []
+
+    def listener(self) -> "SpeculationListener":
+        return SpeculationListener(self)
+
+    def gate(self) -> "SpeculationGate":
+        return SpeculationGate(self)
+
+    def _turn_text(self, interim: Optional[str] = None) -> str:
+        return " ".join(self._finals + ([interim] if interim else []))
+
+    def on_interim(self, text: str):
+        if self._interim is not None and _words(text) == _words(self._interim):
+            self._interim_repeats += 1
+        else:
+            self._interim = text
+            self._interim_repeats = 1
+        if self._interim_repeats >= self.stable_interims:
+            self._speculate(self._turn_text(text), final=False)
+
+    def on_final(self, text: str):
+        if not text.strip():
+            return
+        self._finals.append(text.strip())
+        self._interim = None
+        self._interim_repeats = 0
+        self._speculate(self._turn_text(), final=True)
+
+    def on_user_stopped(self):
+        if self._interim:
+            self._speculate(self._turn_text(self._interim), final=False)
+
+    def _speculate(self, text: str, final: bool):
+        if len(_words(text)) < self.min_words:
+            return
+        if self._pending:
+            # A final transcript within the threshold keeps the reply; a new interim must match exactly
+            if final and similarity(self._pending.text, text) >= self.threshold:
+                return
+            if not final and _words(self._pending.text) == _words(text):
+                return
+            self._discard(self._pending, "miss" if final else "restarted")
+        messages = list(self.context.get_messages())
+        if self._budget:
+            messages = self._budget.trim(messages)[0]
+        logger.debug(f"🔮 Speculating on {text!r}")
+        self._pending = Speculation(text, messages, self._complete)
+
+    def _discard(self, speculation: Speculation, result: str):
+        speculation.cancel()
+        self.results[result] += 1
+        self.wasted_prompt_tokens += speculation.prompt_tokens
+        self.wasted_completion_tokens += speculation.completion_tokens
+        speculation_results.inc(labels={"result": result})
+        speculation_wasted_tokens.inc(speculation.prompt_tokens, labels={"kind": "prompt"})
+        speculation_wasted_tokens.inc(speculation.completion_tokens, labels={"kind": "completion"})
+
+    def take(self, context: OpenAILLMContext) -> Optional[Speculation]:
+        """The speculation to replay for a context about to go to the LLM, or None to run the LLM"""
+        speculation, self._pending = self._pending, None
+        self._finals = []
+        self._interim = None
+        self._interim_repeats = 0
+        self.turns += 1
+        if speculation is None:
+            return None
+        messages = context.get_messages()
+        final = message_text(messages[-1]) if messages and messages[-1].get("role") == "user" else ""
+        previous = messages[-2] if len(messages) > 1 else None
+        same_history = previous is speculation.last_message or (
+            previous is not None
+            and speculation.last_message is not None
+            and previous.get("role") == speculation.last_message.get("role")
+            and message_text(previous) == message_text(speculation.last_message)
+        )
+        if speculation.error or not same_history or similarity(speculation.text, final) < self.threshold:
+            logger.debug(f"🔮 Speculation missed: {speculation.text!r} vs {final!r}")
+            self._discard(speculation, "miss")
+            return None
+        head_start = time.monotonic() - speculation.started
+        logger.debug(f"🔮 Speculation hit with a {head_start * 1000:.0f}ms head start")
+        self.results["hit"] += 1
+        self.head_starts.append(head_start)
+        speculation_results.inc(labels={"result": "hit"})
+        speculation_head_start.observe(head_start)
+        self._committed = speculation
+        return speculation
+
+    def interrupt(self):
+        """The caller barged in: stop generating the reply being played"""
+        if self._committed:
+            self._committed.cancel()
+            self._committed = None
+
+    def close(self):
+        self.interrupt()
+        if self._pending:
+            self._discard(self._pending, "abandoned")
+            self._pending = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Speculation hit rate and the tokens spent on discarded replies over the call
+
+        hit_rate is the share of speculations checked against a final transcript that were kept.
+        """
+        checked = self.results["hit"] + self.results["miss"]
+        return {
+            "turns": self.turns,
+            **self.results,
+            "hit_rate": round(self.results["hit"] / checked, 3) if checked else 0.0,
+            "wasted_prompt_tokens": self.wasted_prompt_tokens,
+            "wasted_completion_tokens": self.wasted_completion_tokens,
+            "mean_head_start_ms": (
+                round(1000 * sum(self.head_starts) / len(self.head_starts)) if self.head_starts else None
+            ),
+        }
+
+
+class SpeculationListener(FrameProcessor):
+    """Feeds transcripts and end of speech to the speculator; passes every frame on"""
+
+    def __init__(self, speculator: Speculator, **kwargs):
+        super().__init__(**kwargs)
+        self._speculator = speculator
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, TranscriptionFrame):
+            self._speculator.on_final(frame.text)
+        elif isinstance(frame, InterimTranscriptionFrame):
+            self._speculator.on_interim(frame.text)
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            self._speculator.on_user_stopped()
+        await self.push_frame(frame, direction)
+
+
+class SpeculationGate(FrameProcessor):
+    """Replays a matching speculative reply as the LLM's response, or lets the context through"""
+
+    def __init__(self, speculator: Speculator, **kwargs):
+        super().__init__(**kwargs)
+        self._speculator = speculator
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartInterruptionFrame):
+            self._speculator.interrupt()
+        elif isinstance(frame, OpenAILLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            speculation = self._speculator.take(frame.context)
+            if speculation:
+                await self._replay(speculation)
+                return
+        await self.push_frame(frame, direction)
+
+    async def _replay(self, speculation: Speculation):
+        # The same frames the LLM service pushes for a reply
+        await self.push_frame(LLMFullResponseStartFrame())
+        try:
+            async for text in speculation.stream():
+                await self.push_frame(LLMTextFrame(text))
+        finally:
+            await self.push_frame(LLMFullResponseEndFrame())
+
+    async def cleanup(self):
+        await super().cleanup()
+        self._speculator.close()
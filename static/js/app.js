@@ -258,7 +258,7 @@ class PlivoChatbotApp {
         } catch (error) {
             console.error('Failed to fetch call history:', error);
         }
-        return [];
+        return { calls: [] };
     }
 
     // Initialize call history
@@ -266,14 +266,14 @@ class PlivoChatbotApp {
         const history = await this.fetchCallHistory();
         const historyContainer = document.getElementById('call-history-list');
         
-        if (historyContainer && history.length > 0) {
-            historyContainer.innerHTML = history.map(call => `
+        if (historyContainer && history.calls.length > 0) {
+            historyContainer.innerHTML = history.calls.map(call => `
                 <div class="call-entry">
                     <div class="call-info">
                         <strong>${call.target_number}</strong>
                         <div class="call-time">${new Date(call.timestamp).toLocaleString()}</div>
                     </div>
-                    <div class="status-indicator status-${call.status}"></div>
+                    <div class="status-indicator status-${{successful: 'connected', failed: 'disconnected'}[call.outcome] || 'pending'}"></div>
                 </div>
             `).join('');
         }
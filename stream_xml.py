@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import os
+import re
+from collections import OrderedDict
+from string import Template
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape
+
+from loguru import logger
+
+from config import get_config
+
+TEMPLATE_PATH = "templates/streams.xml.template"
+
+# Plivo contentType for each supported AIConfig.audio_quality value. The
+# serializer only speaks μ-law, so other pipeline rates (16 kHz profiles) still
+# stream 8 kHz μ-law and are resampled at the edge.
+CONTENT_TYPES = {
+    8000: "audio/x-mulaw;rate=8000",
+}
+DEFAULT_CONTENT_TYPE = CONTENT_TYPES[8000]
+
+FALLBACK_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Stream bidirectional="true" keepCallAlive="true" contentType="${content_type}">${stream_url}</Stream>
+</Response>"""
+
+
+def compile_stream_template(path: str = TEMPLATE_PATH) -> Template:
+    """Turn streams.xml.template into a string.Template with URL and contentType slots"""
+    try:
+        with open(path, "r") as f:
+            content = f.read()
+    except OSError as e:
+        logger.warning(f"⚠️ Could not read {path} ({e}) - using built-in stream XML")
+        return Template(FALLBACK_TEMPLATE)
+
+    content = content.replace("$", "$$")
+    content = re.sub(r'contentType="[^"]*"', 'contentType="${content_type}"', content)
+    content = re.sub(r"wss://<your server url>/ws", "${stream_url}", content)
+    return Template(content)
+
+
+def content_type_for(audio_quality: int) -> str:
+    """Plivo stream contentType for an audio quality setting"""
+    return CONTENT_TYPES.get(audio_quality, DEFAULT_CONTENT_TYPE)
+
+
+class StreamXMLCache:
+    """Renders the <Stream> answer XML once per distinct set of parameters
+
+    The cache key includes SERVER_URL and the audio settings, so changing either
+    naturally produces a fresh render; invalidate() drops everything explicitly.
+    """
+
+    def __init__(self, template: Template, max_entries: int = 1024):
+        self.template = template
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple, str]" = OrderedDict()
+
+    def render(
+        self,
+        server_url: str,
+        audio_quality: int,
+        params: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Answer XML for a server URL, audio quality and optional per-call stream params"""
+        key = (server_url, audio_quality, tuple(sorted((params or {}).items())))
+        xml = self._cache.get(key)
+        if xml is not None:
+            self._cache.move_to_end(key)
+            return xml
+
+        stream_url = f"wss://{server_url}/ws"
+        if params:
+            stream_url += "?" + urlencode(sorted(params.items()))
+        xml = self.template.substitute(
+            stream_url=escape(stream_url),
+            content_type=escape(content_type_for(audio_quality)),
+        )
+
+        self._cache[key] = xml
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return xml
+
+    def invalidate(self):
+        """Drop all rendered XML"""
+        self._cache.clear()
+        logger.debug("🧹 Stream XML cache invalidated")
+
+
+# Global stream XML cache instance
+stream_xml_cache = StreamXMLCache(compile_stream_template())
+
+def get_answer_xml(params: Optional[Dict[str, str]] = None) -> str:
+    """Answer XML for the current SERVER_URL and audio settings"""
+    server_url = os.getenv("SERVER_URL", "your-ngrok-url.ngrok.io")
+    return stream_xml_cache.render(server_url, get_config().get_audio_quality(), params)
+
+def get_redirect_xml(url: str, params: Optional[Dict[str, str]] = None) -> str:
+    """Answer XML that hands the call to another server's answer URL"""
+    if params:
+        url += ("&" if "?" in url else "?") + urlencode(sorted(params.items()))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Redirect method="POST">{escape(url)}</Redirect>
+</Response>"""
+
+def get_hold_xml(answer_url: str, hold_seconds: int, first: bool) -> str:
+    """Answer XML that keeps a call on hold, then asks /answer again"""
+    music_url = os.getenv("HOLD_MUSIC_URL")
+    if music_url:
+        hold = f"<Play>{escape(music_url)}</Play>"
+    else:
+        greeting = "<Speak>All our lines are busy. Please hold.</Speak>\n  " if first else ""
+        hold = f'{greeting}<Wait length="{hold_seconds}"/>'
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  {hold}
+  <Redirect method="POST">{escape(answer_url)}</Redirect>
+</Response>"""
+
+def get_busy_xml() -> str:
+    """Answer XML that hangs up a call the server has no room for"""
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Hangup reason="busy"/>
+</Response>"""
+
+def invalidate_answer_xml():
+    """Invalidate cached answer XML after a settings change"""
+    stream_xml_cache.invalidate()
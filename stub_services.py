@@ -0,0 +1,255 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import itertools
+import math
+import struct
+from dataclasses import dataclass
+from typing import AsyncGenerator, List, Optional
+
+import numpy as np
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    Frame,
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    LLMTextFrame,
+    StartInterruptionFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.openai.llm import OpenAILLMService
+from pipecat.services.stt_service import SegmentedSTTService
+from pipecat.services.tts_service import TTSService
+from pipecat.utils.time import time_now_iso8601
+
+DEFAULT_TRANSCRIPTS = ["Hello, can you hear me?", "What is two plus two?", "Thank you, goodbye."]
+DEFAULT_RESPONSES = [
+    "Hello! Yes, I can hear you clearly. What would you like to learn today?",
+    "Two plus two is four. Great question, keep it up!",
+    "You are welcome. Have a wonderful day!",
+]
+
+
+def tone(duration: float, sample_rate: int, frequency: float = 440.0) -> bytes:
+    """16-bit mono sine tone, used as stand-in speech audio"""
+    samples = int(duration * sample_rate)
+    return struct.pack(
+        f"<{samples}h",
+        *(int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate)) for i in range(samples)),
+    )
+
+
+class StubVADAnalyzer(VADAnalyzer):
+    """Energy-threshold VAD with no model to load, for offline load tests"""
+
+    def __init__(self, threshold: float = 500.0, **kwargs):
+        kwargs.setdefault("params", VADParams(min_volume=0.0))
+        super().__init__(**kwargs)
+        self.threshold = threshold
+
+    def num_frames_required(self) -> int:
+        return int(self.sample_rate * 0.02)
+
+    def voice_confidence(self, buffer) -> float:
+        samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float32)
+        if not len(samples):
+            return 0.0
+        return 1.0 if np.sqrt(np.mean(samples * samples)) > self.threshold else 0.0
+
+    def set_params(self, params: VADParams):
+        # The energy threshold replaces the volume check, so keep it off for bot profiles too
+        super().set_params(params.model_copy(update={"min_volume": 0.0}))
+
+
+class StubSTTService(SegmentedSTTService):
+    """Offline STT that returns scripted transcripts after a fixed delay per utterance"""
+
+    def __init__(self, transcripts: Optional[List[str]] = None, delay: float = 0.15, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self._transcripts = itertools.cycle(transcripts or DEFAULT_TRANSCRIPTS)
+
+    async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
+        await asyncio.sleep(self.delay)
+        yield TranscriptionFrame(next(self._transcripts), "caller", time_now_iso8601())
+
+
+@dataclass
+class ScriptedTurn:
+    """What the caller says in one turn, and the interim transcripts STT sends meanwhile
+
+    Interims default to the final transcript's words so far. final_delay
+    overrides the STT's endpointing delay for this turn.
+    """
+
+    final: str
+    interims: Optional[List[str]] = None
+    final_delay: Optional[float] = None
+
+    def interim_texts(self) -> List[str]:
+        if self.interims is not None:
+            return self.interims
+        words = self.final.rstrip(".?!").split()
+        return [" ".join(words[: i + 1]) for i in range(len(words))]
+
+
+class ScriptedSTTService(FrameProcessor):
+    """Offline streaming STT with scripted interim and final transcripts
+
+    Each caller turn (UserStartedSpeakingFrame) takes the next scripted turn.
+    An interim goes out after every interim_seconds of speech audio, the last
+    one again when the audio turns silent (as Deepgram does), and the final
+    transcript after endpointing seconds of silence, or at the latest when VAD
+    reports the caller stopped.
+    """
+
+    def __init__(
+        self,
+        turns: List[ScriptedTurn],
+        interim_seconds: float = 0.25,
+        endpointing: float = 0.3,
+        threshold: float = 500.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.interim_seconds = interim_seconds
+        self.endpointing = endpointing
+        self.threshold = threshold
+        self._turns = itertools.cycle(turns)
+        self._turn: Optional[ScriptedTurn] = None
+        self._interims: List[str] = []
+        self._sent = 0
+        self._speech = 0.0
+        self._silence = 0.0
+
+    async def _interim(self, text: str):
+        await self.push_frame(InterimTranscriptionFrame(text, "caller", time_now_iso8601()))
+
+    async def _final(self):
+        turn, self._turn = self._turn, None
+        if turn:
+            await self.push_frame(TranscriptionFrame(turn.final, "caller", time_now_iso8601()))
+
+    async def _handle_audio(self, frame: InputAudioRawFrame):
+        seconds = len(frame.audio) / 2 / frame.sample_rate
+        samples = np.frombuffer(frame.audio, dtype=np.int16).astype(np.float32)
+        if len(samples) and np.sqrt(np.mean(samples * samples)) > self.threshold:
+            self._speech += seconds
+            self._silence = 0.0
+            if self._sent < len(self._interims) and self._speech >= (self._sent + 1) * self.interim_seconds:
+                await self._interim(self._interims[self._sent])
+                self._sent += 1
+        elif self._speech:
+            if not self._silence and self._sent:
+                await self._interim(self._interims[self._sent - 1])
+            self._silence += seconds
+            endpointing = self._turn.final_delay if self._turn.final_delay is not None else self.endpointing
+            if self._silence >= endpointing:
+                await self._final()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, UserStartedSpeakingFrame) and self._turn is None:
+            self._turn = next(self._turns)
+            self._interims = self._turn.interim_texts()
+            self._sent = 0
+            self._speech = self._silence = 0.0
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            await self._final()
+        elif isinstance(frame, InputAudioRawFrame) and self._turn:
+            await self._handle_audio(frame)
+        await self.push_frame(frame, direction)
+
+
+class StubLLMService(OpenAILLMService):
+    """Offline LLM that streams scripted responses with a fixed time-to-first-token"""
+
+    def __init__(
+        self,
+        responses: Optional[List[str]] = None,
+        ttft: float = 0.3,
+        token_interval: float = 0.02,
+        **kwargs,
+    ):
+        super().__init__(api_key="stub", model="stub", **kwargs)
+        self.ttft = ttft
+        self.token_interval = token_interval
+        self._responses = itertools.cycle(responses or DEFAULT_RESPONSES)
+
+    def reply(self, messages: List[dict]) -> str:
+        return next(self._responses)
+
+    async def stream_text(self, messages: List[dict]) -> AsyncGenerator[str, None]:
+        """The reply to messages, a word at a time (also used for speculative requests)"""
+        await asyncio.sleep(self.ttft)
+        for i, word in enumerate(self.reply(messages).split(" ")):
+            if i:
+                await asyncio.sleep(self.token_interval)
+            yield word if i == 0 else f" {word}"
+
+    async def _process_context(self, context: OpenAILLMContext):
+        async for text in self.stream_text(context.get_messages()):
+            await self.push_frame(LLMTextFrame(text))
+
+
+class StubTTSService(TTSService):
+    """Offline TTS that returns a tone sized to the text after a fixed time-to-first-byte"""
+
+    def __init__(self, ttfb: float = 0.2, chars_per_second: float = 15.0, **kwargs):
+        super().__init__(**kwargs)
+        self.ttfb = ttfb
+        self.chars_per_second = chars_per_second
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        yield TTSStartedFrame()
+        await asyncio.sleep(self.ttfb)
+        chunk = tone(0.02, self.sample_rate)
+        for _ in range(max(1, int(len(text) / self.chars_per_second / 0.02))):
+            yield TTSAudioRawFrame(audio=chunk, sample_rate=self.sample_rate, num_channels=1)
+        yield TTSStoppedFrame()
+
+
+class StubSpeakerOutput(FrameProcessor):
+    """Stands in for transport.output(): emits bot speaking events for TTS audio
+
+    Audio is consumed at real-time pace so bot turns take as long as they would
+    on a call.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._speaking = False
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, TTSAudioRawFrame):
+            if not self._speaking:
+                self._speaking = True
+                await self.push_frame(BotStartedSpeakingFrame())
+                await self.push_frame(BotStartedSpeakingFrame(), FrameDirection.UPSTREAM)
+            await asyncio.sleep(len(frame.audio) / 2 / frame.sample_rate)
+            return
+        if isinstance(frame, (TTSStoppedFrame, StartInterruptionFrame)) and self._speaking:
+            self._speaking = False
+            await self.push_frame(BotStoppedSpeakingFrame())
+            await self.push_frame(BotStoppedSpeakingFrame(), FrameDirection.UPSTREAM)
+        await self.push_frame(frame, direction)
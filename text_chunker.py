@@ -0,0 +1,232 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import re
+import time
+from typing import List, Optional
+
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    StartInterruptionFrame,
+    TextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from config import ChunkPolicy, get_config
+from metrics import get_metrics
+
+first_chunk_seconds = get_metrics().histogram(
+    "tts_first_chunk_seconds", "Time from the start of an LLM response to its first chunk sent to TTS"
+)
+chunks_total = get_metrics().counter("tts_chunks_total", "Text chunks sent to TTS")
+
+SENTENCE_END = ".!?।"
+CLAUSE_END = ",;:—"
+CLOSERS = "\"')]”’"
+
+# Words whose trailing period never ends a sentence
+ABBREVIATIONS = frozenset(
+    {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "eg", "ie", "approx", "govt", "ltd", "pvt", "dept", "hrs"}
+)
+# Words that only act as abbreviations in front of a number: "No. 5", "Rs. 500"
+NUMBER_PREFIXES = frozenset({"no", "nos", "rs", "inr", "ref", "ph", "mob", "tel", "pg", "vol"})
+CURRENCY_WORDS = frozenset({"rs", "rs.", "inr", "₹", "usd", "$"})
+# Indian-English amounts: "5 lakh", "2.5 crore", "500 rupees"
+NUMBER_UNITS = frozenset({"hundred", "thousand", "lakh", "lakhs", "crore", "crores", "rupees", "paise", "percent", "%"})
+
+_LAST_WORD = re.compile(r"([A-Za-z.]+)$")
+
+
+def _next_char(text: str, index: int) -> Optional[str]:
+    """First non-space character from index, or None if it hasn't arrived yet"""
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return text[index] if index < len(text) else None
+
+
+def _is_number_start(ch: str) -> bool:
+    return ch.isdigit() or ch in "+₹$"
+
+
+class SentenceChunker:
+    """Splits streamed LLM text into speakable chunks as early as it is safe to
+
+    The first chunk of a response is released at the first clause (or sentence,
+    depending on the policy); later chunks at sentence boundaries, merging short
+    sentences. A boundary is only confirmed once the character after it has
+    arrived, so "3.5", "Rs. 500" and "Dr. Rao" are never split. Forced splits
+    on long text avoid breaking phone numbers and amounts.
+    """
+
+    def __init__(self, policy: Optional[ChunkPolicy] = None):
+        self.policy = policy or ChunkPolicy()
+        self._text = ""
+        self._scan_from = 0
+        self._chunks_sent = 0
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def reset(self):
+        """Discard buffered text and start a new response"""
+        self._text = ""
+        self._scan_from = 0
+        self._chunks_sent = 0
+
+    def push(self, text: str) -> List[str]:
+        """Add streamed text and return any chunks that are ready to speak"""
+        self._text += text
+        chunks = []
+        while True:
+            end = self._find_boundary()
+            if end < 0 and len(self._text) > self.policy.max_chunk_chars:
+                end = self._find_forced_split()
+            if end <= 0:
+                break
+            chunks.append(self._take(end))
+        return chunks
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left at the end of a response"""
+        if not self._text.strip():
+            self._text = ""
+            return None
+        return self._take(len(self._text))
+
+    def _take(self, end: int) -> str:
+        chunk, self._text = self._text[:end], self._text[end:]
+        self._scan_from = 0
+        self._chunks_sent += 1
+        return chunk
+
+    def _find_boundary(self) -> int:
+        text = self._text
+        first = self._chunks_sent == 0
+        undecided = len(text)
+        for i in range(self._scan_from, len(text)):
+            ch = text[i]
+            if ch == "\n":
+                if text[:i].strip() and (first or i >= self.policy.min_chunk_chars):
+                    return i + 1
+                continue
+            if ch not in SENTENCE_END and ch not in CLAUSE_END:
+                continue
+
+            # A boundary is only confirmed by the characters that follow it
+            end = i + 1
+            while end < len(text) and text[end] in CLOSERS:
+                end += 1
+            if end >= len(text):
+                undecided = min(undecided, i)
+                continue
+            if not text[end].isspace():
+                continue
+            following = _next_char(text, end)
+
+            if ch in SENTENCE_END:
+                if ch == ".":
+                    ends = self._ends_sentence(text, i, following)
+                    if ends is None:
+                        undecided = min(undecided, i)
+                        continue
+                    if not ends:
+                        continue
+                if first or end >= self.policy.min_chunk_chars:
+                    return end
+            elif first and self.policy.first_chunk == "clause" and end >= self.policy.min_first_chars:
+                # "1, 2, 3" and "98200, 12345" read better in one piece
+                if text[i - 1].isdigit():
+                    if following is None:
+                        undecided = min(undecided, i)
+                        continue
+                    if _is_number_start(following):
+                        continue
+                return end
+        self._scan_from = undecided
+        return -1
+
+    def _ends_sentence(self, text: str, dot: int, following: Optional[str]) -> Optional[bool]:
+        """Whether the period at dot ends a sentence; None until the next word arrives"""
+        match = _LAST_WORD.search(text[:dot])
+        if not match:
+            return True
+        word = match.group(1).lower().replace(".", "")
+        if word in ABBREVIATIONS or "." in match.group(1):
+            return False  # "Dr.", "e.g.", "a.m."
+        if len(word) == 1 and match.group(1).isupper():
+            return False  # initial: "A. P. J. Kalam"
+        if word in NUMBER_PREFIXES:
+            if following is None:
+                return None
+            return not _is_number_start(following)
+        return True
+
+    def _find_forced_split(self) -> int:
+        text = self._text
+        for i in range(min(len(text) - 1, self.policy.max_chunk_chars), 0, -1):
+            if text[i].isspace() and self._safe_space(text, i):
+                return i + 1
+        return -1
+
+    def _safe_space(self, text: str, i: int) -> bool:
+        before = text[:i].rsplit(None, 1)
+        after = text[i + 1 :].split(None, 1)
+        if not before or not after:
+            return False
+        prev, nxt = before[-1], after[0]
+        # "+91 98200 12345", "1 lakh", "Rs 500"
+        if prev[-1].isdigit() and (nxt[0].isdigit() or nxt.lower().strip(".,") in NUMBER_UNITS):
+            return False
+        if prev.lower() in CURRENCY_WORDS or prev.startswith("+"):
+            return False
+        return True
+
+
+class TextChunker(FrameProcessor):
+    """Pipeline stage between the LLM and TTS that sends speakable chunks early
+
+    The TTS service must be created with aggregate_sentences=False so it speaks
+    each chunk as soon as it arrives.
+    """
+
+    def __init__(self, policy: Optional[ChunkPolicy] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._chunker = SentenceChunker(policy or get_config().get_chunk_policy())
+        self._response_started: Optional[float] = None
+
+    async def _push_chunk(self, chunk: str):
+        if self._response_started is not None:
+            first_chunk_seconds.observe(time.monotonic() - self._response_started)
+            self._response_started = None
+        chunks_total.inc()
+        await self.push_frame(TextFrame(chunk))
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMFullResponseStartFrame):
+            self._chunker.reset()
+            self._response_started = time.monotonic()
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, LLMTextFrame):
+            for chunk in self._chunker.push(frame.text):
+                await self._push_chunk(chunk)
+        elif isinstance(frame, (LLMFullResponseEndFrame, EndFrame)):
+            chunk = self._chunker.flush()
+            if chunk:
+                await self._push_chunk(chunk)
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, StartInterruptionFrame):
+            self._chunker.reset()
+            self._response_started = None
+            await self.push_frame(frame, direction)
+        else:
+            await self.push_frame(frame, direction)
@@ -0,0 +1,129 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import inspect
+from typing import Any, Callable, List, Optional, Set
+
+from loguru import logger
+
+from metrics import get_metrics
+
+call_timeouts = get_metrics().counter("call_timeouts_total", "Calls ended by a deadline: max_duration, idle, no_start")
+scheduled_timers = get_metrics().gauge("timer_wheel_timers", "Deadlines pending in the timer wheel")
+
+
+class Timer:
+    """A scheduled callback; cancel() is O(1) and the wheel drops it when its slot comes up"""
+
+    __slots__ = ("callback", "rounds", "cancelled")
+
+    def __init__(self, callback: Callable[[], Any], rounds: int):
+        self.callback = callback
+        self.rounds = rounds
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """Hashed timer wheel: one asyncio task serves every call deadline
+
+    Deadlines land in one of `slots` buckets, `tick` seconds apart, with a
+    round count for deadlines further out than one revolution. Scheduling and
+    cancelling are O(1), so thousands of sessions each rescheduling an idle
+    timer on every turn cost a list append, not a task or a heap operation.
+    Deadlines fire up to one tick late.
+    """
+
+    def __init__(self, tick: float = 0.5, slots: int = 512):
+        self.tick = tick
+        self._slots: List[List[Timer]] = [[] for _ in range(slots)]
+        self._cursor = 0
+        self._pending = 0
+        self._task: Optional[asyncio.Task] = None
+        self._callbacks: Set[asyncio.Task] = set()
+
+    def schedule(self, delay: float, callback: Callable[[], Any]) -> Timer:
+        """Run callback (sync or async) after delay seconds"""
+        # The current tick is already partly over, so count one more to never fire early
+        ticks = max(0, int(-(-delay // self.tick))) + 1
+        rounds = (ticks - 1) // len(self._slots)
+        offset = ticks - rounds * len(self._slots)
+        timer = Timer(callback, rounds)
+        self._slots[(self._cursor + offset) % len(self._slots)].append(timer)
+        self._pending += 1
+        scheduled_timers.set(self._pending)
+        if self._task is None:
+            self.start()
+        return timer
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.tick
+            # Sleep to an absolute time so a slow tick doesn't push every deadline back
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            self._cursor = (self._cursor + 1) % len(self._slots)
+            self._advance(self._slots[self._cursor])
+
+    def _advance(self, slot: List[Timer]):
+        due = []
+        keep = []
+        for timer in slot:
+            if timer.cancelled:
+                self._pending -= 1
+            elif timer.rounds > 0:
+                timer.rounds -= 1
+                keep.append(timer)
+            else:
+                self._pending -= 1
+                due.append(timer)
+        slot[:] = keep
+        scheduled_timers.set(self._pending)
+        for timer in due:
+            self._fire(timer)
+
+    def _fire(self, timer: Timer):
+        try:
+            result = timer.callback()
+        except Exception as e:
+            logger.error(f"❌ Timer callback failed: {e}")
+            return
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._callbacks.add(task)
+            task.add_done_callback(self._callback_done)
+
+    def _callback_done(self, task: asyncio.Task):
+        self._callbacks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"❌ Timer callback failed: {task.exception()}")
+
+
+_timer_wheel: Optional[TimerWheel] = None
+
+def get_timer_wheel() -> TimerWheel:
+    """Get the process-wide timer wheel"""
+    global _timer_wheel
+    if _timer_wheel is None:
+        _timer_wheel = TimerWheel()
+    return _timer_wheel
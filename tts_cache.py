@@ -0,0 +1,215 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import hashlib
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    DataFrame,
+    Frame,
+    StartInterruptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from audio_codec import ulaw_decode, ulaw_encode
+from config import get_config
+from metrics import get_metrics
+
+# The disk tier holds audio exactly as Plivo plays it
+DISK_SAMPLE_RATE = 8000
+
+cache_hits = get_metrics().counter("tts_cache_hits_total", "Fixed utterances played from the TTS cache")
+cache_misses = get_metrics().counter("tts_cache_misses_total", "Fixed utterances that had to be synthesized")
+cache_hit_ratio = get_metrics().gauge("tts_cache_hit_ratio", "Share of fixed utterances served from the TTS cache")
+cache_memory_bytes = get_metrics().gauge("tts_cache_memory_bytes", "PCM audio held in the TTS memory cache")
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so equivalent text shares audio"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def cache_key(voice_id: str, sample_rate: int, text: str) -> str:
+    return hashlib.sha1(f"{voice_id}|{sample_rate}|{normalize_text(text)}".encode()).hexdigest()
+
+
+class TTSCache:
+    """Synthesized audio for fixed utterances (greetings, stock replies)
+
+    Two tiers: an LRU of 16-bit PCM in memory and pre-encoded 8 kHz μ-law files
+    on disk, so a restarted worker doesn't pay for synthesis again.
+    """
+
+    def __init__(self, directory: str = "data/tts_cache", max_memory_bytes: int = 32 * 1024 * 1024):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._hits = 0
+        self._lookups = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.ulaw")
+
+    def _remember(self, key: str, pcm: bytes):
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = pcm
+        self._memory_bytes += len(pcm)
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+        cache_memory_bytes.set(self._memory_bytes)
+
+    def _count(self, hit: bool, tier: str = ""):
+        self._lookups += 1
+        if hit:
+            self._hits += 1
+            cache_hits.inc(labels={"tier": tier})
+        else:
+            cache_misses.inc()
+        cache_hit_ratio.set(self._hits / self._lookups)
+
+    async def get(self, voice_id: str, sample_rate: int, text: str) -> Optional[bytes]:
+        """PCM audio for the text in this voice, or None if it was never synthesized"""
+        key = cache_key(voice_id, sample_rate, text)
+        pcm = self._memory.get(key)
+        if pcm is not None:
+            self._memory.move_to_end(key)
+            self._count(True, "memory")
+            return pcm
+
+        if sample_rate == DISK_SAMPLE_RATE:
+            try:
+                ulaw = await asyncio.to_thread(self._read, self._path(key))
+            except FileNotFoundError:
+                ulaw = None
+            if ulaw:
+                pcm = ulaw_decode(ulaw)
+                self._remember(key, pcm)
+                self._count(True, "disk")
+                return pcm
+
+        self._count(False)
+        return None
+
+    async def put(self, voice_id: str, sample_rate: int, text: str, pcm: bytes):
+        """Store synthesized PCM audio in memory and, for 8 kHz audio, on disk"""
+        key = cache_key(voice_id, sample_rate, text)
+        self._remember(key, pcm)
+        if sample_rate == DISK_SAMPLE_RATE:
+            ulaw = ulaw_encode(pcm)
+            try:
+                await asyncio.to_thread(self._write, self._path(key), ulaw)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write TTS cache entry: {e}")
+        logger.debug(f"💾 Cached {len(pcm)} bytes of audio for: {normalize_text(text)[:50]}")
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def clear_memory(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+        cache_memory_bytes.set(0)
+
+
+@dataclass
+class CachedSpeechFrame(DataFrame):
+    """Cached audio to play, carried down the pipeline to the TTSCacheRecorder
+
+    Queued at the start of the pipeline, audio frames would pass through STT
+    and be heard as the caller; this frame only turns into audio after TTS.
+    """
+
+    audio: bytes
+    sample_rate: int
+
+    def __str__(self):
+        return f"{self.name}(size: {len(self.audio)}, sample_rate: {self.sample_rate})"
+
+
+def cached_speech_frames(pcm: bytes, sample_rate: int) -> List[Frame]:
+    """Frames that play cached audio through the output transport"""
+    return [TTSAudioRawFrame(audio=pcm, sample_rate=sample_rate, num_channels=1)]
+
+
+class TTSCacheRecorder(FrameProcessor):
+    """Sits after TTS, stores the audio of an expected fixed utterance and plays cached audio
+
+    Call expect() before queuing a TTSSpeakFrame for the text; the audio between
+    the next TTSStartedFrame and TTSStoppedFrame is cached unless the caller
+    interrupts it. A CachedSpeechFrame is played from here, past STT.
+    """
+
+    def __init__(self, cache: "TTSCache", voice_id: str, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._voice_id = voice_id
+        self._text: Optional[str] = None
+        self._audio: Optional[bytearray] = None
+        self._sample_rate = 0
+
+    def expect(self, text: str):
+        self._text = text
+        self._audio = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, CachedSpeechFrame):
+            for audio_frame in cached_speech_frames(frame.audio, frame.sample_rate):
+                await self.push_frame(audio_frame, direction)
+            return
+
+        if self._text is not None:
+            if isinstance(frame, TTSStartedFrame):
+                self._audio = bytearray()
+            elif isinstance(frame, TTSAudioRawFrame) and self._audio is not None:
+                self._audio.extend(frame.audio)
+                self._sample_rate = frame.sample_rate
+            elif isinstance(frame, TTSStoppedFrame) and self._audio:
+                self.create_task(self._cache.put(self._voice_id, self._sample_rate, self._text, bytes(self._audio)))
+                self._text = self._audio = None
+            elif isinstance(frame, StartInterruptionFrame):
+                self._text = self._audio = None
+
+        await self.push_frame(frame, direction)
+
+
+_tts_cache: Optional[TTSCache] = None
+
+def get_tts_cache() -> TTSCache:
+    """Get the process-wide TTS cache"""
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSCache(
+            os.getenv("TTS_CACHE_DIR", "data/tts_cache"),
+            get_config().get_tts_cache_memory_mb() * 1024 * 1024,
+        )
+    return _tts_cache
@@ -0,0 +1,167 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from collections import deque
+from typing import Any, Deque, Dict
+
+import numpy as np
+from loguru import logger
+
+from pipecat.frames.frames import (
+    Frame,
+    InputAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from logging_setup import audio_debug_sampled
+from metrics import get_metrics
+
+gate_audio_seconds = get_metrics().counter(
+    "stt_gate_audio_seconds_total", "Caller audio passed to or suppressed from STT by the silence gate"
+)
+gate_suppressed_ratio = get_metrics().histogram(
+    "stt_gate_suppressed_ratio",
+    "Share of each call's caller audio kept from STT",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+
+
+def frame_rms(audio: bytes) -> float:
+    """RMS level of 16-bit PCM audio"""
+    samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32)
+    if not len(samples):
+        return 0.0
+    return float(np.sqrt(np.dot(samples, samples) / len(samples)))
+
+
+def _duration(frame: InputAudioRawFrame) -> float:
+    return len(frame.audio) / 2 / frame.num_channels / frame.sample_rate
+
+
+class STTGate(FrameProcessor):
+    """Keeps silence away from STT while the caller is just listening
+
+    Sits between transport.input() and STT. Audio passes while Silero VAD
+    reports speech or a frame's energy rises clearly above the line's noise
+    floor, and for a hangover period after, so STT still sees the trailing
+    silence it needs to finalize. While closed, the last pre_roll_ms of audio
+    is kept and sent ahead of the first speech frame so word onsets that
+    arrive before VAD confirms speech are not clipped.
+    """
+
+    def __init__(
+        self,
+        pre_roll_ms: int = 500,
+        hangover_ms: int = 800,
+        min_rms: float = 300.0,
+        noise_ratio: float = 3.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.pre_roll = pre_roll_ms / 1000
+        self.hangover = hangover_ms / 1000
+        self.min_rms = min_rms
+        self.noise_ratio = noise_ratio
+
+        self._pre_roll: Deque[InputAudioRawFrame] = deque()
+        self._pre_roll_seconds = 0.0
+        self._noise_floor = min_rms / noise_ratio
+        self._vad_speaking = False
+        self._open = False
+        self._audio_time = 0.0
+        self._last_speech = float("-inf")
+
+        self.passed_seconds = 0.0
+        self.suppressed_seconds = 0.0
+
+    def _is_speech(self, frame: InputAudioRawFrame) -> bool:
+        if self._vad_speaking:
+            return True
+        rms = frame_rms(frame.audio)
+        if rms > max(self.min_rms, self._noise_floor * self.noise_ratio):
+            return True
+        # Track the noise floor only on frames we consider silence
+        self._noise_floor += 0.05 * (rms - self._noise_floor)
+        return False
+
+    async def _pass(self, frame: InputAudioRawFrame, direction: FrameDirection):
+        duration = _duration(frame)
+        self.passed_seconds += duration
+        gate_audio_seconds.inc(duration, labels={"state": "passed"})
+        await self.push_frame(frame, direction)
+
+    def _suppress(self, frame: InputAudioRawFrame):
+        duration = _duration(frame)
+        self.suppressed_seconds += duration
+        gate_audio_seconds.inc(duration, labels={"state": "suppressed"})
+
+    async def _handle_audio(self, frame: InputAudioRawFrame, direction: FrameDirection):
+        duration = _duration(frame)
+        self._audio_time += duration
+
+        speech = self._is_speech(frame)
+        if audio_debug_sampled():
+            logger.debug(
+                f"🔇 STT gate: speech={speech} open={self._open} noise floor {self._noise_floor:.0f}"
+            )
+        if speech:
+            self._last_speech = self._audio_time
+            if not self._open:
+                self._open = True
+                while self._pre_roll:
+                    await self._pass(self._pre_roll.popleft(), direction)
+                self._pre_roll_seconds = 0.0
+            await self._pass(frame, direction)
+            return
+
+        if self._open and self._audio_time - self._last_speech <= self.hangover:
+            await self._pass(frame, direction)
+            return
+
+        # Held frames only count as suppressed once they fall out of the pre-roll
+        self._open = False
+        self._pre_roll.append(frame)
+        self._pre_roll_seconds += duration
+        while self._pre_roll_seconds > self.pre_roll and len(self._pre_roll) > 1:
+            dropped = self._pre_roll.popleft()
+            self._pre_roll_seconds -= _duration(dropped)
+            self._suppress(dropped)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InputAudioRawFrame):
+            await self._handle_audio(frame, direction)
+            return
+
+        if isinstance(frame, UserStartedSpeakingFrame):
+            self._vad_speaking = True
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            self._vad_speaking = False
+            self._last_speech = self._audio_time
+        await self.push_frame(frame, direction)
+
+    @property
+    def suppressed_ratio(self) -> float:
+        total = self.passed_seconds + self.suppressed_seconds
+        return self.suppressed_seconds / total if total else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Seconds of caller audio passed to and kept from STT, and the suppressed share
+
+        Call once when the call ends; audio still held as pre-roll counts as suppressed.
+        """
+        while self._pre_roll:
+            self._suppress(self._pre_roll.popleft())
+        self._pre_roll_seconds = 0.0
+        gate_suppressed_ratio.observe(self.suppressed_ratio)
+        return {
+            "passed_seconds": round(self.passed_seconds, 2),
+            "suppressed_seconds": round(self.suppressed_seconds, 2),
+            "suppressed_ratio": round(self.suppressed_ratio, 3),
+        }
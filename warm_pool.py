@@ -0,0 +1,185 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import os
+from collections import deque
+from typing import Callable, Deque, Dict, Generic, Optional, TypeVar
+
+from loguru import logger
+
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.services.cartesia.tts import CartesiaTTSService
+from pipecat.services.deepgram.stt import DeepgramSTTService
+from pipecat.services.openai.llm import OpenAILLMService
+
+from config import get_config
+from context_manager import LLMSummarizer, Summarizer, extractive_summary
+from metrics import get_metrics
+from provider_pool import get_provider_pool
+
+T = TypeVar("T")
+
+pool_hits = get_metrics().counter("warm_pool_hits_total", "Components handed out from a warm pool")
+pool_misses = get_metrics().counter("warm_pool_misses_total", "Components built inline because the pool was empty")
+pool_available = get_metrics().gauge("warm_pool_available", "Pre-built components waiting in each pool")
+pool_build_failures = get_metrics().counter("warm_pool_build_failures_total", "Components that failed to pre-build")
+
+REFILL_BACKOFF_SECONDS = 0.5
+MAX_REFILL_BACKOFF_SECONDS = 30.0
+
+
+class WarmPool(Generic[T]):
+    """Pool of pre-built, single-use components refilled in the background
+
+    Pipeline components hold per-call state, so each instance is handed out once
+    and the pool builds a replacement off the event loop. Failed builds are
+    retried with capped exponential backoff until the pool is full.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T], size: int):
+        self.name = name
+        self.factory = factory
+        self.size = size
+        self._items: Deque[T] = deque()
+        self._refill_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def acquire(self) -> T:
+        """Take a warm component, building one inline if the pool is empty"""
+        if self._items:
+            item = self._items.popleft()
+            pool_hits.inc(labels={"pool": self.name})
+        else:
+            logger.warning(f"⚠️ Warm pool '{self.name}' empty - building component inline")
+            item = self.factory()
+            pool_misses.inc(labels={"pool": self.name})
+        pool_available.set(len(self._items), labels={"pool": self.name})
+        self.refill()
+        return item
+
+    def refill(self):
+        """Top the pool back up to its configured size in the background"""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self):
+        backoff = REFILL_BACKOFF_SECONDS
+        while len(self._items) < self.size:
+            try:
+                item = await asyncio.to_thread(self.factory)
+            except Exception as e:
+                pool_build_failures.inc(labels={"pool": self.name})
+                logger.error(f"❌ Failed to pre-build '{self.name}' component: {e} - retrying in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_REFILL_BACKOFF_SECONDS)
+                continue
+            backoff = REFILL_BACKOFF_SECONDS
+            self._items.append(item)
+            pool_available.set(len(self._items), labels={"pool": self.name})
+
+    async def close(self):
+        if self._refill_task:
+            self._refill_task.cancel()
+        self._items.clear()
+
+
+def _stub_pools(size: int) -> Dict[str, WarmPool]:
+    # Offline stand-ins with fixed latencies (BOT_PROVIDERS=stub), for load tests
+    from stub_services import StubLLMService, StubSTTService, StubTTSService, StubVADAnalyzer
+
+    return {
+        "vad": WarmPool("vad", StubVADAnalyzer, size),
+        "stt": WarmPool("stt", StubSTTService, size),
+        "llm": WarmPool("llm", StubLLMService, size),
+        "tts": WarmPool("tts", lambda: StubTTSService(aggregate_sentences=False), size),
+    }
+
+
+class ComponentPools:
+    """Process-wide warm pools for the VAD analyzer and STT/LLM/TTS services
+
+    Set BOT_PROVIDERS=stub to run every call against offline stub services.
+    """
+
+    def __init__(self, size: int):
+        if os.getenv("BOT_PROVIDERS") == "stub":
+            logger.warning("⚠️ BOT_PROVIDERS=stub - calls use offline stub STT/LLM/TTS")
+            self.pools = _stub_pools(size)
+            self.providers = None
+            self._summarizer = extractive_summary
+            return
+        # Services share the process-wide provider connections
+        self.providers = get_provider_pool()
+        self._summarizer: Optional[Summarizer] = None
+        self.pools: Dict[str, WarmPool] = {
+            "vad": WarmPool("vad", SileroVADAnalyzer, size),
+            "stt": WarmPool("stt", self.providers.stt, size),
+            "llm": WarmPool("llm", self.providers.llm, size),
+            "tts": WarmPool("tts", lambda: self.providers.tts(get_config().get_voice_id()), size),
+        }
+
+    def start(self):
+        """Begin filling every pool in the background"""
+        logger.info(f"🔥 Pre-warming pipeline component pools ({self.pools['vad'].size} per pool)")
+        if self.providers:
+            self.providers.start()
+        for pool in self.pools.values():
+            pool.refill()
+
+    async def close(self):
+        for pool in self.pools.values():
+            await pool.close()
+        if self.providers:
+            await self.providers.close()
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        """Components ready against the target size for each pool and provider socket pool"""
+        status = {name: {"ready": len(pool), "size": pool.size} for name, pool in self.pools.items()}
+        if self.providers:
+            for sockets in (self.providers.tts_sockets, self.providers.stt_sockets):
+                status[f"{sockets.name}_sockets"] = {"ready": len(sockets), "size": sockets.size}
+        return status
+
+    def warm(self) -> bool:
+        """True when every component pool is full, so the VAD model is loaded
+
+        Provider sockets don't gate readiness: a call connects inline when none
+        is open, and a provider outage shouldn't take every worker out of rotation.
+        """
+        return all(len(pool) >= pool.size for pool in self.pools.values())
+
+    def vad(self) -> SileroVADAnalyzer:
+        return self.pools["vad"].acquire()
+
+    def stt(self) -> DeepgramSTTService:
+        return self.pools["stt"].acquire()
+
+    def llm(self) -> OpenAILLMService:
+        return self.pools["llm"].acquire()
+
+    def summarizer(self) -> Summarizer:
+        """Summarizer for context turns trimmed by ContextBudget"""
+        if self._summarizer is None:
+            self._summarizer = LLMSummarizer(client=self.providers.openai)
+        return self._summarizer
+
+    def tts(self, voice_id: str) -> CartesiaTTSService:
+        tts = self.pools["tts"].acquire()
+        tts.set_voice(voice_id)
+        return tts
+
+
+_component_pools: Optional[ComponentPools] = None
+
+def get_component_pools() -> ComponentPools:
+    """Get the process-wide component pools, creating them on first use"""
+    global _component_pools
+    if _component_pools is None:
+        _component_pools = ComponentPools(get_config().get_warm_pool_size())
+    return _component_pools
@@ -0,0 +1,224 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from loguru import logger
+
+from call_history import get_history_store
+from call_store import get_call_store
+from metrics import get_metrics
+
+SIGNATURE_HEADER = "X-Plivo-Signature-V3"
+NONCE_HEADER = "X-Plivo-Signature-V3-Nonce"
+
+webhook_events = get_metrics().counter(
+    "webhook_events_total", "Plivo webhooks and call events by result: queued, duplicate, invalid_signature"
+)
+webhook_ack_seconds = get_metrics().histogram(
+    "webhook_ack_seconds",
+    "Time to acknowledge a Plivo webhook",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+webhook_batch_size = get_metrics().histogram(
+    "webhook_batch_size", "Call events applied per call state write", buckets=(1, 2, 5, 10, 25, 50, 100, 200)
+)
+webhook_queue_depth = get_metrics().gauge("webhook_queue_depth", "Call events waiting to be applied")
+
+
+def _sorted_query(params: Mapping[str, List[str]]) -> str:
+    return "&".join(f"{key}={value}" for key in sorted(params) for value in sorted(params[key]))
+
+
+def signed_string(method: str, url: str, params: Mapping[str, str]) -> str:
+    """The string Plivo signs for a webhook, as in plivo.utils.signature_v3"""
+    parts = urlsplit(url)
+    base = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    query: Dict[str, List[str]] = {}
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        query.setdefault(key, []).append(value)
+    if method.upper() == "GET":
+        for key, value in params.items():
+            query.setdefault(key, []).append(value)
+        return f"{base}?{_sorted_query(query)}" if query else base
+    if not params:
+        return f"{base}?{_sorted_query(query)}" if query else base
+    body = "".join(f"{key}{params[key]}" for key in sorted(params))
+    return f"{base}?{_sorted_query(query)}.{body}" if query else f"{base}?{body}"
+
+
+class SignatureValidator:
+    """Checks Plivo V3 webhook signatures
+
+    The HMAC key for each auth token is set up once and copied per request, so
+    a check costs one SHA-256 pass over the signed string. Any of several
+    tokens may match, which lets a token be rotated without dropping webhooks.
+    """
+
+    def __init__(self, auth_tokens: Iterable[Optional[str]]):
+        self._keys = [hmac.new(token.encode(), digestmod=hashlib.sha256) for token in auth_tokens if token]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._keys)
+
+    def sign(self, method: str, url: str, params: Mapping[str, str], nonce: str) -> str:
+        """Signature with the first token (what Plivo would send)"""
+        return self._digest(self._keys[0], method, url, params, nonce)
+
+    def _digest(self, key, method: str, url: str, params: Mapping[str, str], nonce: str) -> str:
+        mac = key.copy()
+        mac.update(f"{signed_string(method, url, params)}.{nonce}".encode())
+        return base64.b64encode(mac.digest()).decode()
+
+    def validate(
+        self, method: str, url: str, params: Mapping[str, str], nonce: Optional[str], signatures: Optional[str]
+    ) -> bool:
+        if not nonce or not signatures:
+            return False
+        received = [s.strip() for s in signatures.split(",")]
+        for key in self._keys:
+            expected = self._digest(key, method, url, params, nonce)
+            if any(hmac.compare_digest(expected, signature) for signature in received):
+                return True
+        return False
+
+
+@dataclass(frozen=True)
+class CallEvent:
+    kind: str
+    call_uuid: str
+    state: Optional[Dict[str, Any]]
+    history: Optional[Dict[str, Any]]
+
+
+class WebhookProcessor:
+    """Applies call events to the call state store in batches, off the request path
+
+    Webhook handlers validate, submit() and acknowledge. A consumer task
+    merges the events queued meanwhile into one state write per call and
+    records them in call history. Events go through one queue in order, so a
+    late write never rolls a call back to an earlier status. A delivery seen
+    before by any worker (same event and request UUID, claimed in the shared
+    call store) is dropped.
+    """
+
+    def __init__(self, max_batch: int = 200, linger: float = 0.02):
+        self.max_batch = max_batch
+        self.linger = linger
+        self._queue: "asyncio.Queue[CallEvent]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def seen(self, kind: str, dedupe_key: Optional[str]) -> bool:
+        """Whether an event with this key was already submitted, by any worker"""
+        return bool(dedupe_key) and await get_call_store().claimed(f"{kind}:{dedupe_key}")
+
+    async def submit(
+        self,
+        kind: str,
+        call_uuid: Optional[str],
+        state: Optional[Dict[str, Any]] = None,
+        history: Optional[Dict[str, Any]] = None,
+        dedupe_key: Optional[str] = None,
+    ) -> bool:
+        """Queue an event for a call; False if it was a repeat delivery"""
+        if not call_uuid:
+            return False
+        if dedupe_key and not await get_call_store().claim(f"{kind}:{dedupe_key}"):
+            logger.info(f"🔁 Dropping repeated {kind} webhook for {call_uuid}")
+            webhook_events.inc(labels={"event": kind, "result": "duplicate"})
+            return False
+        self._queue.put_nowait(CallEvent(kind, call_uuid, state, history))
+        webhook_events.inc(labels={"event": kind, "result": "queued"})
+        webhook_queue_depth.set(self._queue.qsize())
+        self.start()
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self, timeout: float = 5.0):
+        """Apply what is still queued and stop"""
+        if self._task:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Dropping {self._queue.qsize()} unapplied call events")
+            self._task.cancel()
+            self._task = None
+
+    async def flush(self):
+        """Wait until every queued event has been applied"""
+        await self._queue.join()
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Let a burst of webhooks (a campaign hanging up) collect into one write
+            await asyncio.sleep(self.linger)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            webhook_queue_depth.set(self._queue.qsize())
+            try:
+                await self._apply(batch)
+            except Exception as e:
+                logger.error(f"❌ Failed to apply {len(batch)} call events: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _apply(self, batch: List[CallEvent]):
+        store = get_call_store()
+        updates: Dict[str, Dict[str, Any]] = {}
+        superseded = set()
+        for event in batch:
+            if event.state is not None:
+                state = {k: v for k, v in event.state.items() if v is not None}
+                request_uuid = state.get("request_uuid")
+                if event.kind == "answered" and request_uuid and not ("phone" in state and "caller_id" in state):
+                    # Outbound calls are dialed under their RequestUUID; carry that state over
+                    dialed = await store.get(request_uuid) or {}
+                    state.setdefault("phone", dialed.get("phone"))
+                    state.setdefault("caller_id", dialed.get("caller_id"))
+                updates.setdefault(event.call_uuid, {}).update(state)
+                if event.kind in ("answered", "hangup") and request_uuid and request_uuid != event.call_uuid:
+                    # The call now lives under its CallUUID; the dialed record is done with
+                    superseded.add(request_uuid)
+            if event.history is not None:
+                history = {k: v for k, v in event.history.items() if v is not None}
+                get_history_store().record(event.call_uuid, event.kind, **history)
+        if updates:
+            await store.update_many(updates)
+        for request_uuid in superseded - updates.keys():
+            await store.delete(request_uuid)
+        webhook_batch_size.observe(len(batch))
+
+
+_signature_validator: Optional[SignatureValidator] = None
+_webhook_processor: Optional[WebhookProcessor] = None
+
+def get_signature_validator() -> SignatureValidator:
+    """Validator for this account's Plivo token; disabled with PLIVO_VERIFY_SIGNATURES=false"""
+    global _signature_validator
+    if _signature_validator is None:
+        verify = os.getenv("PLIVO_VERIFY_SIGNATURES", "true").lower() not in ("0", "false", "no")
+        _signature_validator = SignatureValidator([os.getenv("PLIVO_AUTH_TOKEN")] if verify else [])
+    return _signature_validator
+
+def get_webhook_processor() -> WebhookProcessor:
+    """Get the process-wide webhook processor"""
+    global _webhook_processor
+    if _webhook_processor is None:
+        _webhook_processor = WebhookProcessor()
+    return _webhook_processor